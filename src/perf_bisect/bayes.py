@@ -0,0 +1,90 @@
+"""Posterior over the culprit commit given noisy pass/fail runs."""
+import math
+from itertools import accumulate
+from typing import List, Optional, Set, Tuple
+
+
+def binary_entropy(p: float) -> float:
+    if p <= 0.0 or p >= 1.0:
+        return 0.0
+    return -(p * math.log2(p) + (1 - p) * math.log2(1 - p))
+
+
+class CulpritPosterior:
+    """Probability that each commit of a range is the first bad one.
+
+    Hypothesis h < n means commits[h:] are bad; h == n means none of the range
+    is. A single run lands on the wrong side of the threshold with probability
+    flake_rate, independently of other runs.
+    """
+
+    def __init__(self, size: int, flake_rate: float = 0.1):
+        if size < 1:
+            raise ValueError("Range must contain at least one commit")
+        if not 0.0 < flake_rate < 0.5:
+            raise ValueError("flake_rate must be between 0 and 0.5")
+        self.size = size
+        self.flake_rate = flake_rate
+        self.weights = [1.0 / (size + 1)] * (size + 1)
+
+    def update(self, index: int, failed: bool) -> None:
+        """Fold in one run of commits[index]."""
+        right, wrong = 1.0 - self.flake_rate, self.flake_rate
+        # Under h <= index the commit is bad, so a failing run is the expected outcome.
+        if_bad, if_good = (right, wrong) if failed else (wrong, right)
+        weights = [w * (if_bad if h <= index else if_good) for h, w in enumerate(self.weights)]
+        total = sum(weights)
+        self.weights = [w / total for w in weights]
+
+    def cumulative(self) -> List[float]:
+        """P(commits[i] is bad) for every commit, i.e. P(h <= i)."""
+        return list(accumulate(self.weights[:self.size]))
+
+    def information_gain(self, bad_probability: float) -> float:
+        """Expected bits learned from one run of a commit that is bad with this probability."""
+        fail = (1 - self.flake_rate) * bad_probability + self.flake_rate * (1 - bad_probability)
+        return binary_entropy(fail) - binary_entropy(self.flake_rate)
+
+    def best_probe(self, measured: Optional[Set[int]] = None,
+                   skipped: Optional[Set[int]] = None) -> Tuple[Optional[int], float]:
+        """Commit whose next run is expected to be most informative, and the gain.
+
+        Ties go to commits already measured, which need no new checkout or build.
+        Skipped commits are never chosen; None means every commit is skipped.
+        """
+        measured = measured or set()
+        skipped = skipped or set()
+        candidates = [i for i in range(self.size) if i not in skipped]
+        if not candidates:
+            return None, 0.0
+        gains = [self.information_gain(p) for p in self.cumulative()]
+        best = max(candidates, key=lambda i: (round(gains[i], 12), i in measured, -i))
+        return best, gains[best]
+
+    def most_likely(self) -> Tuple[Optional[int], float]:
+        """The likeliest culprit index (None for no culprit) and its probability."""
+        index = max(range(self.size + 1), key=lambda h: self.weights[h])
+        return (index if index < self.size else None), self.weights[index]
+
+    def likely_range(self, skipped: Set[int]) -> Tuple[int, int, float]:
+        """The likeliest culprit when skipped commits can never be told apart.
+
+        No run distinguishes a skipped commit from the first testable commit
+        after it, so each such run plus that commit is one candidate. Returns
+        the first and last hypothesis of the best candidate and its probability.
+        """
+        best = (0, 0, -1.0)
+        start = 0
+        for h in range(self.size + 1):
+            if h < self.size and h in skipped:
+                continue
+            probability = sum(self.weights[start:h + 1])
+            if probability > best[2]:
+                best = (start, h, probability)
+            start = h + 1
+        return best
+
+    def entropy(self) -> float:
+        """Remaining uncertainty about the culprit, in bits."""
+        return -sum(w * math.log2(w) for w in self.weights if w > 0)
+
@@ -1,28 +1,184 @@
 """Core bisect logic for performance regression detection."""
 import subprocess
 import shlex
-import re
-import json
+import math
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
 from git import Repo
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Set
+from .bayes import CulpritPosterior
+from .build import BuildStep
+from .cache import MeasurementCache
+from .changepoint import pelt, segment_means
+from .checkpoint import Checkpoint
+from .commits import CommitRange
+from .environment import EnvironmentPool
+from .metrics import (KILL_CLOCKS, METRICS, TIME_METRICS, BenchmarkKilled, BenchmarkTimeout,
+                      MetricCollector, run_measured)
+from .noise import NoiseControl
+from .parsing import OutputParser, ParseRun, parse_extractor
+from .paths import PathFilter
+from .prefetch import Prefetcher
+from .profiling import diff_profiles, run_profiler
+from .remote import WorkerPool
+from .stats import SamplingPolicy, summarize
+from .store import MeasurementStore
+from .suite import SuiteBenchmark
+from .trace import NULL_TRACER, Tracer
+from .worker import CallableWorker
+from .worktree import WorktreePool
+
+# Grid points a sweep aims for when no stride is given.
+SWEEP_POINTS = 64
 
 
 class PerformanceBisector:
-    def __init__(self, repo_path: str, verbose: bool = False):
+    def __init__(self, repo_path: str, verbose: bool = False,
+                 cache: Optional[MeasurementCache] = None,
+                 build: Optional[BuildStep] = None,
+                 environments: Optional[EnvironmentPool] = None,
+                 collectors: Optional[List[MetricCollector]] = None,
+                 parser: Optional[OutputParser] = None,
+                 tracer: Optional[Tracer] = None,
+                 workers: Optional[WorkerPool] = None):
         self.repo = Repo(repo_path)
         self.verbose = verbose
-        self.measurements: List[Dict] = []
+        self.cache = cache
+        self.build = build
+        self.environments = environments
+        self.collectors = collectors
+        self.parser = parser or OutputParser()
+        self.tracer = tracer or NULL_TRACER
+        self.workers = workers
+        self.metric = 'duration'
+        self.kill_factor: Optional[float] = None
+        self.kill_clock = 'wall'
+        self.measurements = MeasurementStore()
+        self.sampling = SamplingPolicy()
+        self.noise = NoiseControl()
+        self.paths = PathFilter()
+        self.checkpoint: Optional[Checkpoint] = None
+        self.prefetcher: Optional[Prefetcher] = None
+        self._completed: Dict[str, Dict] = {}
+        self._reference: Optional[Dict] = None
+        self._search_info: Optional[Dict] = None
+        self._by_paths: Dict[str, Dict] = {}
+        self.skip_broken = False
+        self._culprit_range: Optional[List[str]] = None
+        self._held: Optional[str] = None
+        self.python_callable: Optional[str] = None
+        self._workers: Dict[str, CallableWorker] = {}
+        self._workers_lock = threading.Lock()
         
     def bisect(self, benchmark_cmd: str, good_commit: str, bad_commit: str,
-               threshold: float, timeout: int = 300, dry_run: bool = False) -> Dict:
-        """Execute git bisect to find performance regression."""
+               threshold: Optional[float] = None, timeout: int = 300, dry_run: bool = False,
+               jobs: int = 1, min_samples: int = 1, max_samples: int = 1,
+               confidence: float = 0.95, checkpoint: Optional[str] = None,
+               prefetch: bool = False, metric: str = 'duration',
+               regression: Optional[float] = None, baseline_samples: int = 5,
+               kill_factor: Optional[float] = None, kill_clock: str = 'wall',
+               pin_cpus: Optional[Set[int]] = None, warmup: int = 0,
+               interleave: bool = False, strategy: str = 'binary',
+               posterior: float = 0.95, flake_rate: float = 0.1,
+               max_runs: int = 0, first_parent: bool = False,
+               paths: Optional[List[str]] = None,
+               exclude_paths: Optional[List[str]] = None,
+               skip_broken: bool = False, profile: bool = False,
+               profile_cmd: Optional[str] = None, profile_top: int = 10,
+               python_callable: Optional[str] = None) -> Dict:
+        """Execute git bisect to find performance regression.
+        
+        Pass either an absolute threshold, or a regression fraction (0.15 for
+        15%) to derive the threshold from measurements of both endpoints.
+        With kill_factor, a run whose wall or CPU time passes kill_factor times
+        the threshold is stopped and recorded as a censored failure; the metric
+        must be the kill clock itself (wall_time or cpu_time).
+        With interleave, every probe run is paired with a run of the good
+        commit and decisions use the drift-corrected ratio between the two.
+        strategy='bayes' replaces the binary search with single runs chosen by
+        expected information gain, stopping once one commit's posterior
+        probability reaches posterior. With first_parent, the search walks the
+        mainline only and then descends into the side branch of a culprit merge.
+        paths / exclude_paths limit candidates to commits touching those paths,
+        and commits that agree on them share one measurement.
+        With skip_broken, a commit whose setup, build or benchmark fails is
+        skipped like git bisect skip; when skips hide the exact answer the
+        result names the range the culprit lies in.
+        With profile (or a profile_cmd template using {cmd} and {out}), the
+        culprit and its parent are rerun under a profiler and the functions
+        whose self time grew most are added to the result.
+        With python_callable ('pkg.module:func'), benchmark_cmd is not run:
+        each checked-out commit gets one worker interpreter that imports the
+        callable once and returns seconds per call from a calibrated loop.
+        """
+        
+        if metric not in METRICS and metric not in self.parser.names:
+            raise ValueError(f"Unknown metric: {metric}")
+        if (threshold is None) == (regression is None):
+            raise ValueError("Specify exactly one of threshold or regression")
+        if kill_factor is not None:
+            if kill_factor < 1:
+                raise ValueError("kill_factor must be at least 1")
+            if kill_clock not in KILL_CLOCKS:
+                raise ValueError(f"Unknown kill clock: {kill_clock}")
+            if metric != KILL_CLOCKS[kill_clock]:
+                # Only the clock's own reading is a lower bound on the metric.
+                raise ValueError(f"Early kill on the {kill_clock} clock needs metric "
+                                 f"{KILL_CLOCKS[kill_clock]}, not {metric}")
+        
+        if interleave and jobs > 1:
+            raise ValueError("Interleaved reference runs need jobs=1")
+        if pin_cpus and jobs > 1:
+            raise ValueError("Pinned runs need jobs=1; concurrent jobs would share the CPUs")
+        if strategy not in ('binary', 'bayes'):
+            raise ValueError(f"Unknown strategy: {strategy}")
+        if strategy == 'bayes' and (jobs > 1 or prefetch):
+            raise ValueError("The bayes strategy runs one probe at a time; "
+                             "it cannot be combined with jobs or prefetch")
+        if not 0.5 < posterior < 1.0:
+            raise ValueError("posterior must be between 0.5 and 1")
+        if profile_top < 1:
+            raise ValueError("profile_top must be at least 1")
+        if self.workers:
+            if strategy == 'bayes' or prefetch or interleave or kill_factor is not None \
+                    or python_callable:
+                raise ValueError("Remote workers run plain probes; they cannot be combined "
+                                 "with the bayes strategy, prefetch, interleave, early kill "
+                                 "or python_callable")
+            if self.build or self.environments:
+                raise ValueError("Remote workers build and set up their own clones; give "
+                                 "the build and setup commands to each worker instead")
+            if jobs == 1 and self.workers.size > 1:
+                # One split point per connected worker each round.
+                jobs = self.workers.size + 1
+        if python_callable:
+            if benchmark_cmd:
+                raise ValueError("Give either a benchmark command or python_callable")
+            if metric != 'duration' or kill_factor is not None or profile or profile_cmd:
+                raise ValueError("python_callable only measures duration; it cannot be "
+                                 "combined with other metrics, early kill or profiling")
         
-        good_sha = self.repo.commit(good_commit).hexsha
-        bad_sha = self.repo.commit(bad_commit).hexsha
+        self.sampling = SamplingPolicy(min_samples, max_samples, confidence)
+        self.noise = NoiseControl(pin_cpus, warmup, interleave)
+        self.metric = metric
+        self.kill_factor = kill_factor
+        self.kill_clock = kill_clock
+        self.paths = PathFilter(paths, exclude_paths)
+        self._by_paths = {}
+        self.measurements = MeasurementStore()
+        self.skip_broken = skip_broken
+        self.python_callable = python_callable
         
-        commits = list(self.repo.iter_commits(f'{good_sha}..{bad_sha}'))
-        commits.reverse()
+        good_sha = self._resolve_ref(good_commit)
+        bad_sha = self._resolve_ref(bad_commit)
+        
+        history = ('--first-parent',) if first_parent else ()
+        commits = self._resolve_range(good_sha, bad_sha, *history, subjects=dry_run,
+                                      pathspecs=self._pathspecs())
         
         if self.verbose:
             print(f"Bisecting {len(commits)} commits between {good_sha[:7]} and {bad_sha[:7]}")
@@ -30,44 +186,1271 @@ class PerformanceBisector:
         if dry_run:
             return self._dry_run_result(commits, good_sha, bad_sha)
         
+        self.checkpoint = None
+        self._completed = {}
+        if checkpoint:
+            self._start_checkpoint(checkpoint, {
+                'benchmark_cmd': benchmark_cmd,
+                'good_commit': good_sha,
+                'bad_commit': bad_sha,
+                'threshold': threshold,
+                'regression': regression,
+                'baseline_samples': baseline_samples,
+                'metric': metric,
+                'timeout': timeout,
+                'jobs': jobs,
+                'min_samples': min_samples,
+                'max_samples': max_samples,
+                'confidence': confidence,
+                'kill_factor': kill_factor,
+                'kill_clock': kill_clock,
+                'pin_cpus': sorted(pin_cpus) if pin_cpus else None,
+                'warmup': warmup,
+                'interleave': interleave,
+                'strategy': strategy,
+                'posterior': posterior,
+                'flake_rate': flake_rate,
+                'max_runs': max_runs,
+                'first_parent': first_parent,
+                'paths': self.paths.include,
+                'exclude_paths': self.paths.exclude,
+                'skip_broken': skip_broken,
+                'profile': profile,
+                'profile_cmd': profile_cmd,
+                'profile_top': profile_top,
+                'python_callable': python_callable,
+                'extractors': [e.spec for e in self.parser.custom if e.spec],
+                'build_cmd': self.build.command if self.build else None,
+                'build_outputs': self.build.outputs if self.build else None,
+                'build_inputs': self.build.inputs if self.build else None,
+                'build_cache_dir': str(self.build.cache_dir) if self.build else None,
+                'setup_cmd': self.environments.setup_cmd if self.environments else None,
+                'lockfiles': self.environments.lockfiles if self.environments else None,
+                'env_path': self.environments.env_path if self.environments else None,
+                'max_envs': self.environments.max_envs if self.environments else None
+            })
+        
+        if python_callable:
+            # Labels the measurements and keys the cache in place of a command.
+            benchmark_cmd = f'python-callable:{python_callable}'
+        
+        baseline = None
+        reference = None
+        profile_diff = None
+        descended: List[str] = []
+        self._search_info = None
+        original_ref = self._current_ref()
+        # A resumed session reuses the baseline and reference it already measured.
+        saved = self.checkpoint.state if self.checkpoint else {}
+        try:
+            if regression is not None:
+                baseline = saved.get('baseline')
+                if baseline is None:
+                    with self.tracer.span('baseline', 'phase'):
+                        baseline = self._measure_baseline(good_sha, bad_sha, benchmark_cmd,
+                                                          timeout, regression, baseline_samples)
+                    if self.checkpoint:
+                        self.checkpoint.save('baseline', baseline)
+                threshold = baseline['threshold']
+            
+            with ExitStack() as stack:
+                search_threshold = threshold
+                if interleave:
+                    with self.tracer.span('reference', 'phase'):
+                        self._reference = self._start_reference(stack, good_sha, benchmark_cmd,
+                                                                timeout, baseline_samples,
+                                                                saved.get('reference'))
+                    reference = {key: self._reference[key]
+                                 for key in ('commit', 'level', 'samples')}
+                    if self.checkpoint and 'reference' not in saved:
+                        self.checkpoint.save('reference', reference)
+                    # Probe samples become probe / reference ratios.
+                    search_threshold = threshold / self._reference['level']
+                
+                options = {'strategy': strategy, 'jobs': jobs, 'prefetch': prefetch,
+                           'posterior': posterior, 'flake_rate': flake_rate,
+                           'max_runs': max_runs}
+                with self.tracer.span('search', 'phase', strategy=strategy):
+                    regression_commit = self._search(commits, benchmark_cmd, search_threshold,
+                                                     timeout, **options)
+                    if first_parent:
+                        regression_commit = self._descend_merges(
+                            regression_commit, benchmark_cmd, search_threshold, timeout,
+                            descended, **options)
+            
+            # Only an exact culprit has a parent worth comparing against.
+            if (profile or profile_cmd) and regression_commit is not None \
+                    and self._culprit_range is None:
+                with self.tracer.span('profile', 'phase'):
+                    profile_diff = self._profile_culprit(regression_commit, benchmark_cmd,
+                                                         timeout, profile_cmd, profile_top)
+        finally:
+            self._reference = None
+            self._close_workers()
+            self._checkout(original_ref)
+        
+        return {
+            'good_commit': good_sha,
+            'bad_commit': bad_sha,
+            'threshold': threshold,
+            'metric': metric,
+            'regression_commit': regression_commit.hexsha if regression_commit else None,
+            'regression_message': regression_commit.summary if regression_commit else None,
+            'measurements': self.measurements.to_list(),
+            'baseline': baseline,
+            'reference': reference,
+            'search': self._search_info,
+            'first_parent': first_parent,
+            'descended': descended,
+            'paths': self._pathspecs(),
+            'skipped': [m['commit'] for m in self.measurements if m.get('skipped')],
+            'culprit_range': self._culprit_range,
+            'profile': profile_diff
+        }
+    
+    def resume(self, checkpoint: str) -> Dict:
+        """Continue the bisect session recorded in a checkpoint file."""
+        session, _ = Checkpoint(checkpoint).load()
+        if session.get('extractors') and not self.parser.custom:
+            self.parser = OutputParser([parse_extractor(spec) for spec in session['extractors']])
+        if session.get('build_cmd') and self.build is None:
+            self.build = BuildStep(session['build_cmd'], outputs=session.get('build_outputs'),
+                                   inputs=session.get('build_inputs'),
+                                   cache_dir=session.get('build_cache_dir'))
+        if session.get('setup_cmd') and self.environments is None:
+            self.environments = EnvironmentPool(session['setup_cmd'], session['lockfiles'],
+                                                env_path=session.get('env_path', '.venv'),
+                                                max_envs=session.get('max_envs', 5))
+        return self.bisect(
+            benchmark_cmd=session['benchmark_cmd'],
+            good_commit=session['good_commit'],
+            bad_commit=session['bad_commit'],
+            threshold=session['threshold'],
+            regression=session.get('regression'),
+            baseline_samples=session.get('baseline_samples', 5),
+            timeout=session['timeout'],
+            jobs=session['jobs'],
+            min_samples=session['min_samples'],
+            max_samples=session['max_samples'],
+            confidence=session['confidence'],
+            checkpoint=checkpoint,
+            metric=session.get('metric', 'duration'),
+            kill_factor=session.get('kill_factor'),
+            kill_clock=session.get('kill_clock', 'wall'),
+            pin_cpus=set(session['pin_cpus']) if session.get('pin_cpus') else None,
+            warmup=session.get('warmup', 0),
+            interleave=session.get('interleave', False),
+            strategy=session.get('strategy', 'binary'),
+            posterior=session.get('posterior', 0.95),
+            flake_rate=session.get('flake_rate', 0.1),
+            max_runs=session.get('max_runs', 0),
+            first_parent=session.get('first_parent', False),
+            paths=session.get('paths'),
+            exclude_paths=session.get('exclude_paths'),
+            skip_broken=session.get('skip_broken', False),
+            profile=session.get('profile', False),
+            profile_cmd=session.get('profile_cmd'),
+            profile_top=session.get('profile_top', 10),
+            python_callable=session.get('python_callable')
+        )
+    
+    def bisect_suite(self, benchmarks: List[SuiteBenchmark], good_commit: str,
+                     bad_commit: str, timeout: int = 300, min_samples: int = 1,
+                     max_samples: int = 1, confidence: float = 0.95,
+                     baseline_samples: int = 5, skip_broken: bool = False) -> Dict:
+        """Bisect several benchmarks over one range, sharing checkouts and builds.
+        
+        Each benchmark keeps its own search interval. The next probe is the
+        commit most benchmarks want, and while it is checked out and built
+        every benchmark whose interval still contains it runs there, so a
+        commit is rarely visited twice. Resolved benchmarks stop running.
+        """
+        if not benchmarks:
+            raise ValueError("Suite has no benchmarks")
+        parsers: Dict[str, OutputParser] = {}
+        for benchmark in benchmarks:
+            parser = OutputParser([parse_extractor(spec) for spec in benchmark.extract]) \
+                if benchmark.extract else self.parser
+            if benchmark.metric not in METRICS and benchmark.metric not in parser.names:
+                raise ValueError(f"Unknown metric for {benchmark.name}: {benchmark.metric}")
+            parsers[benchmark.name] = parser
+        
+        self.sampling = SamplingPolicy(min_samples, max_samples, confidence)
+        self.noise = NoiseControl()
+        self.kill_factor = None
+        self.paths = PathFilter()
+        self.skip_broken = skip_broken
+        self.python_callable = None
+        
+        good_sha = self._resolve_ref(good_commit)
+        bad_sha = self._resolve_ref(bad_commit)
+        commits = self._resolve_range(good_sha, bad_sha)
+        
+        if self.verbose:
+            print(f"Bisecting {len(benchmarks)} benchmarks over {len(commits)} commits")
+        
+        states = [{'benchmark': benchmark, 'threshold': benchmark.threshold, 'baseline': None,
+                   'left': 0, 'right': len(commits) - 1, 'culprit': None,
+                   'skipped': set(), 'done': False}
+                  for benchmark in benchmarks]
+        probed: Set[str] = set()
+        
+        def use(benchmark: SuiteBenchmark) -> int:
+            self.parser, self.metric = parsers[benchmark.name], benchmark.metric
+            return benchmark.timeout or timeout
+        
+        def record(state: Dict, index: int, measurement: Dict) -> None:
+            if measurement.get('skipped'):
+                measurement['passed'] = None
+                state['skipped'].add(index)
+            else:
+                if measurement['censored']:
+                    measurement['passed'] = False
+                else:
+                    measurement['passed'] = self.sampling.decide(measurement['samples'],
+                                                                 state['threshold'])
+                if measurement['passed']:
+                    state['left'] = index + 1
+                else:
+                    state['culprit'] = commits[index]
+                    state['right'] = index - 1
+            measurement['benchmark'] = state['benchmark'].name
+            self.measurements.append(measurement)
+        
+        original_ref = self._current_ref()
+        original = (self.parser, self.metric)
+        try:
+            derived = [state for state in states if state['benchmark'].regression is not None]
+            if derived:
+                policy = SamplingPolicy(baseline_samples, baseline_samples, confidence)
+                endpoints: Dict[str, Dict[str, Dict]] = {}
+                for name, sha in (('good', good_sha), ('bad', bad_sha)):
+                    commit = self.repo.commit(sha)
+                    with self._hold(commit):
+                        probed.add(sha)
+                        for state in derived:
+                            benchmark = state['benchmark']
+                            endpoints.setdefault(benchmark.name, {})[name] = self._collect(
+                                commit, benchmark.command, float('inf'), use(benchmark), policy)
+                for state in derived:
+                    benchmark = state['benchmark']
+                    state['baseline'] = self._baseline_from(endpoints[benchmark.name],
+                                                            benchmark.regression)
+                    state['threshold'] = state['baseline']['threshold']
+                    if len(commits) and commits[len(commits) - 1].hexsha == bad_sha:
+                        # The bad endpoint's runs double as its first probe.
+                        record(state, len(commits) - 1, dict(endpoints[benchmark.name]['bad']))
+            
+            while True:
+                wanted: Dict[int, int] = {}
+                for state in states:
+                    if state['done']:
+                        continue
+                    index = None
+                    if state['left'] <= state['right']:
+                        index = self._nearest_testable((state['left'] + state['right']) // 2,
+                                                       state['left'], state['right'],
+                                                       state['skipped'])
+                    if index is None:
+                        state['done'] = True
+                    else:
+                        wanted[index] = wanted.get(index, 0) + 1
+                if not wanted:
+                    break
+                
+                # Probe the commit most benchmarks want next, and run every
+                # benchmark it can still inform while it is checked out.
+                index = max(sorted(wanted), key=lambda i: wanted[i])
+                commit = commits[index]
+                pending = []
+                for state in states:
+                    if state['done'] or not state['left'] <= index <= state['right'] \
+                            or index in state['skipped']:
+                        continue
+                    benchmark = state['benchmark']
+                    use(benchmark)
+                    reason = self._known_breakage(commit, benchmark.command) \
+                        if skip_broken else None
+                    if reason is None:
+                        pending.append(state)
+                    else:
+                        record(state, index, self._skip(commit, benchmark.command, reason,
+                                                        cached=True))
+                if not pending:
+                    continue
+                
+                if self.verbose:
+                    print(f"\nTesting commit {commit.hexsha[:7]} for "
+                          f"{len(pending)} benchmark(s): {commit.summary}")
+                
+                with self._hold(commit) as workdir:
+                    probed.add(commit.hexsha)
+                    build_error = None
+                    if self.build:
+                        try:
+                            self._build(commit, workdir)
+                        except RuntimeError as e:
+                            if not skip_broken:
+                                raise
+                            build_error = str(e).strip()
+                    
+                    for state in pending:
+                        benchmark = state['benchmark']
+                        benchmark_timeout = use(benchmark)
+                        if build_error is not None:
+                            measurement = self._skip(commit, benchmark.command, build_error)
+                        else:
+                            measurement = self._collect_or_skip(
+                                commit, benchmark.command, state['threshold'],
+                                benchmark_timeout, self.sampling)
+                        record(state, index, measurement)
+        finally:
+            self.parser, self.metric = original
+            self._checkout(original_ref)
+        
+        results = []
+        for state in states:
+            benchmark, culprit = state['benchmark'], state['culprit']
+            results.append({
+                'name': benchmark.name,
+                'command': benchmark.command,
+                'metric': benchmark.metric,
+                'threshold': state['threshold'],
+                'baseline': state['baseline'],
+                'regression_commit': culprit.hexsha if culprit else None,
+                'regression_message': culprit.summary if culprit else None,
+                'culprit_range': self._culprit_range_of(commits, state['left'], state['right'],
+                                                        culprit),
+                'probes': sum(1 for m in self.measurements
+                              if m.get('benchmark') == benchmark.name)
+            })
+        
+        return {
+            'mode': 'suite',
+            'good_commit': good_sha,
+            'bad_commit': bad_sha,
+            'benchmarks': results,
+            'measurements': self.measurements.to_list(),
+            'probed_commits': len(probed)
+        }
+    
+    def sweep(self, benchmark_cmd: str, good_commit: str, bad_commit: str, stride: int = 0,
+              jobs: int = 1, samples: int = 3, timeout: int = 300, metric: str = 'duration',
+              penalty: Optional[float] = None, min_effect: float = 0.0,
+              min_samples: int = 1, max_samples: int = 1, confidence: float = 0.95,
+              pin_cpus: Optional[Set[int]] = None, warmup: int = 0) -> Dict:
+        """Find every step in the range rather than a single culprit.
+        
+        Every stride-th commit is measured (jobs at a time), PELT change-point
+        detection splits the series into level segments, and each step between
+        two grid points is narrowed down to one commit with a local bisect.
+        """
+        
+        if metric not in METRICS and metric not in self.parser.names:
+            raise ValueError(f"Unknown metric: {metric}")
+        if stride < 0:
+            raise ValueError("stride must not be negative")
+        if pin_cpus and jobs > 1:
+            raise ValueError("Pinned runs need jobs=1; concurrent jobs would share the CPUs")
+        
+        self.sampling = SamplingPolicy(min_samples, max_samples, confidence)
+        self.noise = NoiseControl(pin_cpus, warmup)
+        self.metric = metric
+        self.kill_factor = None
+        self.python_callable = None
+        
+        good_sha = self._resolve_ref(good_commit)
+        bad_sha = self._resolve_ref(bad_commit)
+        commits = self._resolve_range(good_sha, bad_sha)
+        stride = stride or max(1, len(commits) // SWEEP_POINTS)
+        grid = sorted(set(range(stride - 1, len(commits), stride)) | {len(commits) - 1}) \
+            if len(commits) else []
+        
+        if self.verbose:
+            print(f"Sweeping {len(grid)} of {len(commits)} commits "
+                  f"between {good_sha[:7]} and {bad_sha[:7]}")
+        
+        # Position -1 is the good endpoint, which lies just outside the range.
+        positions = [-1] + grid
+        points = [self.repo.commit(good_sha)] + [commits[i] for i in grid]
+        grid_policy = SamplingPolicy(samples, samples, confidence)
+        changes = []
+        
+        original_ref = self._current_ref()
+        try:
+            with ExitStack() as stack:
+                pool = stack.enter_context(WorktreePool(self.repo, size=jobs)) \
+                    if jobs > 1 else None
+                executor = stack.enter_context(ThreadPoolExecutor(max_workers=jobs))
+                
+                with self.tracer.span('grid', 'phase'):
+                    futures = [executor.submit(self._collect, commit, benchmark_cmd,
+                                               float('inf'), timeout, grid_policy, pool)
+                               for commit in points]
+                    series = [future.result() for future in futures]
+                for position, measurement in zip(positions, series):
+                    measurement.update({'phase': 'grid', 'position': position, 'passed': None})
+                self.measurements.extend(series)
+                
+                values = [m['duration'] for m in series]
+                steps = pelt(values, penalty)
+                means = segment_means(values, steps)
+                
+                for step, before, after in zip(steps, means, means[1:]):
+                    effect = (after - before) / before if before else float('inf')
+                    if abs(effect) < min_effect:
+                        continue
+                    
+                    with self.tracer.span('refine', 'phase'):
+                        culprit = self._refine(commits, positions[step - 1], positions[step],
+                                               benchmark_cmd, (before + after) / 2,
+                                               after > before, timeout, pool)
+                    changes.append({
+                        'commit': culprit.hexsha,
+                        'message': culprit.summary,
+                        'kind': 'regression' if after > before else 'improvement',
+                        'before': before,
+                        'after': after,
+                        'delta': after - before,
+                        'effect': effect,
+                        'bracket': [points[step - 1].hexsha, points[step].hexsha]
+                    })
+        finally:
+            self._checkout(original_ref)
+        
+        return {
+            'mode': 'sweep',
+            'good_commit': good_sha,
+            'bad_commit': bad_sha,
+            'metric': metric,
+            'stride': stride,
+            'changes': changes,
+            'measurements': self.measurements.to_list()
+        }
+    
+    def measure(self, benchmark_cmd: str, commits: List, samples: int = 3,
+                timeout: int = 300, metric: str = 'duration',
+                max_samples: Optional[int] = None, confidence: float = 0.95,
+                threshold: float = float('inf'), warmup: int = 0,
+                cpus: Optional[Set[int]] = None) -> List[Dict]:
+        """Benchmark each commit without judging it.
+        
+        Used to extend a series one commit at a time and by remote workers;
+        between samples and max_samples runs are taken, stopping once the
+        threshold decision is clear. Samples come from and go to the cache like
+        any probe, and the original checkout is restored. warmup and cpus act
+        as in bisect().
+        """
+        if metric not in METRICS and metric not in self.parser.names:
+            raise ValueError(f"Unknown metric: {metric}")
+        
+        self.sampling = SamplingPolicy(samples, max_samples or samples, confidence)
+        self.noise = NoiseControl(cpus, warmup)
+        self.metric = metric
+        self.kill_factor = None
+        self.python_callable = None
+        self.paths = PathFilter()
+        
+        measurements = []
+        original_ref = self._current_ref()
+        try:
+            for commit in commits:
+                measurement = self._collect(commit, benchmark_cmd, threshold, timeout,
+                                            self.sampling)
+                measurement['passed'] = None
+                measurements.append(measurement)
+        finally:
+            self._checkout(original_ref)
+        return measurements
+    
+    def _refine(self, commits: CommitRange, low: int, high: int, benchmark_cmd: str,
+                midpoint: float, rising: bool, timeout: int,
+                pool: Optional[WorktreePool] = None):
+        """Bisect between grid positions low (old level) and high (new level)."""
+        left, right = low + 1, high - 1
+        culprit = commits[high]
+        
+        while left <= right:
+            mid = (left + right) // 2
+            commit = commits[mid]
+            measurement = self._collect(commit, benchmark_cmd, midpoint, timeout,
+                                        self.sampling, pool)
+            # A censored probe ran at least as long as its lower bound: above the midpoint.
+            below = not measurement['censored'] and \
+                self.sampling.decide(measurement['samples'], midpoint)
+            old_level = below if rising else not below
+            measurement.update({'phase': 'refine', 'position': mid, 'passed': None})
+            self.measurements.append(measurement)
+            
+            if self.verbose:
+                level = 'old' if old_level else 'new'
+                print(f"  {commit.hexsha[:7]}: {measurement['duration']:.3f} ({level} level)")
+            
+            if old_level:
+                left = mid + 1
+            else:
+                culprit = commit
+                right = mid - 1
+        
+        return culprit
+    
+    def _measure_baseline(self, good_sha: str, bad_sha: str, benchmark_cmd: str,
+                          timeout: int, regression: float, repeats: int) -> Dict:
+        """Measure both endpoints and derive the threshold from the good one.
+        
+        Endpoint samples go through the measurement cache, so later runs over
+        the same endpoints skip this step.
+        """
+        policy = SamplingPolicy(repeats, repeats, self.sampling.confidence)
+        endpoints = {}
+        
+        for name, sha in (('good', good_sha), ('bad', bad_sha)):
+            commit = self.repo.commit(sha)
+            if self.verbose:
+                print(f"\nMeasuring {name} endpoint {sha[:7]}")
+            endpoints[name] = self._collect(commit, benchmark_cmd, float('inf'), timeout,
+                                            policy)
+        
+        return self._baseline_from(endpoints, regression)
+    
+    def _baseline_from(self, endpoints: Dict[str, Dict], regression: float) -> Dict:
+        """Derive the threshold from measurements of the good and bad endpoints."""
+        threshold = endpoints['good']['duration'] * (1 + regression)
+        
+        if self.verbose:
+            print(f"Derived threshold {threshold:.3f} from good median "
+                  f"{endpoints['good']['duration']:.3f} + {regression:.0%}")
+        if endpoints['bad']['duration'] <= threshold:
+            print(f"Warning: bad endpoint median {endpoints['bad']['duration']:.3f} does not "
+                  f"exceed the derived threshold {threshold:.3f}")
+        
+        return {
+            'regression': regression,
+            'threshold': threshold,
+            'good': endpoints['good']['duration'],
+            'good_stdev': endpoints['good']['stdev'],
+            'bad': endpoints['bad']['duration'],
+            'bad_stdev': endpoints['bad']['stdev'],
+        }
+    
+    def _profile_culprit(self, culprit, benchmark_cmd: str, timeout: int,
+                         template: Optional[str], top: int) -> Dict:
+        """Profile the culprit and its first parent and diff their per-function times.
+        
+        A failure here is reported in the result rather than discarding the bisect.
+        """
+        parent = self.repo.commit(self._resolve_ref(f'{culprit.hexsha}^'))
+        info = {'commit': culprit.hexsha, 'parent': parent.hexsha,
+                'tool': 'cProfile' if template is None else template}
+        profiles = {}
+        
+        try:
+            for name, commit in (('parent', parent), ('culprit', culprit)):
+                if self.verbose:
+                    print(f"\nProfiling {name} {commit.hexsha[:7]}")
+                with self._workspace(commit) as cwd, ExitStack() as stack:
+                    workdir = cwd or self.repo.working_tree_dir
+                    self._prepare(commit, workdir, stack)
+                    with self.tracer.span('profile', 'profile', commit=commit.hexsha[:7]):
+                        profiles[name] = run_profiler(benchmark_cmd, workdir, timeout, template)
+        except (RuntimeError, ValueError) as e:
+            print(f"Warning: profiling the culprit failed: {e}")
+            return dict(info, error=str(e))
+        
+        (before, unit), (after, _) = profiles['parent'], profiles['culprit']
+        return dict(info, unit=unit,
+                    total_before=sum(times[0] for times in before.values()),
+                    total_after=sum(times[0] for times in after.values()),
+                    top=diff_profiles(before, after, top))
+    
+    def _start_reference(self, stack: ExitStack, good_sha: str, benchmark_cmd: str,
+                         timeout: int, repeats: int, saved: Optional[Dict] = None) -> Dict:
+        """Hold the good commit in its own worktree and measure its level there.
+        
+        A saved reference from a checkpoint keeps its level; only the tree is set up again.
+        """
+        pool = stack.enter_context(WorktreePool(self.repo, size=1))
+        path = stack.enter_context(pool.lease())
+        cwd = str(path)
+        commit = self.repo.commit(good_sha)
+        
+        with self.tracer.span('checkout', 'checkout', ref=good_sha[:12]):
+            pool.checkout(path, good_sha)
+        if self.environments:
+            with self.tracer.span('setup', 'setup', commit=good_sha[:7]):
+                stack.enter_context(self.environments.lease(self.repo, commit, cwd))
+        if self.build:
+            self._build(commit, cwd)
+        
+        if saved:
+            return {'commit': good_sha, 'tree': commit.tree.hexsha, 'cwd': cwd,
+                    'level': saved['level'], 'samples': saved['samples']}
+        
+        for _ in range(self.noise.warmup):
+            self._sample(benchmark_cmd, timeout, cwd, {})
+        samples = [self._sample(benchmark_cmd, timeout, cwd, {}) for _ in range(repeats)]
+        level = statistics.median(samples)
+        if level <= 0:
+            raise RuntimeError(f"Reference level must be positive, got {level}")
+        
+        if self.verbose:
+            print(f"Reference {good_sha[:7]}: median {level:.3f} over {repeats} runs")
+        
+        return {'commit': good_sha, 'tree': commit.tree.hexsha, 'cwd': cwd,
+                'level': level, 'samples': samples}
+    
+    def _start_checkpoint(self, path: str, session: Dict) -> None:
+        """Open a checkpoint and remember probes a previous run already finished."""
+        self.checkpoint = Checkpoint(path)
+        completed = self.checkpoint.start(session)
+        self._completed = {m['commit']: m for m in completed}
+        
+        if self.verbose and completed:
+            print(f"Resuming with {len(completed)} completed probes from {path}")
+    
+    def _resolve_ref(self, ref: str) -> str:
+        """Full commit SHA for a ref, without walking history in Python."""
+        with self.tracer.span('rev-parse', 'git', ref=ref):
+            return self.repo.git.rev_parse('--verify', f'{ref}^{{commit}}')
+    
+    def _resolve_range(self, good_sha: str, bad_sha: str, *args: str, **kwargs) -> CommitRange:
+        with self.tracer.span('resolve range', 'git'):
+            return CommitRange.resolve(self.repo, good_sha, bad_sha, *args, **kwargs)
+    
+    def _checkout(self, ref: str) -> None:
+        with self.tracer.span('checkout', 'checkout', ref=ref):
+            self.repo.git.checkout(ref, force=True)
+    
+    def _build(self, commit, cwd: str) -> Dict:
+        with self.tracer.span('build', 'build', commit=commit.hexsha[:7]):
+            return self.build.run(self.repo, commit, cwd)
+    
+    def _pathspecs(self) -> Optional[List[str]]:
+        return self.paths.pathspecs() if self.paths else None
+    
+    def _current_ref(self) -> str:
+        """Return the branch HEAD points at, or its SHA when detached."""
+        if self.repo.head.is_detached:
+            return self.repo.head.commit.hexsha
+        return self.repo.active_branch.name
+    
+    def _search_serial(self, commits: CommitRange, benchmark_cmd: str, threshold: float,
+                       timeout: int, pool: Optional[WorktreePool] = None):
+        """Binary search the range one commit at a time.
+        
+        Probes run in the main working tree unless a worktree pool is given.
+        """
         left, right = 0, len(commits) - 1
         regression_commit = None
+        skipped: Set[int] = set()
         
         while left <= right:
-            mid = (left + right) // 2
+            mid = self._nearest_testable((left + right) // 2, left, right, skipped)
+            if mid is None:
+                break
             commit = commits[mid]
             
             if self.verbose:
                 print(f"\nTesting commit {commit.hexsha[:7]}: {commit.summary}")
             
-            self.repo.git.checkout(commit.hexsha, force=True)
-            duration = self.run_benchmark(benchmark_cmd, timeout)
+            if self.prefetcher:
+                candidates = [(left + mid - 1) // 2, (mid + 1 + right) // 2]
+                self.prefetcher.prefetch(
+                    [commits[i] for i in candidates
+                     if left <= i <= right and i != mid
+                     and commits[i].hexsha not in self._completed],
+                    current=commit
+                )
             
-            self.measurements.append({
-                'commit': commit.hexsha,
-                'message': commit.summary,
-                'duration': duration,
-                'passed': duration <= threshold
-            })
+            measurement = self._measure(commit, benchmark_cmd, threshold, timeout, pool)
+            self.measurements.append(measurement)
             
-            if duration <= threshold:
+            if measurement.get('skipped'):
+                skipped.add(mid)
+            elif measurement['passed']:
                 left = mid + 1
             else:
                 regression_commit = commit
                 right = mid - 1
         
-        self.repo.git.checkout(bad_sha)
+        self._culprit_range = self._culprit_range_of(commits, left, right, regression_commit)
+        return regression_commit
+    
+    def _search(self, commits: CommitRange, benchmark_cmd: str, threshold: float, timeout: int,
+                strategy: str = 'binary', jobs: int = 1, prefetch: bool = False,
+                posterior: float = 0.95, flake_rate: float = 0.1, max_runs: int = 0):
+        """Find the first bad commit of a range with the configured strategy."""
+        self._culprit_range = None
+        if not len(commits):
+            return None
+        if strategy == 'bayes':
+            return self._search_bayes(commits, benchmark_cmd, threshold, timeout,
+                                      posterior, flake_rate, max_runs)
+        if jobs > 1:
+            return self._search_parallel(commits, benchmark_cmd, threshold, timeout, jobs)
+        if prefetch:
+            return self._search_prefetching(commits, benchmark_cmd, threshold, timeout)
+        return self._search_serial(commits, benchmark_cmd, threshold, timeout)
+    
+    def _descend_merges(self, commit, benchmark_cmd: str, threshold: float, timeout: int,
+                        descended: List[str], **options):
+        """Follow a culprit merge into the side branch it brought in.
+        
+        The side branch is bisected on its own first-parent chain against the
+        merge's first parent; if every side commit passes, the merge itself is
+        the culprit. Only the second parent of an octopus merge is followed.
+        """
+        while commit is not None:
+            parents = self.repo.git.rev_parse(f'{commit.hexsha}^@').split()
+            if len(parents) < 2:
+                return commit
+            
+            side = self._resolve_range(parents[0], parents[1], '--first-parent',
+                                       pathspecs=self._pathspecs())
+            descended.append(commit.hexsha)
+            if self.verbose:
+                print(f"\nMerge {commit.hexsha[:7]} is bad; bisecting the {len(side)} commits "
+                      f"it merged")
+            
+            culprit = self._search(side, benchmark_cmd, threshold, timeout, **options)
+            if culprit is None:
+                return commit
+            commit = culprit
+        
+        return commit
+    
+    def _search_bayes(self, commits: CommitRange, benchmark_cmd: str, threshold: float,
+                      timeout: int, confidence: float, flake_rate: float, max_runs: int = 0):
+        """Probabilistic bisection: one run at a time where it is expected to teach most.
+        
+        Each run counts as a noisy pass/fail vote, so a commit is re-run only
+        when that is the most informative next step.
+        """
+        posterior = CulpritPosterior(len(commits), flake_rate)
+        max_runs = max_runs or 20 + 4 * math.ceil(math.log2(len(commits) + 1))
+        runs: Dict[int, int] = {}
+        latest: Dict[int, Dict] = {}
+        skipped: Set[int] = set()
+        
+        # Replay runs recorded in a checkpoint before choosing new ones.
+        for sha, measurement in self._completed.items():
+            try:
+                index = commits.index_of(sha)
+            except ValueError:
+                continue
+            latest[index] = measurement
+            if measurement.get('skipped'):
+                skipped.add(index)
+                continue
+            for sample in measurement['samples']:
+                posterior.update(index, sample > threshold)
+            if measurement.get('censored'):
+                posterior.update(index, True)
+            runs[index] = len(measurement['samples']) + bool(measurement.get('censored'))
+        
+        total = 0
+        first, culprit, probability = posterior.likely_range(skipped)
+        while probability < confidence and total < max_runs:
+            index, gain = posterior.best_probe(set(runs), skipped)
+            if index is None:
+                break
+            commit = commits[index]
+            count = runs.get(index, 0) + 1
+            
+            previous = latest[index]['samples'] if index in latest else None
+            measurement = self._collect_or_skip(
+                commit, benchmark_cmd, threshold, timeout,
+                SamplingPolicy(count, count, self.sampling.confidence), known=previous)
+            latest[index] = measurement
+            total += 1
+            
+            if measurement.get('skipped'):
+                skipped.add(index)
+                if self.checkpoint:
+                    self.checkpoint.append(dict(measurement, passed=None))
+                first, culprit, probability = posterior.likely_range(skipped)
+                continue
+            
+            samples = measurement['samples']
+            failed = measurement['censored'] or samples[min(count, len(samples)) - 1] > threshold
+            posterior.update(index, failed)
+            runs[index] = count
+            
+            if self.checkpoint:
+                self.checkpoint.append(dict(measurement, passed=not failed))
+            
+            first, culprit, probability = posterior.likely_range(skipped)
+            if self.verbose:
+                print(f"  run {total}: {commit.hexsha[:7]} {'fail' if failed else 'pass'} "
+                      f"(gain {gain:.2f} bits); best guess "
+                      f"{commits[culprit].hexsha[:7] if culprit < len(commits) else 'none'} "
+                      f"at {probability:.0%}")
+        
+        bad = posterior.cumulative()
+        for index in sorted(latest):
+            latest[index]['passed'] = None if index in skipped else bad[index] < 0.5
+            latest[index]['bad_probability'] = bad[index]
+            self.measurements.append(latest[index])
+        
+        if first < culprit:
+            self._culprit_range = [commits[i].hexsha
+                                   for i in range(first, min(culprit + 1, len(commits)))]
+        
+        self._search_info = {
+            'strategy': 'bayes',
+            'runs': sum(runs.values()),
+            'posterior': probability,
+            'converged': probability >= confidence,
+            'entropy': posterior.entropy()
+        }
+        
+        if probability < confidence:
+            print(f"Warning: stopped after {total} runs with the best candidate "
+                  f"at {probability:.0%}, below the requested {confidence:.0%}")
+        
+        return commits[culprit] if culprit < len(commits) else None
+    
+    def _search_prefetching(self, commits: CommitRange, benchmark_cmd: str, threshold: float,
+                            timeout: int):
+        """Serial search that checks out and builds both possible next probes meanwhile."""
+        with WorktreePool(self.repo, size=3) as pool:
+            self.prefetcher = Prefetcher(pool, self.repo, build=self.build,
+                                         cpus=self.noise.background_cpus(),
+                                         verbose=self.verbose)
+            try:
+                return self._search_serial(commits, benchmark_cmd, threshold, timeout, pool)
+            finally:
+                self.prefetcher.close()
+                self.prefetcher = None
+    
+    def _search_parallel(self, commits: CommitRange, benchmark_cmd: str, threshold: float,
+                         timeout: int, jobs: int):
+        """K-ary search testing jobs - 1 split points per round in separate worktrees."""
+        left, right = 0, len(commits) - 1
+        regression_commit = None
+        skipped: Set[int] = set()
+        
+        with ExitStack() as stack:
+            # Remote workers bring their own clones.
+            pool = None if self.workers else \
+                stack.enter_context(WorktreePool(self.repo, size=jobs))
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=jobs))
+            while left <= right:
+                points: List[int] = []
+                for point in self._split_points(left, right, max(1, jobs - 1)):
+                    point = self._nearest_testable(point, left, right, skipped, points)
+                    if point is not None:
+                        points.append(point)
+                if not points:
+                    break
+                points.sort()
+                
+                if self.verbose:
+                    shas = ', '.join(commits[i].hexsha[:7] for i in points)
+                    print(f"\nTesting {len(points)} commits in parallel: {shas}")
+                
+                futures = [
+                    executor.submit(self._measure, commits[i], benchmark_cmd,
+                                    threshold, timeout, pool)
+                    for i in points
+                ]
+                results = [future.result() for future in futures]
+                self.measurements.extend(results)
+                
+                for i, measurement in zip(points, results):
+                    if measurement.get('skipped'):
+                        skipped.add(i)
+                    elif measurement['passed']:
+                        left = i + 1
+                    else:
+                        regression_commit = commits[i]
+                        right = i - 1
+                        break
+        
+        self._culprit_range = self._culprit_range_of(commits, left, right, regression_commit)
+        return regression_commit
+    
+    @staticmethod
+    def _nearest_testable(index: int, left: int, right: int, skipped: Set[int],
+                          taken=()) -> Optional[int]:
+        """Closest index to index in [left, right] that is neither skipped nor taken."""
+        for offset in range(right - left + 1):
+            for candidate in (index + offset, index - offset):
+                if left <= candidate <= right and candidate not in skipped \
+                        and candidate not in taken:
+                    return candidate
+        return None
+    
+    def _culprit_range_of(self, commits: CommitRange, left: int, right: int,
+                          regression_commit) -> Optional[List[str]]:
+        """The candidates when only skipped commits separate good from bad."""
+        if left > right:
+            return None
+        candidates = [commits[i].hexsha for i in range(left, right + 1)]
+        if regression_commit is not None:
+            candidates.append(regression_commit.hexsha)
+        if self.verbose:
+            print(f"Only skipped commits are left to test; the culprit is one of "
+                  f"{len(candidates)} commits")
+        return candidates
+    
+    @staticmethod
+    def _split_points(left: int, right: int, count: int) -> List[int]:
+        """Return up to count evenly spaced indices in [left, right]."""
+        size = right - left + 1
+        count = min(count, size)
+        return sorted({left + (size * (j + 1)) // (count + 1) for j in range(count)})
+    
+    @contextmanager
+    def _workspace(self, commit, pool: Optional[WorktreePool] = None) -> Iterator[Optional[str]]:
+        """Check out a commit and yield the directory to run the benchmark in."""
+        if pool is None:
+            if self._held != commit.hexsha:
+                self._checkout(commit.hexsha)
+                self._retire_worker(self.repo.working_tree_dir)
+            yield None
+            return
+        
+        avoid = frozenset()
+        if self.prefetcher:
+            self.prefetcher.wait(commit)
+            avoid = self.prefetcher.reserved()
+        
+        with pool.lease(commit.hexsha, avoid=avoid) as path:
+            with self.tracer.span('checkout', 'checkout', ref=commit.hexsha[:12]):
+                pool.checkout(path, commit.hexsha)
+            self._retire_worker(str(path))
+            yield str(path)
+    
+    @contextmanager
+    def _hold(self, commit) -> Iterator[str]:
+        """Keep a commit checked out in the main tree while several benchmarks use it."""
+        with self._workspace(commit):
+            self._held = commit.hexsha
+            try:
+                yield self.repo.working_tree_dir
+            finally:
+                self._held = None
+    
+    def _measure(self, commit, benchmark_cmd: str, threshold: float, timeout: int,
+                 pool: Optional[WorktreePool] = None) -> Dict:
+        """Benchmark a commit and decide whether it passes the threshold."""
+        if commit.hexsha in self._completed:
+            return self._completed[commit.hexsha]
+        
+        key = self.paths.key(self.repo, commit) if self.paths else None
+        if key in self._by_paths:
+            # Same content on every relevant path: the earlier result stands.
+            earlier = self._by_paths[key]
+            measurement = dict(earlier, commit=commit.hexsha, message=commit.summary,
+                               reused_from=earlier['commit'])
+            if self.checkpoint:
+                self.checkpoint.append(measurement)
+            return measurement
+        
+        measurement = self._collect_or_skip(commit, benchmark_cmd, threshold, timeout,
+                                            self.sampling, pool)
+        if measurement.get('skipped'):
+            measurement['passed'] = None
+        elif measurement['censored']:
+            measurement['passed'] = False
+        else:
+            measurement['passed'] = self.sampling.decide(measurement['samples'], threshold)
+        
+        if key is not None:
+            self._by_paths[key] = measurement
+        if self.checkpoint:
+            self.checkpoint.append(measurement)
+        
+        return measurement
+    
+    def _collect_or_skip(self, commit, benchmark_cmd: str, threshold: float, timeout: int,
+                         sampling: SamplingPolicy, pool: Optional[WorktreePool] = None,
+                         known: Optional[List[float]] = None) -> Dict:
+        """Collect samples, or with skip_broken record a failing commit as skipped.
+        
+        Failures are cached per tree, so a broken commit is not retried later.
+        Timeouts of time metrics come back censored instead; for other metrics
+        they skip the commit for this run only.
+        """
+        if not self.skip_broken:
+            return self._collect(commit, benchmark_cmd, threshold, timeout, sampling,
+                                 pool, known)
+        
+        reason = self._known_breakage(commit, benchmark_cmd)
+        if reason is not None:
+            return self._skip(commit, benchmark_cmd, reason, cached=True)
+        try:
+            return self._collect(commit, benchmark_cmd, threshold, timeout, sampling,
+                                 pool, known)
+        except BenchmarkTimeout as e:
+            return self._skip(commit, benchmark_cmd, str(e), remember=False)
+        except (RuntimeError, ValueError) as e:
+            return self._skip(commit, benchmark_cmd, str(e).strip())
+    
+    def _known_breakage(self, commit, benchmark_cmd: str) -> Optional[str]:
+        """Why an earlier run could not measure this commit, if the cache recorded it."""
+        if not self.cache:
+            return None
+        with self.tracer.span('cache get', 'cache'):
+            return self.cache.get_broken(self._tree_key(commit),
+                                         self._cache_command(benchmark_cmd))
+    
+    def _skip(self, commit, benchmark_cmd: str, reason: str, cached: bool = False,
+              remember: bool = True) -> Dict:
+        """Record a commit that cannot be measured, remembering it in the cache."""
+        if self.cache and not cached and remember:
+            self.cache.put_broken(self._tree_key(commit), self._cache_command(benchmark_cmd),
+                                  reason)
+        if self.verbose:
+            source = ' (cached)' if cached else ''
+            print(f"  {commit.hexsha[:7]}: skipped{source}: {(reason.splitlines() or [''])[0]}")
         
         return {
-            'good_commit': good_sha,
-            'bad_commit': bad_sha,
+            'commit': commit.hexsha,
+            'message': commit.summary,
+            'duration': None,
+            'stdev': None,
+            'samples': [],
+            'skipped': True,
+            'skip_reason': reason,
+            'skip_cached': cached,
+            'censored': False,
+            'lower_bound': None,
+            'metrics': {}
+        }
+    
+    def _tree_key(self, commit) -> str:
+        """What cached results for a commit are keyed by."""
+        return self.paths.key(self.repo, commit) if self.paths else commit.tree.hexsha
+    
+    def _collect(self, commit, benchmark_cmd: str, threshold: float, timeout: int,
+                 sampling: SamplingPolicy, pool: Optional[WorktreePool] = None,
+                 known: Optional[List[float]] = None) -> Dict:
+        """Gather samples for a commit, checking it out only if the cache has too few.
+        
+        known overrides the cached samples with ones this run already holds.
+        """
+        with self.tracer.span('probe', 'probe', commit=commit.hexsha[:7]):
+            if self.workers:
+                return self._dispatch(commit, benchmark_cmd, threshold, timeout, sampling)
+            return self._gather(commit, benchmark_cmd, threshold, timeout, sampling, pool,
+                                known)
+    
+    def _dispatch(self, commit, benchmark_cmd: str, threshold: float, timeout: int,
+                  sampling: SamplingPolicy) -> Dict:
+        """Have a remote worker measure the commit in its own clone."""
+        request = {
+            'commit': commit.hexsha,
+            'benchmark_cmd': benchmark_cmd,
             'threshold': threshold,
-            'regression_commit': regression_commit.hexsha if regression_commit else None,
-            'regression_message': regression_commit.summary if regression_commit else None,
-            'measurements': self.measurements
+            'timeout': timeout,
+            'min_samples': sampling.min_samples,
+            'max_samples': sampling.max_samples,
+            'confidence': sampling.confidence,
+            'metric': self.metric,
+            'warmup': self.noise.warmup,
+            'pin_cpus': sorted(self.noise.cpus) if self.noise.cpus else None,
+            'extractors': [e.spec for e in self.parser.custom if e.spec]
         }
+        measurement = self.workers.probe(request, timeout * sampling.max_samples)
+        if self.verbose:
+            print(f"  {commit.hexsha[:7]}: measured by {measurement['worker']}")
+        return measurement
+    
+    def _gather(self, commit, benchmark_cmd: str, threshold: float, timeout: int,
+                sampling: SamplingPolicy, pool: Optional[WorktreePool],
+                known: Optional[List[float]]) -> Dict:
+        tree_sha = self._tree_key(commit)
+        cache_command = self._cache_command(benchmark_cmd)
+        if known is not None:
+            samples = list(known)
+        else:
+            samples = self._cache_get(tree_sha, cache_command) if self.cache else []
+        cached = len(samples)
+        build_info = {'build_time': None, 'build_cached': None}
+        collected: Dict[str, List[float]] = {}
+        setup_info = {'setup_time': None, 'setup_cached': None}
+        benchmark_time = 0.0
+        lower_bound: Optional[float] = None
+        environment = None
+        reference_samples: List[float] = []
+        # Interleaved samples are ratios; scale converts them back to the metric.
+        scale = self._reference['level'] if self._reference else 1.0
+        kill_after = None
+        if self.kill_factor is not None and threshold != float('inf'):
+            kill_after = threshold * scale * self.kill_factor
+        
+        if self.verbose and cached:
+            print(f"  {commit.hexsha[:7]}: reusing {cached} cached samples")
+        
+        if not sampling.should_stop(samples, threshold):
+            with self._workspace(commit, pool) as cwd, ExitStack() as stack:
+                workdir = cwd or self.repo.working_tree_dir
+                setup_info, build_info = self._prepare(commit, workdir, stack)
+                
+                environment = self.noise.snapshot()
+                start = time.perf_counter()
+                try:
+                    for _ in range(self.noise.warmup):
+                        self._sample(benchmark_cmd, timeout, workdir, {}, kill_after)
+                    while not sampling.should_stop(samples, threshold):
+                        if self._reference:
+                            # ABAB: the reference run right before each probe run
+                            # sees the same machine state.
+                            reference = self._sample(benchmark_cmd, timeout,
+                                                     self._reference['cwd'], {})
+                            value = self._sample(benchmark_cmd, timeout, workdir, collected,
+                                                 kill_after)
+                            reference_samples.append(reference)
+                            samples.append(value / reference)
+                        else:
+                            samples.append(self._sample(benchmark_cmd, timeout, workdir,
+                                                        collected, kill_after))
+                except BenchmarkKilled as e:
+                    lower_bound = e.lower_bound
+                    if self.verbose:
+                        print(f"  {commit.hexsha[:7]}: killed after {e.lower_bound:.3f}s "
+                              f"of {e.clock} time")
+                except BenchmarkTimeout as e:
+                    if self.metric not in TIME_METRICS:
+                        raise
+                    # Too slow is a result, not a failure: at least timeout seconds.
+                    lower_bound = e.timeout
+                    if self.verbose:
+                        print(f"  {commit.hexsha[:7]}: timed out after {e.timeout}s")
+                benchmark_time = time.perf_counter() - start
+        
+        if self.cache and len(samples) > cached:
+            with self.tracer.span('cache put', 'cache'):
+                self.cache.put(tree_sha, cache_command, samples)
+        
+        if lower_bound is not None:
+            # The probe only tells us the value is at least the kill point.
+            summary = {'median': lower_bound, 'stdev': 0.0}
+        else:
+            summary = summarize(samples)
+            summary = {'median': summary['median'] * scale, 'stdev': summary['stdev'] * scale}
+        
+        if self.verbose and len(samples) > 1 and lower_bound is None:
+            print(f"  {commit.hexsha[:7]}: median {summary['median']:.3f}s "
+                  f"± {summary['stdev']:.3f}s over {len(samples)} runs")
+        
+        return {
+            'commit': commit.hexsha,
+            'message': commit.summary,
+            'duration': summary['median'],
+            'stdev': summary['stdev'],
+            'samples': samples,
+            'setup_time': setup_info['setup_time'],
+            'setup_cached': setup_info['setup_cached'],
+            'build_time': build_info['build_time'],
+            'build_cached': build_info['build_cached'],
+            'benchmark_time': benchmark_time,
+            'censored': lower_bound is not None,
+            'lower_bound': lower_bound,
+            'environment': environment,
+            'warmup': self.noise.warmup if environment else 0,
+            'ratio': statistics.median(samples) if self._reference and samples else None,
+            'reference_samples': reference_samples,
+            'metrics': {name: statistics.median(values) for name, values in collected.items()}
+        }
+    
+    def _prepare(self, commit, workdir: str, stack: ExitStack):
+        """Lease the commit's environment for the stack's lifetime and build it."""
+        setup_info = {'setup_time': None, 'setup_cached': None}
+        build_info = {'build_time': None, 'build_cached': None}
+        
+        if self.environments:
+            with self.tracer.span('setup', 'setup', commit=commit.hexsha[:7]):
+                setup_info = stack.enter_context(
+                    self.environments.lease(self.repo, commit, workdir))
+            if self.verbose:
+                status = 'reused' if setup_info['setup_cached'] else \
+                    f"{setup_info['setup_time']:.1f}s"
+                print(f"  {commit.hexsha[:7]}: environment {status}")
+        
+        if self.build:
+            build_info = self._build(commit, workdir)
+            if self.verbose:
+                status = 'cached' if build_info['build_cached'] else \
+                    f"{build_info['build_time']:.1f}s"
+                print(f"  {commit.hexsha[:7]}: build {status}")
+        
+        return setup_info, build_info
+    
+    def _cache_get(self, tree_sha: str, cache_command: str) -> List[float]:
+        with self.tracer.span('cache get', 'cache'):
+            return self.cache.get(tree_sha, cache_command)
+    
+    def _cache_command(self, benchmark_cmd: str) -> str:
+        """Key cached samples by everything that produces them."""
+        steps = []
+        if self.environments:
+            steps.append(self.environments.setup_cmd)
+        if self.build:
+            steps.append(self.build.command)
+        command = ' && '.join(steps + [benchmark_cmd])
+        if self.metric != 'duration':
+            command += f' #{self.metric}'
+        if self._reference:
+            command += f" #ratio-to:{self._reference['tree']}"
+        for spec in (e.spec for e in self.parser.custom if e.spec):
+            command += f' #extract:{spec}'
+        return command
     
-    def run_benchmark(self, cmd: str, timeout: int) -> float:
+    def _sample(self, benchmark_cmd: str, timeout: int, cwd: Optional[str],
+                collected: Dict[str, List[float]], kill_after: Optional[float] = None) -> float:
+        """Run the benchmark once and return the metric being bisected."""
+        if self.python_callable:
+            return self.run_callable(timeout, cwd or self.repo.working_tree_dir)
+        
+        if self.collectors is None and self.metric == 'duration' and kill_after is None \
+                and not self.noise.cpus:
+            return self.run_benchmark(benchmark_cmd, timeout, cwd=cwd)
+        
+        metrics = self.run_benchmark_metrics(benchmark_cmd, timeout, cwd=cwd,
+                                             kill_after=kill_after)
+        for name, value in metrics.items():
+            collected.setdefault(name, []).append(value)
+        
+        if self.metric not in metrics:
+            raise RuntimeError(f"Metric {self.metric} was not collected")
+        return metrics[self.metric]
+    
+    def run_callable(self, timeout: int, cwd: str) -> float:
+        """Seconds per call of the Python callable, from the worker of this tree."""
+        with self._workers_lock:
+            worker = self._workers.get(cwd)
+        if worker is None:
+            # Like a shell benchmark, the callable runs in the tree's prepared environment.
+            python = self.environments.python(cwd) if self.environments else None
+            with self.tracer.span('start worker', 'setup', target=self.python_callable):
+                worker = CallableWorker(self.python_callable, cwd, timeout,
+                                        cpus=self.noise.cpus, python=python)
+            if self.verbose:
+                print(f"  Worker for {self.python_callable} in {cwd}: "
+                      f"{worker.loops} calls per sample")
+            with self._workers_lock:
+                self._workers[cwd] = worker
+        
+        with self.tracer.span('benchmark', 'benchmark'):
+            return worker.sample(timeout=timeout)[0]
+    
+    def _retire_worker(self, cwd: str) -> None:
+        """Stop the worker of a tree whose checkout just changed."""
+        with self._workers_lock:
+            worker = self._workers.pop(cwd, None)
+        if worker is not None:
+            worker.close()
+    
+    def _close_workers(self) -> None:
+        with self._workers_lock:
+            workers, self._workers = list(self._workers.values()), {}
+        for worker in workers:
+            worker.close()
+    
+    def run_benchmark(self, cmd: str, timeout: int, cwd: Optional[str] = None) -> float:
         """Execute benchmark command safely and extract duration."""
         try:
             args = shlex.split(cmd)
@@ -75,56 +1458,77 @@ class PerformanceBisector:
             if not args:
                 raise ValueError("Empty benchmark command")
             
-            result = subprocess.run(
-                args,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                shell=False
-            )
+            parse = self.parser.start(cwd)
+            # Lines are parsed as they stream, so stdout is never held in memory.
+            with self.tracer.span('benchmark', 'benchmark'):
+                result, _ = run_measured(args, cwd=cwd, timeout=timeout, collectors=[],
+                                         on_stdout=parse.feed)
             
             if result.returncode != 0:
                 raise RuntimeError(f"Benchmark failed: {result.stderr}")
             
-            return self._parse_duration(result.stdout)
+            with self.tracer.span('parse', 'parse'):
+                return self._parsed_duration(parse.finish(), parse)
             
         except subprocess.TimeoutExpired:
-            raise RuntimeError(f"Benchmark timed out after {timeout}s")
+            raise BenchmarkTimeout(timeout)
         except FileNotFoundError:
             raise RuntimeError(f"Benchmark command not found: {args[0]}")
     
-    def _parse_duration(self, output: str) -> float:
-        """Parse benchmark duration from output."""
+    def run_benchmark_metrics(self, cmd: str, timeout: int, cwd: Optional[str] = None,
+                              kill_after: Optional[float] = None) -> Dict[str, float]:
+        """Execute benchmark command and collect its duration plus resource metrics.
+        
+        Raises BenchmarkKilled if kill_after seconds of the kill clock pass first.
+        """
         try:
-            data = json.loads(output)
-            if 'duration' in data:
-                return float(data['duration'])
-            elif 'time' in data:
-                return float(data['time'])
-        except (json.JSONDecodeError, ValueError):
-            pass
-        
-        patterns = [
-            r'duration[:\s]+([0-9.]+)',
-            r'time[:\s]+([0-9.]+)',
-            r'([0-9.]+)\s*s(?:ec)?',
-            r'^([0-9.]+)$'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, output, re.IGNORECASE)
-            if match:
-                return float(match.group(1))
-        
-        raise ValueError(f"Could not parse duration from output: {output[:100]}")
-    
-    def _dry_run_result(self, commits: List, good_sha: str, bad_sha: str) -> Dict:
+            args = shlex.split(cmd)
+            
+            if not args:
+                raise ValueError("Empty benchmark command")
+            
+            parse = self.parser.start(cwd)
+            # Lines are parsed as they stream, so that share stays in this span.
+            with self.tracer.span('benchmark', 'benchmark'):
+                result, metrics = run_measured(args, cwd=cwd, timeout=timeout,
+                                               collectors=self.collectors,
+                                               kill_after=kill_after,
+                                               kill_clock=self.kill_clock,
+                                               on_stdout=parse.feed,
+                                               cpus=self.noise.cpus)
+            
+            if result.returncode != 0:
+                raise RuntimeError(f"Benchmark failed: {result.stderr}")
+            
+        except subprocess.TimeoutExpired:
+            raise BenchmarkTimeout(timeout)
+        except FileNotFoundError:
+            raise RuntimeError(f"Benchmark command not found: {args[0]}")
+        
+        with self.tracer.span('parse', 'parse'):
+            values = parse.finish()
+        metrics.update(values)
+        if 'duration' not in values:
+            # Only fatal when duration is what we bisect on.
+            if self.metric == 'duration' or 'wall_time' not in metrics:
+                self._parsed_duration(values, parse)
+            metrics['duration'] = metrics['wall_time']
+        
+        return metrics
+    
+    def _parsed_duration(self, values: Dict[str, float], parse: ParseRun) -> float:
+        """Return the extracted duration or explain what the output looked like."""
+        if 'duration' not in values:
+            raise ValueError(f"Could not parse duration from output: {parse.head[:100]}")
+        return values['duration']
+    
+    def _dry_run_result(self, commits: CommitRange, good_sha: str, bad_sha: str) -> Dict:
         """Generate dry-run result without executing benchmarks."""
         measurements = []
-        for commit in commits:
+        for sha, subject in commits.entries():
             measurements.append({
-                'commit': commit.hexsha,
-                'message': commit.summary,
+                'commit': sha,
+                'message': subject,
                 'duration': None,
                 'passed': None
             })
@@ -0,0 +1,118 @@
+"""Build step run before the timed benchmark, with a content-addressed artifact cache."""
+import hashlib
+import os
+import shlex
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from git import Repo
+
+from .isolation import run_isolated
+
+DEFAULT_BUILD_CACHE = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) \
+    / 'perf-bisect' / 'builds'
+
+COMPLETE_MARKER = '.perf-bisect-complete'
+
+
+class BuildStep:
+    def __init__(self, command: str, outputs: Optional[List[str]] = None,
+                 inputs: Optional[List[str]] = None, cache_dir: Optional[str] = None,
+                 timeout: Optional[int] = None):
+        self.command = command
+        self.outputs = list(outputs or [])
+        self.inputs = list(inputs or [])
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_BUILD_CACHE
+        self.timeout = timeout
+        self._built: Dict[str, str] = {}
+
+    def key(self, repo: Repo, commit) -> str:
+        """Hash the build command with the tree, or the configured input paths."""
+        digest = hashlib.sha256(self.command.encode())
+
+        if not self.inputs:
+            digest.update(commit.tree.hexsha.encode())
+        for path in sorted(self.inputs):
+            try:
+                object_id = repo.git.rev_parse(f'{commit.hexsha}:{path}')
+            except Exception:
+                object_id = '-'
+            digest.update(f'\0{path}\0{object_id}'.encode())
+
+        return digest.hexdigest()
+
+    def run(self, repo: Repo, commit, cwd: str, nice: int = 0,
+            cpus: Optional[Set[int]] = None) -> Dict:
+        """Build the checked out commit in cwd unless an identical build is available."""
+        key = self.key(repo, commit)
+
+        if self._built.get(cwd) == key:
+            return {'build_time': 0.0, 'build_cached': True}
+
+        entry = self.cache_dir / key
+        if self.outputs and (entry / COMPLETE_MARKER).exists():
+            self._restore(entry, Path(cwd))
+            self._built[cwd] = key
+            return {'build_time': 0.0, 'build_cached': True}
+
+        build_time = self._execute(cwd, nice, cpus)
+
+        if self.outputs:
+            self._store(Path(cwd), entry)
+        self._built[cwd] = key
+
+        return {'build_time': build_time, 'build_cached': False}
+
+    def _execute(self, cwd: str, nice: int = 0, cpus: Optional[Set[int]] = None) -> float:
+        """Run the build command and return how long it took."""
+        args = shlex.split(self.command)
+        if not args:
+            raise ValueError("Empty build command")
+
+        start = time.perf_counter()
+        try:
+            result = run_isolated(args, cwd=cwd, nice=nice, cpus=cpus, timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"Build timed out after {self.timeout}s")
+        except FileNotFoundError:
+            raise RuntimeError(f"Build command not found: {args[0]}")
+
+        if result.returncode != 0:
+            raise RuntimeError(f"Build failed: {result.stderr}")
+
+        return time.perf_counter() - start
+
+    def _store(self, workdir: Path, entry: Path) -> None:
+        """Copy build outputs into the cache, publishing the entry atomically."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix='.staging-', dir=str(self.cache_dir)))
+
+        try:
+            for output in self.outputs:
+                source = workdir / output
+                if source.is_dir():
+                    shutil.copytree(source, staging / output, symlinks=True)
+                elif source.exists():
+                    (staging / output).parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(source, staging / output)
+            (staging / COMPLETE_MARKER).touch()
+            os.replace(staging, entry)
+        except OSError:
+            # Another process published the same key first.
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _restore(self, entry: Path, workdir: Path) -> None:
+        """Copy cached outputs back into the working tree."""
+        for output in self.outputs:
+            source = entry / output
+            target = workdir / output
+            if source.is_dir():
+                shutil.rmtree(target, ignore_errors=True)
+                shutil.copytree(source, target, symlinks=True)
+            elif source.exists():
+                target.parent.mkdir(parents=True, exist_ok=True)
+                shutil.copy2(source, target)
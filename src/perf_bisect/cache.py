@@ -0,0 +1,194 @@
+"""Persistent SQLite cache of benchmark samples keyed by tree, command and host."""
+import hashlib
+import json
+import os
+import platform
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+DEFAULT_CACHE_PATH = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) \
+    / 'perf-bisect' / 'measurements.sqlite'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS measurements (
+    tree_sha TEXT NOT NULL,
+    command TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    samples TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (tree_sha, command, fingerprint)
+)
+'''
+
+# Trees where setup, build or benchmark failed, so later runs skip them.
+BROKEN_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS broken (
+    tree_sha TEXT NOT NULL,
+    command TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (tree_sha, command, fingerprint)
+)
+'''
+
+
+def environment_fingerprint() -> str:
+    """Hash the host properties that make timings comparable."""
+    parts = [
+        platform.node(),
+        platform.system(),
+        platform.release(),
+        platform.machine(),
+        platform.processor(),
+        str(os.cpu_count()),
+    ]
+    return hashlib.sha256('\0'.join(parts).encode()).hexdigest()[:16]
+
+
+class MeasurementCache:
+    def __init__(self, path: Optional[str] = None, fingerprint: Optional[str] = None,
+                 max_age_days: Optional[float] = None, max_entries: Optional[int] = None):
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self.fingerprint = fingerprint or environment_fingerprint()
+        self.max_age_days = max_age_days
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and apply eviction limits."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(SCHEMA)
+            self._conn.execute(BROKEN_SCHEMA)
+            self._conn.commit()
+            self._prune_locked(self.max_age_days, self.max_entries)
+        return self._conn
+
+    def get(self, tree_sha: str, command: str) -> List[float]:
+        """Return cached samples for a tree and command, or an empty list."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT samples FROM measurements '
+                'WHERE tree_sha = ? AND command = ? AND fingerprint = ?',
+                (tree_sha, command, self.fingerprint)
+            ).fetchone()
+
+            if row is None:
+                return []
+
+            conn.execute(
+                'UPDATE measurements SET last_used = ? '
+                'WHERE tree_sha = ? AND command = ? AND fingerprint = ?',
+                (time.time(), tree_sha, command, self.fingerprint)
+            )
+            conn.commit()
+            return json.loads(row[0])
+
+    def put(self, tree_sha: str, command: str, samples: List[float]) -> None:
+        """Store the full sample list for a tree and command."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT INTO measurements '
+                '(tree_sha, command, fingerprint, samples, created, last_used) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (tree_sha, command, fingerprint) '
+                'DO UPDATE SET samples = excluded.samples, last_used = excluded.last_used',
+                (tree_sha, command, self.fingerprint, json.dumps(samples), now, now)
+            )
+            conn.commit()
+
+    def get_broken(self, tree_sha: str, command: str) -> Optional[str]:
+        """Return why a tree could not be measured with a command, if it was recorded."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT reason FROM broken '
+                'WHERE tree_sha = ? AND command = ? AND fingerprint = ?',
+                (tree_sha, command, self.fingerprint)
+            ).fetchone()
+
+            if row is None:
+                return None
+
+            conn.execute(
+                'UPDATE broken SET last_used = ? '
+                'WHERE tree_sha = ? AND command = ? AND fingerprint = ?',
+                (time.time(), tree_sha, command, self.fingerprint)
+            )
+            conn.commit()
+            return row[0]
+
+    def put_broken(self, tree_sha: str, command: str, reason: str) -> None:
+        """Record that a tree cannot be measured with a command."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                'INSERT INTO broken '
+                '(tree_sha, command, fingerprint, reason, created, last_used) '
+                'VALUES (?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT (tree_sha, command, fingerprint) '
+                'DO UPDATE SET reason = excluded.reason, last_used = excluded.last_used',
+                (tree_sha, command, self.fingerprint, reason, now, now)
+            )
+            conn.commit()
+
+    def prune(self, max_age_days: Optional[float] = None,
+              max_entries: Optional[int] = None) -> int:
+        """Evict old entries and trim to the most recently used max_entries.
+
+        Broken-tree records follow the same policy, max_entries applying to
+        each table on its own.
+        """
+        with self._lock:
+            self._connect()
+            return self._prune_locked(max_age_days, max_entries)
+
+    def _prune_locked(self, max_age_days: Optional[float],
+                      max_entries: Optional[int]) -> int:
+        removed = 0
+
+        if max_age_days is not None:
+            cutoff = time.time() - max_age_days * 86400
+            removed += self._conn.execute(
+                'DELETE FROM measurements WHERE last_used < ?', (cutoff,)
+            ).rowcount
+            removed += self._conn.execute(
+                'DELETE FROM broken WHERE last_used < ?', (cutoff,)
+            ).rowcount
+
+        if max_entries is not None:
+            for table in ('measurements', 'broken'):
+                removed += self._conn.execute(
+                    f'DELETE FROM {table} WHERE rowid NOT IN '
+                    f'(SELECT rowid FROM {table} ORDER BY last_used DESC LIMIT ?)',
+                    (max_entries,)
+                ).rowcount
+
+        self._conn.commit()
+        return removed
+
+    def clear(self) -> int:
+        """Remove every cached measurement."""
+        with self._lock:
+            conn = self._connect()
+            removed = conn.execute('DELETE FROM measurements').rowcount
+            removed += conn.execute('DELETE FROM broken').rowcount
+            conn.commit()
+            return removed
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
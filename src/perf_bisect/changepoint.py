@@ -0,0 +1,77 @@
+"""Change-point detection over a series of per-commit measurements."""
+import math
+import statistics
+from typing import List, Optional
+
+
+def noise_sigma(values: List[float]) -> float:
+    """Robust noise estimate from the median absolute successive difference.
+
+    Differencing removes level shifts, so steps do not inflate the estimate.
+    """
+    if len(values) < 3:
+        return 0.0
+    diffs = [abs(b - a) for a, b in zip(values, values[1:])]
+    return statistics.median(diffs) / (0.6745 * math.sqrt(2))
+
+
+def default_penalty(values: List[float]) -> float:
+    """BIC-style penalty for one extra change in mean under Gaussian noise."""
+    sigma = noise_sigma(values)
+    if sigma == 0.0:
+        # Noise-free series: any real step is worth a segment.
+        scale = max((abs(v) for v in values), default=0.0) or 1.0
+        return 1e-9 * scale * scale
+    return 2.0 * sigma * sigma * math.log(max(len(values), 2))
+
+
+def pelt(values: List[float], penalty: Optional[float] = None, min_size: int = 1) -> List[int]:
+    """Indices where a new segment starts, by PELT with a change-in-mean cost.
+
+    Minimises total within-segment squared error plus penalty per change.
+    """
+    n = len(values)
+    if n < 2 * min_size:
+        return []
+    if penalty is None:
+        penalty = default_penalty(values)
+
+    sums = [0.0]
+    squares = [0.0]
+    for value in values:
+        sums.append(sums[-1] + value)
+        squares.append(squares[-1] + value * value)
+
+    def cost(start: int, end: int) -> float:
+        total = sums[end] - sums[start]
+        return squares[end] - squares[start] - total * total / (end - start)
+
+    best = [math.inf] * (n + 1)
+    best[0] = -penalty
+    previous = [0] * (n + 1)
+    candidates = [0]
+
+    for end in range(min_size, n + 1):
+        best[end], previous[end] = min(
+            (best[start] + cost(start, end) + penalty, start)
+            for start in candidates if end - start >= min_size)
+
+        # Drop starts that can never be optimal again.
+        candidates = [start for start in candidates
+                      if end - start < min_size or best[start] + cost(start, end) <= best[end]]
+        candidates.append(end)
+
+    changes = []
+    end = n
+    while end > 0:
+        start = previous[end]
+        if start > 0:
+            changes.append(start)
+        end = start
+    return sorted(changes)
+
+
+def segment_means(values: List[float], changes: List[int]) -> List[float]:
+    """Mean of each segment delimited by the change indices."""
+    bounds = [0] + list(changes) + [len(values)]
+    return [statistics.fmean(values[start:end]) for start, end in zip(bounds, bounds[1:])]
@@ -0,0 +1,76 @@
+"""Append-only JSONL checkpoints so interrupted bisect sessions can resume."""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+class Checkpoint:
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        # Values a session derived before probing, such as a measured baseline.
+        self.state: Dict = {}
+
+    def exists(self) -> bool:
+        return self.path.exists() and self.path.stat().st_size > 0
+
+    def load(self) -> Tuple[Dict, List[Dict]]:
+        """Return the session header and every completed measurement.
+
+        Saved state records are collected into self.state.
+        """
+        session = None
+        measurements = []
+        self.state = {}
+
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write leaves at most one partial trailing line.
+                    break
+
+                if record.get('type') == 'session':
+                    session = record['session']
+                elif record.get('type') == 'measurement':
+                    measurements.append(record['measurement'])
+                elif record.get('type') == 'state':
+                    self.state[record['name']] = record['value']
+
+        if session is None:
+            raise ValueError(f"Checkpoint has no session header: {self.path}")
+
+        return session, measurements
+
+    def start(self, session: Dict) -> List[Dict]:
+        """Write the session header, or return prior measurements of the same session."""
+        if self.exists():
+            saved, measurements = self.load()
+            if saved != session:
+                raise ValueError(f"Checkpoint {self.path} belongs to a different session")
+            return measurements
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.state = {}
+        self._write({'type': 'session', 'session': session})
+        return []
+
+    def append(self, measurement: Dict) -> None:
+        """Durably record one finished measurement."""
+        self._write({'type': 'measurement', 'measurement': measurement})
+
+    def save(self, name: str, value) -> None:
+        """Durably record a value derived for the session, so a resume reuses it."""
+        self._write({'type': 'state', 'name': name, 'value': value})
+        self.state[name] = value
+
+    def _write(self, record: Dict) -> None:
+        line = json.dumps(record) + '\n'
+        with self._lock:
+            with open(self.path, 'a') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
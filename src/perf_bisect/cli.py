@@ -1,10 +1,85 @@
 """CLI interface for perf-bisect."""
 import click
 import json
+import time
 from pathlib import Path
 from .bisector import PerformanceBisector
+from .build import BuildStep
+from .cache import MeasurementCache
+from .environment import EnvironmentPool
+from .metrics import METRICS, default_collectors, parse_quantity
+from .noise import parse_cpu_list
+from .parsing import OutputParser, parse_extractor
+from .remote import WorkerPool, serve
 from .reporter import Reporter
+from .suite import load_manifest
+from .trace import Tracer
 from .graph import GraphGenerator
+from .watch import Watcher
+
+
+class Quantity(click.ParamType):
+    """Number with an optional unit suffix such as 250ms or 512MiB."""
+    name = 'quantity'
+    
+    def convert(self, value, param, ctx):
+        if isinstance(value, float):
+            return value
+        try:
+            return parse_quantity(str(value))
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+
+
+class Percentage(click.ParamType):
+    """Fraction given as 15% or 0.15."""
+    name = 'percentage'
+    
+    def convert(self, value, param, ctx):
+        if isinstance(value, float):
+            return value
+        text = str(value).strip()
+        try:
+            if text.endswith('%'):
+                return float(text[:-1]) / 100
+            return float(text)
+        except ValueError:
+            self.fail(f"Invalid percentage: {value}", param, ctx)
+
+
+class CpuList(click.ParamType):
+    """CPU set given as 2, 0-3 or 0,2,4-5."""
+    name = 'cpus'
+    
+    def convert(self, value, param, ctx):
+        if isinstance(value, set):
+            return value
+        try:
+            return parse_cpu_list(str(value))
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+
+
+class ExtractorSpec(click.ParamType):
+    """Metric extractor such as duration=re:elapsed ([0-9.]+)s."""
+    name = 'extractor'
+    
+    def convert(self, value, param, ctx):
+        if not isinstance(value, str):
+            return value
+        try:
+            return parse_extractor(value)
+        except ValueError as e:
+            self.fail(str(e), param, ctx)
+
+
+def _finish_trace(tracer, path):
+    """Save the trace, also after a failed session, and show where the time went."""
+    if tracer is None:
+        return
+    tracer.write(path)
+    click.echo(f"\n{tracer.summary()}")
+    click.echo(f"Trace saved to: {path}")
 
 
 @click.group()
@@ -15,29 +90,163 @@ def cli():
 
 
 @cli.command()
-@click.argument('benchmark_cmd')
+@click.argument('benchmark_cmd', required=False, default='')
 @click.option('--good', default='HEAD~10', help='Known good commit')
 @click.option('--bad', default='HEAD', help='Known bad commit')
-@click.option('--threshold', type=float, required=True, help='Performance threshold in seconds')
+@click.option('--threshold', type=Quantity(),
+              help='Threshold for the metric, e.g. 1.5, 250ms or 512MiB')
+@click.option('--regression', type=Percentage(),
+              help='Derive the threshold as good endpoint + this much, e.g. 15%')
+@click.option('--baseline-samples', type=int, default=5,
+              help='Runs per endpoint when deriving the threshold from --regression')
+@click.option('--metric', default='duration',
+              help=f"Metric to bisect on: {', '.join(sorted(METRICS))} or an --extract name")
+@click.option('--extract', type=ExtractorSpec(), multiple=True,
+              help='NAME=re:PATTERN, NAME=json:/POINTER or NAME=file:PATH[:/POINTER] '
+                   '(repeatable; earlier ones win)')
 @click.option('--timeout', type=int, default=300, help='Benchmark timeout in seconds')
+@click.option('--python-callable', metavar='MODULE:FUNC',
+              help='Time this callable in one warm interpreter per commit instead of a command')
+@click.option('--kill-after', type=float,
+              help='Kill runs that pass this multiple of the threshold and count them as bad '
+                   '(needs --metric wall_time, or cpu_time with --kill-clock cpu)')
+@click.option('--kill-clock', type=click.Choice(['wall', 'cpu']), default='wall',
+              help='Clock compared against --kill-after')
 @click.option('--output', type=click.Path(), help='Save results to file (JSON/CSV)')
 @click.option('--dry-run', is_flag=True, help='Preview commits without running benchmarks')
+@click.option('--jobs', type=int, default=1,
+              help='Benchmark jobs - 1 commits per round in parallel git worktrees')
+@click.option('--min-samples', type=int, default=1, help='Minimum benchmark runs per commit')
+@click.option('--max-samples', type=int, default=1,
+              help='Maximum benchmark runs per commit; sampling stops early once decided')
+@click.option('--confidence', type=float, default=0.95,
+              help='Confidence level for the good/bad decision')
+@click.option('--first-parent', is_flag=True,
+              help='Bisect the mainline first, then descend into a culprit merge')
+@click.option('--paths', multiple=True,
+              help='Only test commits touching this path (repeatable)')
+@click.option('--exclude-paths', multiple=True,
+              help='Ignore commits that only touch this path or glob (repeatable)')
+@click.option('--skip-broken', is_flag=True,
+              help='Skip commits whose setup, build or benchmark fails instead of aborting')
+@click.option('--profile', is_flag=True,
+              help='Profile the culprit and its parent with cProfile and diff the functions')
+@click.option('--profile-cmd',
+              help='Profiler to use instead, e.g. "py-spy record -f raw -o {out} -- {cmd}"')
+@click.option('--profile-top', type=int, default=10, help='Functions to show in the profile diff')
+@click.option('--strategy', type=click.Choice(['binary', 'bayes']), default='binary',
+              help='Binary search, or single runs chosen by expected information gain')
+@click.option('--posterior', type=float, default=0.95,
+              help='bayes: stop once one commit is the culprit with this probability')
+@click.option('--flake-rate', type=float, default=0.1,
+              help='bayes: chance that one run lands on the wrong side of the threshold')
+@click.option('--max-runs', type=int, default=0, help='bayes: run budget (default from range size)')
+@click.option('--pin-cpus', type=CpuList(),
+              help='Run benchmarks only on these CPUs, e.g. 2-3 (needs --jobs 1)')
+@click.option('--warmup', type=int, default=0,
+              help='Discarded benchmark runs before sampling each commit')
+@click.option('--interleave', is_flag=True,
+              help='Pair each run with a run of the good commit and decide on the ratio')
+@click.option('--cache-path', type=click.Path(), help='Measurement cache database')
+@click.option('--no-cache', is_flag=True, help='Do not reuse or store cached measurements')
+@click.option('--checkpoint', type=click.Path(),
+              help='Append each measurement to this JSONL file for resuming')
+@click.option('--prefetch', is_flag=True,
+              help='Check out and build both possible next probes while benchmarking')
+@click.option('--build-cmd', help='Untimed build command run before the benchmark')
+@click.option('--build-output', multiple=True,
+              help='Build artifact path to cache and restore (repeatable)')
+@click.option('--build-input', multiple=True,
+              help='Source path whose contents key the build cache (repeatable)')
+@click.option('--build-cache-dir', type=click.Path(), help='Directory for cached builds')
+@click.option('--setup-cmd',
+              help='Dependency install command; {env} expands to the pooled environment dir')
+@click.option('--lockfile', multiple=True,
+              help='Lockfile whose contents key the environment pool (repeatable)')
+@click.option('--env-path', default='.venv',
+              help='Path in the working tree linked to the pooled environment')
+@click.option('--max-envs', type=int, default=5, help='Prepared environments to keep')
+@click.option('--trace', type=click.Path(),
+              help='Write a Chrome trace of every phase to this file (Perfetto, chrome://tracing)')
+@click.option('--workers', metavar='ADDRESS',
+              help='Listen on host:port or unix:/path and send probes to connected workers')
+@click.option('--min-workers', type=int, default=1,
+              help='Workers to wait for before bisecting with --workers')
+@click.option('--worker-wait', type=float, default=60,
+              help='Seconds to wait for workers to connect or become free')
 @click.option('--verbose', is_flag=True, help='Enable verbose logging')
-def run(benchmark_cmd, good, bad, threshold, timeout, output, dry_run, verbose):
+def run(benchmark_cmd, good, bad, threshold, regression, baseline_samples, metric, extract,
+        timeout, python_callable, kill_after, kill_clock, output, dry_run, jobs,
+        min_samples, max_samples, confidence, first_parent, paths, exclude_paths, skip_broken,
+        profile, profile_cmd, profile_top, strategy, posterior, flake_rate, max_runs,
+        pin_cpus, warmup, interleave,
+        cache_path, no_cache, checkpoint, prefetch,
+        build_cmd, build_output, build_input, build_cache_dir,
+        setup_cmd, lockfile, env_path, max_envs, trace, workers, min_workers, worker_wait,
+        verbose):
     """Run bisect to find performance regression."""
-    bisector = PerformanceBisector('.', verbose=verbose)
+    if bool(benchmark_cmd) == bool(python_callable):
+        raise click.UsageError('Specify exactly one of BENCHMARK_CMD or --python-callable')
+    if (threshold is None) == (regression is None):
+        raise click.UsageError('Specify exactly one of --threshold or --regression')
+    if setup_cmd and not lockfile:
+        raise click.UsageError('--setup-cmd requires at least one --lockfile')
+    parser = OutputParser(extract)
+    if metric not in METRICS and metric not in parser.names:
+        raise click.UsageError(f"Unknown metric {metric!r}; add an --extract for it")
+    
+    cache = None if no_cache else MeasurementCache(cache_path)
+    build = BuildStep(build_cmd, outputs=build_output, inputs=build_input,
+                      cache_dir=build_cache_dir) if build_cmd else None
+    environments = EnvironmentPool(setup_cmd, lockfile, env_path=env_path,
+                                   max_envs=max_envs) if setup_cmd else None
+    tracer = Tracer() if trace else None
+    pool = WorkerPool(workers, wait=worker_wait) if workers else None
+    bisector = PerformanceBisector('.', verbose=verbose, cache=cache, build=build,
+                                   environments=environments, collectors=default_collectors(),
+                                   parser=parser, tracer=tracer, workers=pool)
     
     try:
+        if pool:
+            pool.start()
+            click.echo(f"Waiting for {min_workers} worker(s) on {pool.bound_address}")
+            pool.wait_for_workers(min_workers, worker_wait)
         result = bisector.bisect(
             benchmark_cmd=benchmark_cmd,
             good_commit=good,
             bad_commit=bad,
             threshold=threshold,
+            regression=regression,
+            baseline_samples=baseline_samples,
             timeout=timeout,
-            dry_run=dry_run
+            dry_run=dry_run,
+            jobs=jobs,
+            min_samples=min_samples,
+            max_samples=max_samples,
+            confidence=confidence,
+            checkpoint=checkpoint,
+            prefetch=prefetch,
+            metric=metric,
+            kill_factor=kill_after,
+            kill_clock=kill_clock,
+            pin_cpus=pin_cpus,
+            warmup=warmup,
+            interleave=interleave,
+            strategy=strategy,
+            posterior=posterior,
+            flake_rate=flake_rate,
+            max_runs=max_runs,
+            first_parent=first_parent,
+            paths=list(paths),
+            exclude_paths=list(exclude_paths),
+            skip_broken=skip_broken,
+            profile=profile,
+            profile_cmd=profile_cmd,
+            profile_top=profile_top,
+            python_callable=python_callable
         )
         
-        reporter = Reporter()
+        reporter = Reporter(tracer)
         reporter.print_summary(result)
         
         if output and not dry_run:
@@ -47,6 +256,273 @@ def run(benchmark_cmd, good, bad, threshold, timeout, output, dry_run, verbose):
     except Exception as e:
         click.echo(f"Error: {e}", err=True)
         raise click.Abort()
+    finally:
+        if pool:
+            pool.close()
+        _finish_trace(tracer, trace)
+
+
+@cli.command()
+@click.argument('address')
+@click.option('--repo', type=click.Path(exists=True, file_okay=False), default='.',
+              help="This worker's own clone to check probes out in")
+@click.option('--name', help='Worker name shown in results (default host:pid)')
+@click.option('--fetch', help='Remote to fetch commits missing from the clone from')
+@click.option('--connect-timeout', type=float, default=60,
+              help='Seconds to keep retrying the coordinator')
+@click.option('--cache-path', type=click.Path(), help='Measurement cache database')
+@click.option('--no-cache', is_flag=True, help='Do not reuse or store cached measurements')
+@click.option('--build-cmd', help='Untimed build command run before the benchmark')
+@click.option('--build-output', multiple=True,
+              help='Build artifact path to cache and restore (repeatable)')
+@click.option('--build-input', multiple=True,
+              help='Source path whose contents key the build cache (repeatable)')
+@click.option('--build-cache-dir', type=click.Path(), help='Directory for cached builds')
+@click.option('--setup-cmd',
+              help='Dependency install command; {env} expands to the pooled environment dir')
+@click.option('--lockfile', multiple=True,
+              help='Lockfile whose contents key the environment pool (repeatable)')
+@click.option('--env-path', default='.venv',
+              help='Path in the working tree linked to the pooled environment')
+@click.option('--max-envs', type=int, default=5, help='Prepared environments to keep')
+@click.option('--verbose', is_flag=True, help='Enable verbose logging')
+def worker(address, repo, name, fetch, connect_timeout, cache_path, no_cache,
+           build_cmd, build_output, build_input, build_cache_dir,
+           setup_cmd, lockfile, env_path, max_envs, verbose):
+    """Measure probes for a `run --workers ADDRESS` coordinator."""
+    if setup_cmd and not lockfile:
+        raise click.UsageError('--setup-cmd requires at least one --lockfile')
+    
+    cache = None if no_cache else MeasurementCache(cache_path)
+    build = BuildStep(build_cmd, outputs=build_output, inputs=build_input,
+                      cache_dir=build_cache_dir) if build_cmd else None
+    environments = EnvironmentPool(setup_cmd, lockfile, env_path=env_path,
+                                   max_envs=max_envs) if setup_cmd else None
+    bisector = PerformanceBisector(repo, verbose=verbose, cache=cache, build=build,
+                                   environments=environments, collectors=default_collectors())
+    
+    try:
+        served = serve(address, bisector, name=name, connect_timeout=connect_timeout,
+                       fetch=fetch)
+        click.echo(f"Coordinator done; measured {served} probe(s)")
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+
+@cli.command()
+@click.argument('checkpoint', type=click.Path(exists=True))
+@click.option('--output', type=click.Path(), help='Save results to file (JSON/CSV)')
+@click.option('--cache-path', type=click.Path(), help='Measurement cache database')
+@click.option('--no-cache', is_flag=True, help='Do not reuse or store cached measurements')
+@click.option('--verbose', is_flag=True, help='Enable verbose logging')
+def resume(checkpoint, output, cache_path, no_cache, verbose):
+    """Resume an interrupted bisect from its checkpoint file."""
+    cache = None if no_cache else MeasurementCache(cache_path)
+    bisector = PerformanceBisector('.', verbose=verbose, cache=cache,
+                                   collectors=default_collectors())
+    
+    try:
+        result = bisector.resume(checkpoint)
+        
+        reporter = Reporter()
+        reporter.print_summary(result)
+        
+        if output:
+            reporter.save_report(result, output)
+            click.echo(f"\nResults saved to: {output}")
+            
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+
+
+@cli.command()
+@click.argument('benchmark_cmd')
+@click.option('--good', default='HEAD~10', help='Start of the range (excluded)')
+@click.option('--bad', default='HEAD', help='End of the range')
+@click.option('--stride', type=int, default=0,
+              help='Measure every k-th commit (default: about 64 evenly spaced commits)')
+@click.option('--jobs', type=int, default=1, help='Commits benchmarked concurrently')
+@click.option('--samples', type=int, default=3, help='Benchmark runs per sampled commit')
+@click.option('--penalty', type=float,
+              help='Change-point penalty; higher finds fewer steps (default from noise level)')
+@click.option('--min-effect', type=Percentage(), default=0.0,
+              help='Ignore steps smaller than this, e.g. 5%')
+@click.option('--metric', default='duration',
+              help=f"Metric to sweep: {', '.join(sorted(METRICS))} or an --extract name")
+@click.option('--extract', type=ExtractorSpec(), multiple=True,
+              help='NAME=re:PATTERN, NAME=json:/POINTER or NAME=file:PATH[:/POINTER]')
+@click.option('--timeout', type=int, default=300, help='Benchmark timeout in seconds')
+@click.option('--output', type=click.Path(), help='Save results to file (JSON/CSV)')
+@click.option('--cache-path', type=click.Path(), help='Measurement cache database')
+@click.option('--no-cache', is_flag=True, help='Do not reuse or store cached measurements')
+@click.option('--trace', type=click.Path(),
+              help='Write a Chrome trace of every phase to this file (Perfetto, chrome://tracing)')
+@click.option('--verbose', is_flag=True, help='Enable verbose logging')
+def sweep(benchmark_cmd, good, bad, stride, jobs, samples, penalty, min_effect, metric, extract,
+          timeout, output, cache_path, no_cache, trace, verbose):
+    """Find every regression and improvement in a range."""
+    parser = OutputParser(extract)
+    if metric not in METRICS and metric not in parser.names:
+        raise click.UsageError(f"Unknown metric {metric!r}; add an --extract for it")
+    
+    cache = None if no_cache else MeasurementCache(cache_path)
+    tracer = Tracer() if trace else None
+    bisector = PerformanceBisector('.', verbose=verbose, cache=cache,
+                                   collectors=default_collectors(), parser=parser,
+                                   tracer=tracer)
+    
+    try:
+        result = bisector.sweep(
+            benchmark_cmd=benchmark_cmd,
+            good_commit=good,
+            bad_commit=bad,
+            stride=stride,
+            jobs=jobs,
+            samples=samples,
+            timeout=timeout,
+            metric=metric,
+            penalty=penalty,
+            min_effect=min_effect
+        )
+        
+        reporter = Reporter(tracer)
+        reporter.print_sweep(result)
+        
+        if output:
+            reporter.save_report(result, output)
+            click.echo(f"\nResults saved to: {output}")
+            
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+    finally:
+        _finish_trace(tracer, trace)
+
+
+@cli.command()
+@click.argument('manifest', type=click.Path(exists=True))
+@click.option('--good', default='HEAD~10', help='Known good commit')
+@click.option('--bad', default='HEAD', help='Known bad commit')
+@click.option('--timeout', type=int, default=300,
+              help='Benchmark timeout in seconds, unless the manifest sets one')
+@click.option('--baseline-samples', type=int, default=5,
+              help='Endpoint runs for benchmarks with a regression instead of a threshold')
+@click.option('--min-samples', type=int, default=1, help='Minimum benchmark runs per commit')
+@click.option('--max-samples', type=int, default=1,
+              help='Maximum benchmark runs per commit; sampling stops early once decided')
+@click.option('--confidence', type=float, default=0.95,
+              help='Confidence level for the good/bad decision')
+@click.option('--skip-broken', is_flag=True,
+              help='Skip commits whose build or benchmark fails instead of aborting')
+@click.option('--build-cmd', help='Untimed build command run once per probed commit')
+@click.option('--build-output', multiple=True,
+              help='Build artifact path to cache and restore (repeatable)')
+@click.option('--build-input', multiple=True,
+              help='Source path whose contents key the build cache (repeatable)')
+@click.option('--build-cache-dir', type=click.Path(), help='Directory for cached builds')
+@click.option('--output', type=click.Path(), help='Save results to file (JSON/CSV)')
+@click.option('--cache-path', type=click.Path(), help='Measurement cache database')
+@click.option('--no-cache', is_flag=True, help='Do not reuse or store cached measurements')
+@click.option('--trace', type=click.Path(),
+              help='Write a Chrome trace of every phase to this file (Perfetto, chrome://tracing)')
+@click.option('--verbose', is_flag=True, help='Enable verbose logging')
+def suite(manifest, good, bad, timeout, baseline_samples, min_samples, max_samples, confidence,
+          skip_broken, build_cmd, build_output, build_input, build_cache_dir,
+          output, cache_path, no_cache, trace, verbose):
+    """Bisect every benchmark of a JSON manifest over one range."""
+    try:
+        benchmarks = load_manifest(manifest)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    
+    cache = None if no_cache else MeasurementCache(cache_path)
+    build = BuildStep(build_cmd, outputs=build_output, inputs=build_input,
+                      cache_dir=build_cache_dir) if build_cmd else None
+    tracer = Tracer() if trace else None
+    bisector = PerformanceBisector('.', verbose=verbose, cache=cache, build=build,
+                                   collectors=default_collectors(), tracer=tracer)
+    
+    try:
+        result = bisector.bisect_suite(
+            benchmarks,
+            good_commit=good,
+            bad_commit=bad,
+            timeout=timeout,
+            min_samples=min_samples,
+            max_samples=max_samples,
+            confidence=confidence,
+            baseline_samples=baseline_samples,
+            skip_broken=skip_broken
+        )
+        
+        reporter = Reporter(tracer)
+        reporter.print_suite(result)
+        
+        if output:
+            reporter.save_report(result, output)
+            click.echo(f"\nResults saved to: {output}")
+            
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
+    finally:
+        _finish_trace(tracer, trace)
+
+
+@cli.command()
+@click.argument('benchmark_cmd')
+@click.option('--branch', default='HEAD', help='Branch or ref to follow')
+@click.option('--remote', help='Fetch this remote before every poll (watch e.g. origin/main)')
+@click.option('--history', type=click.Path(), default='.perf-bisect-watch.jsonl',
+              help='JSONL file the measured series is appended to')
+@click.option('--since', help='Seed a new history here and measure everything after it')
+@click.option('--interval', type=float, default=300, help='Seconds between polls')
+@click.option('--once', is_flag=True, help='Poll once and exit (for cron or CI)')
+@click.option('--batch', type=int, default=1,
+              help='Measure every N-th newly landed commit plus the newest')
+@click.option('--window', type=int, default=5,
+              help='Recent measurements forming the rolling baseline')
+@click.option('--regression', type=Percentage(), default=0.1,
+              help='Step size against the baseline that triggers a bisect, e.g. 10%')
+@click.option('--samples', type=int, default=3, help='Benchmark runs per measured commit')
+@click.option('--metric', default='duration',
+              help=f"Metric to watch: {', '.join(sorted(METRICS))} or an --extract name")
+@click.option('--extract', type=ExtractorSpec(), multiple=True,
+              help='NAME=re:PATTERN, NAME=json:/POINTER or NAME=file:PATH[:/POINTER]')
+@click.option('--timeout', type=int, default=300, help='Benchmark timeout in seconds')
+@click.option('--cache-path', type=click.Path(), help='Measurement cache database')
+@click.option('--no-cache', is_flag=True, help='Do not reuse or store cached measurements')
+@click.option('--verbose', is_flag=True, help='Enable verbose logging')
+def watch(benchmark_cmd, branch, remote, history, since, interval, once, batch, window,
+          regression, samples, metric, extract, timeout, cache_path, no_cache, verbose):
+    """Benchmark commits as they land and bisect steps against a rolling baseline."""
+    parser = OutputParser(extract)
+    if metric not in METRICS and metric not in parser.names:
+        raise click.UsageError(f"Unknown metric {metric!r}; add an --extract for it")
+    
+    cache = None if no_cache else MeasurementCache(cache_path)
+    bisector = PerformanceBisector('.', verbose=verbose, cache=cache,
+                                   collectors=default_collectors(), parser=parser)
+    reporter = Reporter()
+    
+    try:
+        watcher = Watcher(bisector, benchmark_cmd, history, branch=branch,
+                          regression=regression, window=window, batch=batch,
+                          samples=samples, timeout=timeout, metric=metric,
+                          since=since, remote=remote)
+        while True:
+            records = watcher.poll()
+            reporter.print_watch(records, metric)
+            if once:
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        click.echo(f"\nStopped; history kept in {history}")
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        raise click.Abort()
 
 
 @cli.command()
@@ -77,7 +553,7 @@ def graph(results_file, height, width):
             raise click.Abort()
             
         generator = GraphGenerator(height=height, width=width)
-        graph_output = generator.generate(data['measurements'])
+        graph_output = generator.generate(data['measurements'], data.get('metric', 'duration'))
         click.echo(graph_output)
         
     except Exception as e:
@@ -85,5 +561,30 @@ def graph(results_file, height, width):
         raise click.Abort()
 
 
+@cli.group()
+def cache():
+    """Manage the persistent measurement cache."""
+    pass
+
+
+@cache.command()
+@click.option('--cache-path', type=click.Path(), help='Measurement cache database')
+@click.option('--max-age-days', type=float, help='Evict entries unused for this many days')
+@click.option('--max-entries', type=int,
+              help='Keep only this many most recently used entries, and as many broken trees')
+def prune(cache_path, max_age_days, max_entries):
+    """Evict old or excess cached measurements."""
+    removed = MeasurementCache(cache_path).prune(max_age_days, max_entries)
+    click.echo(f"Removed {removed} cached measurements")
+
+
+@cache.command()
+@click.option('--cache-path', type=click.Path(), help='Measurement cache database')
+def clear(cache_path):
+    """Remove all cached measurements."""
+    removed = MeasurementCache(cache_path).clear()
+    click.echo(f"Removed {removed} cached measurements")
+
+
 if __name__ == '__main__':
     cli()
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""Compact, array-backed commit ranges with lazily loaded subjects."""
+import binascii
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from git import Repo
+
+SHA_BYTES = 20
+# Each record is a commit SHA followed by its tree SHA, both binary.
+RECORD_BYTES = 2 * SHA_BYTES
+SUBJECT_BATCH = 1000
+
+
+class TreeRef:
+    __slots__ = ('hexsha',)
+
+    def __init__(self, hexsha: str):
+        self.hexsha = hexsha
+
+
+class CommitRef:
+    """Lightweight stand-in for a GitPython Commit inside a CommitRange."""
+    __slots__ = ('_range', 'index')
+
+    def __init__(self, commit_range: 'CommitRange', index: int):
+        self._range = commit_range
+        self.index = index
+
+    @property
+    def hexsha(self) -> str:
+        return self._range.hexsha(self.index)
+
+    @property
+    def tree(self) -> TreeRef:
+        return TreeRef(self._range.tree_hexsha(self.index))
+
+    @property
+    def summary(self) -> str:
+        return self._range.summary(self.index)
+
+    def __eq__(self, other) -> bool:
+        return getattr(other, 'hexsha', None) == self.hexsha
+
+    def __hash__(self) -> int:
+        return hash(self.hexsha)
+
+    def __repr__(self) -> str:
+        return f'<CommitRef {self.hexsha[:7]}>'
+
+
+class CommitRange:
+    def __init__(self, repo: Repo, records: bytes, spec: Optional[List[str]] = None):
+        if len(records) % RECORD_BYTES:
+            raise ValueError("Commit records must be whole commit/tree SHA pairs")
+        self.repo = repo
+        self.records = records
+        self.spec = spec or []
+        self._subjects: Dict[int, str] = {}
+
+    @classmethod
+    def resolve(cls, repo: Repo, good_sha: str, bad_sha: str, *args: str,
+                subjects: bool = False, pathspecs: Optional[List[str]] = None
+                ) -> 'CommitRange':
+        """List good..bad oldest first with a single git call.
+
+        With subjects=True the subject of every commit is read in the same call.
+        pathspecs keeps only commits that touch matching paths.
+        """
+        spec = list(args) + [f'{good_sha}..{bad_sha}']
+        if pathspecs:
+            spec += ['--'] + list(pathspecs)
+
+        if not subjects:
+            output = repo.git.log('--reverse', '--no-show-signature', '--format=%H%T', *spec)
+            return cls(repo, binascii.unhexlify(output.replace('\n', '')), spec)
+
+        output = repo.git.log('--reverse', '--no-show-signature', '--format=%H%T%s', *spec)
+        lines = output.split('\n') if output else []
+        commit_range = cls(repo, binascii.unhexlify(''.join(line[:80] for line in lines)), spec)
+        commit_range._subjects = {i: line[80:] for i, line in enumerate(lines)}
+        return commit_range
+
+    def __len__(self) -> int:
+        return len(self.records) // RECORD_BYTES
+
+    def __getitem__(self, index: int) -> CommitRef:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("commit index out of range")
+        return CommitRef(self, index)
+
+    def __iter__(self) -> Iterator[CommitRef]:
+        for index in range(len(self)):
+            yield CommitRef(self, index)
+
+    def hexsha(self, index: int) -> str:
+        offset = index * RECORD_BYTES
+        return self.records[offset:offset + SHA_BYTES].hex()
+
+    def tree_hexsha(self, index: int) -> str:
+        offset = index * RECORD_BYTES + SHA_BYTES
+        return self.records[offset:offset + SHA_BYTES].hex()
+
+    def index_of(self, sha: str) -> int:
+        """Position of a full commit SHA in the range."""
+        target = binascii.unhexlify(sha)
+        offset = self.records.find(target)
+        while offset != -1 and offset % RECORD_BYTES:
+            offset = self.records.find(target, offset + 1)
+        if offset == -1:
+            raise ValueError(f"{sha} is not in the range")
+        return offset // RECORD_BYTES
+
+    def entries(self) -> Iterator[Tuple[str, str]]:
+        """Yield (hexsha, subject) for every commit, loading missing subjects in batches."""
+        self.load_subjects(range(len(self)))
+        hexes = self.records.hex()
+        step = 2 * RECORD_BYTES
+
+        for index in range(len(self)):
+            offset = index * step
+            yield hexes[offset:offset + 2 * SHA_BYTES], self._subjects[index]
+
+    def summary(self, index: int) -> str:
+        if index not in self._subjects:
+            self.load_subjects([index])
+        return self._subjects[index]
+
+    def load_subjects(self, indices: Iterable[int]) -> None:
+        """Fetch subjects for the given commits in batched git calls."""
+        missing = [i for i in indices if i not in self._subjects]
+
+        for start in range(0, len(missing), SUBJECT_BATCH):
+            batch = missing[start:start + SUBJECT_BATCH]
+            positions = {self.hexsha(i): i for i in batch}
+            output = self.repo.git.log('--no-walk=unsorted', '--no-show-signature',
+                                       '--format=%H%x00%s', *positions)
+            for line in output.splitlines():
+                sha, _, subject = line.partition('\0')
+                if sha in positions:
+                    self._subjects[positions[sha]] = subject
+
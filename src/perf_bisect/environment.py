@@ -0,0 +1,141 @@
+"""LRU pool of dependency environments keyed by lockfile contents."""
+import hashlib
+import os
+import shlex
+import shutil
+import subprocess
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from git import Repo
+
+DEFAULT_ENV_ROOT = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) \
+    / 'perf-bisect' / 'envs'
+
+READY_MARKER = '.perf-bisect-ready'
+
+
+class EnvironmentPool:
+    def __init__(self, setup_cmd: str, lockfiles: List[str], env_path: str = '.venv',
+                 root: Optional[str] = None, max_envs: int = 5,
+                 timeout: Optional[int] = None):
+        if not lockfiles:
+            raise ValueError("At least one lockfile is required to key environments")
+        self.setup_cmd = setup_cmd
+        self.lockfiles = list(lockfiles)
+        self.env_path = env_path
+        self.root = Path(root) if root else DEFAULT_ENV_ROOT
+        self.max_envs = max_envs
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._in_use: Dict[str, int] = {}
+
+    def key(self, repo: Repo, commit) -> str:
+        """Hash the setup command with the lockfile blobs at a commit."""
+        digest = hashlib.sha256(self.setup_cmd.encode())
+
+        for path in sorted(self.lockfiles):
+            try:
+                object_id = repo.git.rev_parse(f'{commit.hexsha}:{path}')
+            except Exception:
+                object_id = '-'
+            digest.update(f'\0{path}\0{object_id}'.encode())
+
+        return digest.hexdigest()[:32]
+
+    @contextmanager
+    def lease(self, repo: Repo, commit, cwd: str) -> Iterator[Dict]:
+        """Link a ready environment into cwd and keep it from eviction while in use."""
+        key = self.key(repo, commit)
+        env_dir = self.root / key
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+            self._in_use[key] = self._in_use.get(key, 0) + 1
+
+        try:
+            with key_lock:
+                if (env_dir / READY_MARKER).exists():
+                    setup_time, cached = 0.0, True
+                else:
+                    setup_time, cached = self._create(env_dir, cwd), False
+
+                (env_dir / READY_MARKER).touch()
+                self._link(env_dir, Path(cwd))
+
+            yield {'setup_time': setup_time, 'setup_cached': cached}
+        finally:
+            with self._lock:
+                self._in_use[key] -= 1
+            self.evict()
+
+    def python(self, cwd: str) -> Optional[str]:
+        """Interpreter of the environment linked into cwd, if it has one."""
+        env = Path(cwd) / self.env_path
+        for candidate in (env / 'bin' / 'python', env / 'Scripts' / 'python.exe'):
+            if candidate.exists():
+                return str(candidate)
+        return None
+
+    def _create(self, env_dir: Path, cwd: str) -> float:
+        """Run the setup command to build a fresh environment in env_dir."""
+        shutil.rmtree(env_dir, ignore_errors=True)
+        env_dir.parent.mkdir(parents=True, exist_ok=True)
+
+        args = [arg.replace('{env}', str(env_dir)) for arg in shlex.split(self.setup_cmd)]
+        if not args:
+            raise ValueError("Empty setup command")
+
+        env = dict(os.environ, PERF_BISECT_ENV=str(env_dir))
+        start = time.perf_counter()
+        try:
+            result = subprocess.run(args, capture_output=True, text=True, cwd=cwd, env=env,
+                                    timeout=self.timeout, shell=False)
+        except subprocess.TimeoutExpired:
+            shutil.rmtree(env_dir, ignore_errors=True)
+            raise RuntimeError(f"Setup timed out after {self.timeout}s")
+        except FileNotFoundError:
+            raise RuntimeError(f"Setup command not found: {args[0]}")
+
+        if result.returncode != 0:
+            shutil.rmtree(env_dir, ignore_errors=True)
+            raise RuntimeError(f"Setup failed: {result.stderr}")
+
+        env_dir.mkdir(parents=True, exist_ok=True)
+        return time.perf_counter() - start
+
+    def _link(self, env_dir: Path, workdir: Path) -> None:
+        """Point env_path inside the working tree at the pooled environment."""
+        link = workdir / self.env_path
+
+        if link.is_symlink():
+            if Path(os.readlink(link)) == env_dir:
+                return
+            link.unlink()
+        elif link.exists():
+            raise RuntimeError(f"{link} exists and is not managed by perf-bisect")
+
+        link.parent.mkdir(parents=True, exist_ok=True)
+        link.symlink_to(env_dir, target_is_directory=True)
+
+    def evict(self) -> List[str]:
+        """Remove least recently used environments beyond max_envs."""
+        if not self.root.exists():
+            return []
+
+        ready = [path for path in self.root.iterdir() if (path / READY_MARKER).exists()]
+        ready.sort(key=lambda path: (path / READY_MARKER).stat().st_mtime, reverse=True)
+
+        removed = []
+        with self._lock:
+            for path in ready[self.max_envs:]:
+                if self._in_use.get(path.name):
+                    continue
+                shutil.rmtree(path, ignore_errors=True)
+                removed.append(path.name)
+
+        return removed
@@ -1,5 +1,21 @@
 """ASCII graph generation for performance visualization."""
-from typing import List, Dict
+from typing import Callable, List, Dict
+from .metrics import BYTE_METRICS, COUNT_METRICS, TIME_METRICS
+
+
+def axis_format(metric: str, max_val: float) -> Callable[[float], str]:
+    """Label format for one axis, with a single unit suited to the metric."""
+    if metric in TIME_METRICS:
+        return lambda value: f"{value:6.2f}s"
+    if metric in BYTE_METRICS:
+        unit, size = next(((unit, size) for unit, size in
+                           (('GiB', 1024 ** 3), ('MiB', 1024 ** 2), ('KiB', 1024))
+                           if max_val >= size), ('B', 1))
+        return lambda value: f"{value / size:6.2f}{unit}"
+    if metric in COUNT_METRICS:
+        return lambda value: f"{value:6.1f}"
+    # Named metrics extracted from output carry no unit we know of.
+    return lambda value: f"{value:6.3g}"
 
 
 class GraphGenerator:
@@ -7,8 +23,8 @@ class GraphGenerator:
         self.height = height
         self.width = width
     
-    def generate(self, measurements: List[Dict]) -> str:
-        """Generate ASCII graph from measurements."""
+    def generate(self, measurements: List[Dict], metric: str = 'duration') -> str:
+        """Generate ASCII graph from measurements of metric."""
         if not measurements or all(m['duration'] is None for m in measurements):
             return "No data to graph"
         
@@ -22,26 +38,35 @@ class GraphGenerator:
         if max_val == min_val:
             max_val = min_val + 1
         
+        label = axis_format(metric, max_val)
+        levels = [min_val + (max_val - min_val) * (i / self.height)
+                  for i in range(self.height + 1)]
+        width = max(len(label(level)) for level in levels)
         lines = []
+        shown = [(m['duration'], m.get('censored'), m.get('passed'))
+                 for m in measurements[:self.width]]
         
         for i in range(self.height, 0, -1):
-            threshold = min_val + (max_val - min_val) * (i / self.height)
-            line = f"{threshold:6.2f}s |"
+            threshold = levels[i]
+            line = f"{label(threshold):>{width}} |"
             
-            for m in measurements[:self.width]:
-                if m['duration'] is None:
+            for duration, censored, passed in shown:
+                if duration is None:
                     line += " "
-                elif m['duration'] >= threshold:
-                    line += "█" if m['passed'] else "▓"
+                elif censored and (duration >= threshold or i == self.height):
+                    # Killed runs only have a lower bound; draw them open-ended.
+                    line += "▒" if duration >= threshold else "↑"
+                elif duration >= threshold:
+                    line += "█" if passed else "▓"
                 else:
                     line += " "
             
             lines.append(line)
         
-        lines.append("       " + "-" * min(len(measurements), self.width))
+        lines.append(" " * width + "-" * min(len(measurements), self.width))
         
-        commit_line = "        "
-        for i, m in enumerate(measurements[:self.width]):
+        commit_line = " " * (width + 1)
+        for i in range(len(shown)):
             if i % 5 == 0:
                 commit_line += "|"
             else:
@@ -0,0 +1,51 @@
+"""Helpers for running helper processes at low priority on dedicated CPUs."""
+import os
+import subprocess
+from typing import List, Optional, Set
+
+
+def available_cpus() -> Set[int]:
+    """CPUs this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return set(os.sched_getaffinity(0))
+    return set(range(os.cpu_count() or 1))
+
+
+def default_background_cpus() -> Optional[Set[int]]:
+    """Reserve the highest numbered CPU for background work when there is more than one."""
+    cpus = available_cpus()
+    if len(cpus) < 2:
+        return None
+    return {max(cpus)}
+
+
+def run_isolated(args: List[str], cwd: Optional[str] = None, nice: int = 0,
+                 cpus: Optional[Set[int]] = None, timeout: Optional[float] = None,
+                 env: Optional[dict] = None) -> subprocess.CompletedProcess:
+    """Run a command like subprocess.run, lowering its priority and pinning it to cpus.
+
+    Both are applied in the child before it executes, so nothing it starts
+    runs at full priority or on other CPUs.
+    """
+    def isolate():
+        try:
+            if nice:
+                os.nice(nice)
+            if cpus and hasattr(os, 'sched_setaffinity'):
+                os.sched_setaffinity(0, cpus)
+        except OSError:
+            # Isolation is best effort; run the command regardless.
+            pass
+
+    proc = subprocess.Popen(args, cwd=cwd, env=env, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, text=True,
+                            preexec_fn=isolate if nice or cpus else None)
+
+    try:
+        stdout, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.communicate()
+        raise
+
+    return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
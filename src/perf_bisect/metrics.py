@@ -0,0 +1,283 @@
+"""Resource metrics for the benchmark child: rusage from wait4 plus /proc sampling."""
+import os
+import re
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+TIME_METRICS = {'duration', 'wall_time', 'user_time', 'sys_time', 'cpu_time'}
+BYTE_METRICS = {'max_rss', 'read_bytes', 'write_bytes'}
+COUNT_METRICS = {'block_in', 'block_out', 'voluntary_switches', 'involuntary_switches'}
+METRICS = TIME_METRICS | BYTE_METRICS | COUNT_METRICS
+# The metric each early-kill clock reads, and so the only one it can bound.
+KILL_CLOCKS = {'wall': 'wall_time', 'cpu': 'cpu_time'}
+# Only the tail of stderr is kept for error messages.
+STDERR_TAIL = 64 * 1024
+
+UNITS = {
+    '': 1, 'b': 1,
+    'k': 1000, 'kb': 1000, 'kib': 1024,
+    'm': 1000 ** 2, 'mb': 1000 ** 2, 'mib': 1024 ** 2,
+    'g': 1000 ** 3, 'gb': 1000 ** 3, 'gib': 1024 ** 3,
+    's': 1, 'sec': 1, 'ms': 1e-3, 'us': 1e-6, 'ns': 1e-9,
+}
+
+
+def parse_quantity(text: str) -> float:
+    """Parse a threshold such as '1.5', '250ms' or '512MiB' into base units."""
+    match = re.fullmatch(r'\s*([0-9]*\.?[0-9]+(?:[eE][-+]?[0-9]+)?)\s*([a-zA-Z]*)\s*', text)
+    if not match or match.group(2).lower() not in UNITS:
+        raise ValueError(f"Invalid quantity: {text}")
+    return float(match.group(1)) * UNITS[match.group(2).lower()]
+
+
+def format_value(value: Optional[float], metric: str = 'duration') -> str:
+    """Render a metric value with a unit suited to the metric."""
+    if value is None:
+        return '-'
+    if metric in BYTE_METRICS:
+        for unit, size in (('GiB', 1024 ** 3), ('MiB', 1024 ** 2), ('KiB', 1024)):
+            if abs(value) >= size:
+                return f"{value / size:.1f}{unit}"
+        return f"{value:.0f}B"
+    if metric in COUNT_METRICS:
+        return f"{value:.0f}"
+    if metric not in TIME_METRICS:
+        # Named metrics extracted from output carry no unit we know of.
+        return f"{value:g}"
+    return f"{value:.3f}s"
+
+
+class BenchmarkKilled(Exception):
+    """Raised when a run is stopped early for clearly exceeding its limit."""
+
+    def __init__(self, clock: str, lower_bound: float):
+        super().__init__(f"Benchmark killed after {lower_bound:.3f}s of {clock} time")
+        self.clock = clock
+        self.lower_bound = lower_bound
+
+
+class BenchmarkTimeout(RuntimeError):
+    """Raised when a run outlasts its timeout, so it took at least that long."""
+
+    def __init__(self, timeout: float):
+        super().__init__(f"Benchmark timed out after {timeout}s")
+        self.timeout = timeout
+
+
+def process_cpu_time(pid: int) -> Optional[float]:
+    """User plus system time of pid and its reaped children, from /proc/<pid>/stat."""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+    except (OSError, IndexError):
+        return None
+    # Fields after the command name start at state (field 3); utime is field 14.
+    ticks = sum(int(value) for value in fields[11:15])
+    return ticks / os.sysconf('SC_CLK_TCK')
+
+
+class MetricCollector:
+    """Base class for collectors; override whichever hooks you need.
+
+    sample is polled while the child runs, which suits peak-style readings.
+    exited is called once the child has exited but before it is reaped, so
+    /proc/<pid> still holds its final counters.
+    """
+
+    def start(self, pid: int) -> None:
+        pass
+
+    def sample(self, pid: int) -> None:
+        pass
+
+    def exited(self, pid: int) -> None:
+        pass
+
+    def finish(self, rusage, wall_time: float) -> Dict[str, float]:
+        return {}
+
+
+class RusageCollector(MetricCollector):
+    """CPU, peak memory, block I/O and context switches from wait4."""
+
+    def finish(self, rusage, wall_time: float) -> Dict[str, float]:
+        # ru_maxrss is KiB on Linux and bytes on macOS.
+        rss_scale = 1 if sys.platform == 'darwin' else 1024
+        return {
+            'wall_time': wall_time,
+            'user_time': rusage.ru_utime,
+            'sys_time': rusage.ru_stime,
+            'cpu_time': rusage.ru_utime + rusage.ru_stime,
+            'max_rss': float(rusage.ru_maxrss * rss_scale),
+            'block_in': float(rusage.ru_inblock),
+            'block_out': float(rusage.ru_oublock),
+            'voluntary_switches': float(rusage.ru_nvcsw),
+            'involuntary_switches': float(rusage.ru_nivcsw),
+        }
+
+
+class ProcIOCollector(MetricCollector):
+    """Bytes read and written by the child, read from /proc/<pid>/io at exit."""
+
+    def __init__(self):
+        self._last: Dict[str, float] = {}
+
+    def start(self, pid: int) -> None:
+        self._last = {}
+
+    def exited(self, pid: int) -> None:
+        try:
+            with open(f'/proc/{pid}/io') as f:
+                fields = dict(line.split(':', 1) for line in f if ':' in line)
+        except OSError:
+            return
+        self._last = {
+            'read_bytes': float(fields.get('read_bytes', 0)),
+            'write_bytes': float(fields.get('write_bytes', 0)),
+        }
+
+    def finish(self, rusage, wall_time: float) -> Dict[str, float]:
+        return dict(self._last)
+
+
+def default_collectors() -> List[MetricCollector]:
+    collectors: List[MetricCollector] = [RusageCollector()]
+    if os.path.exists('/proc/self/io'):
+        collectors.append(ProcIOCollector())
+    return collectors
+
+
+def _exit_code(status: int) -> int:
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _kill_group(proc: subprocess.Popen) -> None:
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (OSError, ProcessLookupError):
+        pass
+
+
+def run_measured(args: List[str], cwd: Optional[str] = None, timeout: Optional[float] = None,
+                 collectors: Optional[List[MetricCollector]] = None,
+                 sample_interval: float = 0.05, kill_after: Optional[float] = None,
+                 kill_clock: str = 'wall', on_stdout: Optional[Callable[[str], None]] = None,
+                 cpus: Optional[Set[int]] = None
+                 ) -> Tuple[subprocess.CompletedProcess, Dict[str, float]]:
+    """Run a command, reaping it with wait4 so its own rusage can be read.
+
+    Where waitid supports WNOWAIT, the exited child is left unreaped until
+    collectors have read its final /proc counters.
+
+    The child gets its own process group so timeouts and kill_after (seconds
+    of wall or CPU time) stop everything it spawned. With on_stdout, stdout
+    lines are handed over as they arrive instead of being kept. cpus pins the
+    child before it executes, so every thread it starts inherits the mask.
+    """
+    if kill_clock not in ('wall', 'cpu'):
+        raise ValueError(f"Unknown kill clock: {kill_clock}")
+
+    pin = None
+    if cpus and hasattr(os, 'sched_setaffinity'):
+        def pin():
+            os.sched_setaffinity(0, cpus)
+
+    collectors = default_collectors() if collectors is None else collectors
+    start = time.perf_counter()
+    proc = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, start_new_session=True, preexec_fn=pin)
+    for collector in collectors:
+        collector.start(proc.pid)
+
+    output: Dict[str, str] = {}
+
+    def drain(name, stream):
+        output[name] = stream.read()
+        stream.close()
+
+    def stream_lines(name, stream):
+        for line in stream:
+            on_stdout(line)
+        output[name] = ''
+        stream.close()
+
+    def drain_tail(name, stream):
+        tail = ''
+        for chunk in iter(lambda: stream.read(8192), ''):
+            tail = (tail + chunk)[-STDERR_TAIL:]
+        output[name] = tail
+        stream.close()
+
+    readers = [threading.Thread(target=stream_lines if on_stdout else drain,
+                                args=('stdout', proc.stdout), daemon=True),
+               threading.Thread(target=drain_tail, args=('stderr', proc.stderr), daemon=True)]
+    for reader in readers:
+        reader.start()
+
+    done = threading.Event()
+    timed_out = threading.Event()
+    killed: Dict[str, float] = {}
+
+    def watch():
+        deadline = None if timeout is None else start + timeout
+        while not done.wait(sample_interval):
+            for collector in collectors:
+                collector.sample(proc.pid)
+
+            elapsed = time.perf_counter() - start
+            if deadline is not None and elapsed >= timeout:
+                timed_out.set()
+                _kill_group(proc)
+                return
+
+            if kill_after is not None:
+                used = elapsed if kill_clock == 'wall' else process_cpu_time(proc.pid)
+                if used is not None and used > kill_after:
+                    killed['lower_bound'] = used
+                    _kill_group(proc)
+                    return
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+
+    try:
+        if hasattr(os, 'waitid') and hasattr(os, 'WNOWAIT'):
+            os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+            wall_time = time.perf_counter() - start
+            done.set()
+            watcher.join()
+            for collector in collectors:
+                collector.exited(proc.pid)
+            _, status, rusage = os.wait4(proc.pid, 0)
+        else:
+            _, status, rusage = os.wait4(proc.pid, 0)
+            wall_time = time.perf_counter() - start
+    except BaseException:
+        # Do not leave the detached process group running on ctrl-C.
+        _kill_group(proc)
+        raise
+    done.set()
+    # Tell Popen the child is already reaped.
+    proc.returncode = _exit_code(status)
+    watcher.join()
+    for reader in readers:
+        reader.join()
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(args, timeout, output.get('stdout'), output.get('stderr'))
+    if killed:
+        raise BenchmarkKilled(kill_clock, killed['lower_bound'])
+
+    metrics: Dict[str, float] = {}
+    for collector in collectors:
+        metrics.update(collector.finish(rusage, wall_time))
+
+    completed = subprocess.CompletedProcess(args, proc.returncode, output.get('stdout', ''),
+                                            output.get('stderr', ''))
+    return completed, metrics
@@ -0,0 +1,75 @@
+"""Measurement noise controls: CPU pinning, warmup runs and reference interleaving."""
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from .isolation import available_cpus, default_background_cpus
+
+GOVERNOR_PATH = '/sys/devices/system/cpu/cpu{}/cpufreq/scaling_governor'
+
+
+def parse_cpu_list(text: str) -> Set[int]:
+    """Parse a CPU list such as '2', '0-3' or '0,2,4-5'."""
+    cpus: Set[int] = set()
+    try:
+        for part in text.split(','):
+            part = part.strip()
+            if '-' in part:
+                first, last = part.split('-', 1)
+                cpus.update(range(int(first), int(last) + 1))
+            elif part:
+                cpus.add(int(part))
+    except ValueError:
+        raise ValueError(f"Invalid CPU list: {text}")
+    if not cpus:
+        raise ValueError(f"Invalid CPU list: {text}")
+    return cpus
+
+
+def cpu_governors(cpus: Set[int]) -> List[str]:
+    """Distinct frequency governors of the given CPUs, where the kernel exposes them."""
+    governors = set()
+    for cpu in cpus:
+        try:
+            with open(GOVERNOR_PATH.format(cpu)) as f:
+                governors.add(f.read().strip())
+        except OSError:
+            continue
+    return sorted(governors)
+
+
+@dataclass
+class NoiseControl:
+    """Where and how each benchmark run happens, to keep samples comparable."""
+    cpus: Optional[Set[int]] = None
+    warmup: int = 0
+    interleave: bool = False
+
+    def __post_init__(self):
+        if self.warmup < 0:
+            raise ValueError("warmup must not be negative")
+        if self.cpus is not None:
+            self.cpus = set(self.cpus)
+            unknown = self.cpus - available_cpus()
+            if unknown:
+                raise ValueError(f"CPUs not available to this process: "
+                                 f"{', '.join(map(str, sorted(unknown)))}")
+
+    def background_cpus(self) -> Optional[Set[int]]:
+        """CPUs for prefetch work, kept off the pinned benchmark CPUs."""
+        if self.cpus is None:
+            return default_background_cpus()
+        return (available_cpus() - self.cpus) or None
+
+    def snapshot(self) -> Dict:
+        """Record the conditions a probe was measured under."""
+        cpus = self.cpus if self.cpus is not None else available_cpus()
+        try:
+            load = list(os.getloadavg())
+        except OSError:
+            load = None
+        return {
+            'cpus': sorted(cpus),
+            'loadavg': load,
+            'governor': cpu_governors(cpus) or None,
+        }
@@ -0,0 +1,265 @@
+"""Line-streaming extraction of metric values from benchmark output."""
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+NUMBER = r'[-+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?'
+DEFAULT_RETAIN = 64 * 1024
+
+
+def resolve_pointer(document, pointer: str):
+    """Look up an RFC 6901 JSON pointer such as /results/0/time."""
+    if pointer == '':
+        return document
+    if not pointer.startswith('/'):
+        raise ValueError(f"JSON pointer must start with '/': {pointer}")
+
+    value = document
+    for token in pointer[1:].split('/'):
+        token = token.replace('~1', '/').replace('~0', '~')
+        if isinstance(value, list):
+            value = value[int(token)]
+        elif isinstance(value, dict):
+            value = value[token]
+        else:
+            raise KeyError(token)
+    return value
+
+
+class Extractor:
+    """Pulls one named metric out of benchmark output."""
+
+    def __init__(self, name: str, spec: Optional[str] = None):
+        self.name = name
+        self.spec = spec
+
+    def scan(self, line: str) -> Optional[float]:
+        """Return the value if this stdout line contains it."""
+        return None
+
+    def prepare(self, cwd: Path) -> None:
+        """Called before each run."""
+
+    def read(self, cwd: Path) -> Optional[float]:
+        """Called after the run exits; for values not printed on stdout."""
+        return None
+
+
+class RegexExtractor(Extractor):
+    """First capture group (or whole match) of a compiled pattern on a line."""
+
+    def __init__(self, name: str, pattern: str, flags: int = 0, spec: Optional[str] = None):
+        super().__init__(name, spec)
+        self.pattern = re.compile(pattern, flags)
+
+    def scan(self, line: str) -> Optional[float]:
+        match = self.pattern.search(line)
+        if not match:
+            return None
+        try:
+            return float(match.group(1) if match.groups() else match.group(0))
+        except ValueError:
+            return None
+
+
+class JsonPointerExtractor(Extractor):
+    """Value at a JSON pointer inside a line that is a JSON document."""
+
+    def __init__(self, name: str, pointer: str, spec: Optional[str] = None):
+        super().__init__(name, spec)
+        self.pointer = pointer
+
+    def scan(self, line: str) -> Optional[float]:
+        stripped = line.strip()
+        if not stripped.startswith(('{', '[')):
+            return None
+        try:
+            return self.lookup(json.loads(stripped))
+        except json.JSONDecodeError:
+            return None
+
+    def lookup(self, document) -> Optional[float]:
+        try:
+            return float(resolve_pointer(document, self.pointer))
+        except (KeyError, IndexError, ValueError, TypeError):
+            return None
+
+
+class ResultFileExtractor(Extractor):
+    """Value read from a file the benchmark writes, relative to its working tree.
+
+    The file is removed before each run so a stale result is never read.
+    """
+
+    def __init__(self, name: str, path: str, pointer: Optional[str] = None,
+                 spec: Optional[str] = None):
+        super().__init__(name, spec)
+        self.path = path
+        self.pointer = pointer
+
+    def prepare(self, cwd: Path) -> None:
+        try:
+            (cwd / self.path).unlink()
+        except FileNotFoundError:
+            pass
+
+    def read(self, cwd: Path) -> Optional[float]:
+        try:
+            text = (cwd / self.path).read_text()
+        except OSError:
+            return None
+
+        try:
+            if self.pointer is not None:
+                return JsonPointerExtractor(self.name, self.pointer).lookup(json.loads(text))
+            return float(text.strip())
+        except ValueError:
+            return None
+
+
+def default_extractors() -> List[Extractor]:
+    """Duration patterns understood when no duration extractor is configured."""
+    return [
+        JsonPointerExtractor('duration', '/duration'),
+        JsonPointerExtractor('duration', '/time'),
+        RegexExtractor('duration', rf'duration[:\s]+({NUMBER})', re.IGNORECASE),
+        RegexExtractor('duration', rf'\btime[:\s]+({NUMBER})', re.IGNORECASE),
+        RegexExtractor('duration', rf'^\s*({NUMBER})\s*s(?:ec)?\s*$', re.IGNORECASE),
+        RegexExtractor('duration', rf'^\s*({NUMBER})\s*$'),
+    ]
+
+
+def parse_extractor(text: str) -> Extractor:
+    """Parse NAME=re:PATTERN, NAME=json:/POINTER or NAME=file:PATH[:/POINTER]."""
+    name, sep, rest = text.partition('=')
+    kind, colon, argument = rest.partition(':')
+    if not sep or not colon or not name.strip() or not argument:
+        raise ValueError(f"Invalid extractor {text!r}; expected NAME=KIND:ARGUMENT")
+    name = name.strip()
+
+    if kind == 're':
+        try:
+            return RegexExtractor(name, argument, spec=text)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern in extractor {text!r}: {e}")
+    if kind == 'json':
+        if not argument.startswith('/'):
+            raise ValueError(f"JSON pointer must start with '/': {argument}")
+        return JsonPointerExtractor(name, argument, spec=text)
+    if kind == 'file':
+        path, _, pointer = argument.partition(':/')
+        return ResultFileExtractor(name, path, '/' + pointer if pointer else None, spec=text)
+    raise ValueError(f"Unknown extractor kind {kind!r}; use re, json or file")
+
+
+class OutputParser:
+    """Ordered extractors; earlier extractors for a metric take precedence.
+
+    Without a configured duration extractor the built-in duration patterns
+    are appended as fallbacks.
+    """
+
+    def __init__(self, extractors: Optional[Iterable[Extractor]] = None,
+                 retain: int = DEFAULT_RETAIN):
+        self.custom = list(extractors or [])
+        self.extractors = list(self.custom)
+        if not any(e.name == 'duration' for e in self.custom):
+            self.extractors += default_extractors()
+        self.retain = retain
+
+    @property
+    def names(self) -> List[str]:
+        return sorted({e.name for e in self.extractors})
+
+    def start(self, cwd: Optional[str] = None) -> 'ParseRun':
+        """Begin parsing one run started in cwd."""
+        return ParseRun(self, Path(cwd or '.'))
+
+    def parse(self, output: str, cwd: Optional[str] = None) -> Dict[str, float]:
+        """Parse already captured output."""
+        run = ParseRun(self, Path(cwd or '.'), prepare=False)
+        run.feed_text(output)
+        return run.finish()
+
+
+class ParseRun:
+    """Parse state for a single benchmark run, fed one stdout line at a time.
+
+    Output is kept only up to the parser's retain limit and only until every
+    metric has been found by its highest-precedence extractor.
+    """
+
+    def __init__(self, parser: OutputParser, cwd: Path, prepare: bool = True):
+        self.parser = parser
+        self.cwd = cwd
+        self.values: Dict[str, float] = {}
+        self._rank: Dict[str, int] = {}
+        self._streamed = [(rank, e) for rank, e in enumerate(parser.extractors)
+                          if type(e).scan is not Extractor.scan]
+        # Once each metric has its best stdout match, later lines can be skipped.
+        self._pending: Dict[str, int] = {}
+        for rank, extractor in self._streamed:
+            self._pending.setdefault(extractor.name, rank)
+        self._head: List[str] = []
+        self._head_size = 0
+        self.truncated = False
+        if prepare:
+            for extractor in parser.extractors:
+                extractor.prepare(cwd)
+
+    @property
+    def settled(self) -> bool:
+        return not self._pending
+
+    @property
+    def head(self) -> str:
+        return ''.join(self._head)
+
+    def feed(self, line: str) -> None:
+        if self.settled:
+            return
+
+        if self._head_size < self.parser.retain:
+            self._head.append(line if line.endswith('\n') else line + '\n')
+            self._head_size += len(line) + 1
+        else:
+            self.truncated = True
+
+        for rank, extractor in self._streamed:
+            if self._rank.get(extractor.name, len(self.parser.extractors)) <= rank:
+                continue
+            value = extractor.scan(line)
+            if value is not None:
+                self.values[extractor.name] = value
+                self._rank[extractor.name] = rank
+                if self._pending.get(extractor.name) == rank:
+                    del self._pending[extractor.name]
+
+    def feed_text(self, output: str) -> None:
+        """Feed output that was captured in one piece."""
+        for line in output.splitlines():
+            if self.settled:
+                break
+            self.feed(line)
+
+    def finish(self) -> Dict[str, float]:
+        """Apply post-run extractors and return every metric found."""
+        for rank, extractor in enumerate(self.parser.extractors):
+            if self._rank.get(extractor.name, len(self.parser.extractors)) <= rank:
+                continue
+            value = extractor.read(self.cwd)
+            if value is None and isinstance(extractor, JsonPointerExtractor) \
+                    and not self.truncated:
+                # Pretty-printed JSON spans lines; retry on the whole output.
+                value = self._whole_json(extractor)
+            if value is not None:
+                self.values[extractor.name] = value
+                self._rank[extractor.name] = rank
+        return dict(self.values)
+
+    def _whole_json(self, extractor: JsonPointerExtractor) -> Optional[float]:
+        try:
+            return extractor.lookup(json.loads(self.head))
+        except json.JSONDecodeError:
+            return None
@@ -0,0 +1,48 @@
+"""Restricting a bisect to the paths a benchmark actually depends on."""
+import fnmatch
+import hashlib
+from typing import Dict, List, Optional
+
+from git import Repo
+
+
+class PathFilter:
+    """Include and exclude paths, as git pathspecs relative to the repository root."""
+
+    def __init__(self, include: Optional[List[str]] = None,
+                 exclude: Optional[List[str]] = None):
+        self.include = list(include or [])
+        self.exclude = list(exclude or [])
+        self._keys: Dict[str, str] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.include or self.exclude)
+
+    def pathspecs(self) -> List[str]:
+        """Pathspecs for git log; excludes alone apply to the whole tree."""
+        specs = list(self.include) or ['.']
+        return specs + [f':(exclude){path}' for path in self.exclude]
+
+    def excluded(self, path: str) -> bool:
+        """True if path lies under, or matches the glob of, an excluded path."""
+        for pattern in self.exclude:
+            pattern = pattern.rstrip('/')
+            if path == pattern or path.startswith(pattern + '/') \
+                    or fnmatch.fnmatchcase(path, pattern):
+                return True
+        return False
+
+    def key(self, repo: Repo, commit) -> str:
+        """Hash of the filtered tree, equal for commits that agree on every relevant path."""
+        sha = commit.hexsha
+        if sha not in self._keys:
+            if self.exclude:
+                # ls-tree has no exclude magic, so list files and drop excluded ones.
+                listing = repo.git.ls_tree('-r', '-z', '--full-tree', sha, '--', *self.include)
+                listing = '\0'.join(entry for entry in listing.split('\0')
+                                     if entry and not self.excluded(entry.split('\t', 1)[1]))
+            else:
+                # Included directories hash by their tree id without listing them.
+                listing = repo.git.ls_tree('--full-tree', sha, '--', *self.include)
+            self._keys[sha] = 'paths:' + hashlib.sha1(listing.encode()).hexdigest()
+        return self._keys[sha]
@@ -0,0 +1,77 @@
+"""Speculative checkout and build of the next bisect candidates."""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Optional, Set
+
+from git import Repo
+
+from .build import BuildStep
+from .worktree import WorktreePool
+
+
+class Prefetcher:
+    def __init__(self, pool: WorktreePool, repo: Repo, build: Optional[BuildStep] = None,
+                 nice: int = 19, cpus: Optional[Set[int]] = None, verbose: bool = False):
+        self.pool = pool
+        self.repo = repo
+        self.build = build
+        self.nice = nice
+        self.cpus = cpus
+        self.verbose = verbose
+        self._executor = ThreadPoolExecutor(max_workers=max(1, pool.size - 1))
+        self._pending: Dict[str, Future] = {}
+        self._keep: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def prefetch(self, commits: List, current=None) -> None:
+        """Start preparing candidates in spare worktrees, dropping stale requests."""
+        wanted = {commit.hexsha for commit in commits}
+
+        with self._lock:
+            self._keep = wanted | ({current.hexsha} if current is not None else set())
+
+            for sha, future in list(self._pending.items()):
+                if sha not in wanted and future.cancel():
+                    del self._pending[sha]
+
+            for commit in commits:
+                if commit.hexsha in self._pending or self.pool.holds(commit.hexsha):
+                    continue
+                self._pending[commit.hexsha] = self._executor.submit(self._prepare, commit)
+
+    def wait(self, commit) -> None:
+        """Block until an in-flight prefetch of commit has finished."""
+        with self._lock:
+            future = self._pending.pop(commit.hexsha, None)
+
+        if future is None:
+            return
+
+        try:
+            future.result()
+        except Exception as e:
+            # The probe itself checks out and builds again and reports real errors.
+            if self.verbose:
+                print(f"  prefetch of {commit.hexsha[:7]} failed: {e}")
+
+    def reserved(self) -> Set[str]:
+        """Commits whose prepared worktrees should not be reused yet."""
+        with self._lock:
+            return set(self._keep)
+
+    def _prepare(self, commit) -> None:
+        with self.pool.lease(commit.hexsha, avoid=self._keep - {commit.hexsha}) as path:
+            self.pool.checkout(path, commit.hexsha, nice=self.nice, cpus=self.cpus)
+            if self.build:
+                self.build.run(self.repo, commit, str(path), nice=self.nice, cpus=self.cpus)
+
+        if self.verbose:
+            print(f"  prefetched {commit.hexsha[:7]}")
+
+    def close(self) -> None:
+        """Cancel queued prefetches and wait for running ones."""
+        with self._lock:
+            for future in self._pending.values():
+                future.cancel()
+            self._pending = {}
+        self._executor.shutdown(wait=True)
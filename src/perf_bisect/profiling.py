@@ -0,0 +1,134 @@
+"""Profiling a commit's benchmark and diffing per-function times between commits."""
+import os
+import pstats
+import re
+import shlex
+import shutil
+import subprocess
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+# function label -> (self time, cumulative time)
+Profile = Dict[str, Tuple[float, float]]
+
+PYTHON = re.compile(r'python[0-9.]*$')
+
+
+def cprofile_command(args: List[str], out: str) -> List[str]:
+    """Run a Python benchmark command under cProfile, writing stats to out."""
+    if not args or not PYTHON.match(os.path.basename(args[0])):
+        raise ValueError(f"Cannot profile {args[0] if args else 'an empty command'} with "
+                         f"cProfile; pass a profiler command with {{cmd}} and {{out}}")
+    rest = args[1:]
+    if rest and rest[0].startswith('-') and rest[0] != '-m':
+        raise ValueError(f"Cannot insert cProfile before interpreter option {rest[0]}; "
+                         f"pass a profiler command instead")
+    return [args[0], '-m', 'cProfile', '-o', out] + rest
+
+
+def profiler_command(benchmark_cmd: str, out: str, template: Optional[str] = None) -> List[str]:
+    """The profiler invocation: cProfile, or template with {cmd} and {out} filled in."""
+    args = shlex.split(benchmark_cmd)
+    if template is None:
+        return cprofile_command(args, out)
+    if '{cmd}' not in template or '{out}' not in template:
+        raise ValueError("Profiler command must contain {cmd} and {out}")
+
+    command = []
+    for token in shlex.split(template):
+        if token == '{cmd}':
+            command.extend(args)
+        else:
+            command.append(token.replace('{out}', out).replace('{cmd}', benchmark_cmd))
+    return command
+
+
+def _label(filename: str, function: str, root: Optional[str]) -> str:
+    """Identify a function by file and name; line numbers move between commits."""
+    if root and filename.startswith(root.rstrip(os.sep) + os.sep):
+        filename = os.path.relpath(filename, root)
+    return f"{filename}:{function}"
+
+
+def load_pstats(path: str, root: Optional[str] = None) -> Profile:
+    """Self and cumulative seconds per function from a cProfile stats file."""
+    functions: Profile = {}
+    for (filename, _, function), (_, _, tt, ct, _) in pstats.Stats(path).stats.items():
+        label = _label(filename, function, root)
+        self_time, cumulative = functions.get(label, (0.0, 0.0))
+        functions[label] = (self_time + tt, cumulative + ct)
+    return functions
+
+
+def parse_folded(text: str) -> Profile:
+    """Self and cumulative sample counts from collapsed stacks ('a;b;c 42' per line)."""
+    functions: Dict[str, List[float]] = {}
+    for line in text.splitlines():
+        stack, _, count = line.strip().rpartition(' ')
+        try:
+            samples = float(count)
+        except ValueError:
+            continue
+        frames = [frame for frame in stack.split(';') if frame]
+        if not frames:
+            continue
+        for frame in set(frames):
+            functions.setdefault(frame, [0.0, 0.0])[1] += samples
+        functions[frames[-1]][0] += samples
+    return {label: (times[0], times[1]) for label, times in functions.items()}
+
+
+def load_profile(path: str, root: Optional[str] = None) -> Tuple[Profile, str]:
+    """Read a pstats or collapsed-stack profile and return it with its unit."""
+    try:
+        return load_pstats(path, root), 's'
+    except (TypeError, ValueError, EOFError):
+        pass
+    with open(path, errors='replace') as f:
+        functions = parse_folded(f.read())
+    if not functions:
+        raise ValueError(f"Profile {path} is neither cProfile stats nor collapsed stacks")
+    return functions, 'samples'
+
+
+def run_profiler(benchmark_cmd: str, cwd: str, timeout: int,
+                 template: Optional[str] = None) -> Tuple[Profile, str]:
+    """Run the benchmark once under the profiler in cwd and load what it recorded."""
+    workdir = tempfile.mkdtemp(prefix='perf-bisect-profile-')
+    try:
+        out = os.path.join(workdir, 'profile.out')
+        args = profiler_command(benchmark_cmd, out, template)
+        try:
+            result = subprocess.run(args, capture_output=True, text=True, timeout=timeout,
+                                    cwd=cwd)
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(f"Profiling timed out after {timeout}s")
+        except FileNotFoundError:
+            raise RuntimeError(f"Profiler command not found: {args[0]}")
+        if result.returncode != 0:
+            raise RuntimeError(f"Profiling failed: {result.stderr}")
+        if not os.path.exists(out):
+            raise RuntimeError(f"Profiler wrote no profile; does it write to {{out}}? "
+                               f"{' '.join(args)}")
+        return load_profile(out, cwd)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def diff_profiles(before: Profile, after: Profile, top: int = 10) -> List[Dict]:
+    """Functions whose self time grew the most from before to after."""
+    rows = []
+    for label in set(before) | set(after):
+        self_before, cumulative_before = before.get(label, (0.0, 0.0))
+        self_after, cumulative_after = after.get(label, (0.0, 0.0))
+        rows.append({
+            'function': label,
+            'self_before': self_before,
+            'self_after': self_after,
+            'self_delta': self_after - self_before,
+            'cumulative_before': cumulative_before,
+            'cumulative_after': cumulative_after,
+            'cumulative_delta': cumulative_after - cumulative_before,
+        })
+    rows.sort(key=lambda row: (-row['self_delta'], -row['cumulative_delta'], row['function']))
+    return rows[:top]
@@ -0,0 +1,308 @@
+"""Distributed probes: a coordinator socket that benchmark workers connect to.
+
+Workers run ``perf-bisect worker ADDRESS`` next to their own clone, connect
+over TCP (host:port) or a Unix socket (unix:/path) and answer probe requests
+with measurement dicts. Messages are JSON lines in both directions. A reply
+carries 'error' when the commit failed to set up, build or benchmark,
+'timeout' when its benchmark ran out of time, and 'fault' when the worker
+itself could not take the probe.
+"""
+import json
+import os
+import platform
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from git import GitCommandError
+
+from .metrics import BenchmarkTimeout
+from .parsing import OutputParser, parse_extractor
+
+# Seconds a probe may take beyond its benchmark runs, for checkout, setup and build.
+PROBE_GRACE = 600
+
+
+def parse_address(text: str) -> Tuple[int, object]:
+    """Socket family and address for 'host:port' or 'unix:/path'."""
+    if text.startswith('unix:'):
+        if not text[5:]:
+            raise ValueError("Unix socket address needs a path: unix:/path")
+        return socket.AF_UNIX, text[5:]
+    host, sep, port = text.rpartition(':')
+    if not sep or not port.isdigit():
+        raise ValueError(f"Address must be host:port or unix:/path, got {text!r}")
+    return socket.AF_INET, (host or '127.0.0.1', int(port))
+
+
+class WorkerUnavailable(Exception):
+    """No worker could take a probe; says nothing about the commit being probed."""
+
+
+class WorkerFault(Exception):
+    """This worker cannot measure a probe, whatever the commit."""
+
+
+class Connection:
+    """One end of a worker socket, framed as JSON lines."""
+
+    def __init__(self, sock: socket.socket, name: str = ''):
+        self.sock = sock
+        self.name = name
+        self._reader = sock.makefile('r', encoding='utf-8')
+
+    def send(self, message: Dict) -> None:
+        self.sock.sendall((json.dumps(message) + '\n').encode())
+
+    def receive(self, timeout: Optional[float] = None) -> Dict:
+        self.sock.settimeout(timeout)
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("connection closed")
+        return json.loads(line)
+
+    def close(self) -> None:
+        for closable in (self._reader, self.sock):
+            try:
+                closable.close()
+            except OSError:
+                pass
+
+
+class WorkerPool:
+    """Coordinator side: accepts workers and hands each probe to an idle one.
+
+    A worker whose connection drops or times out mid-probe is discarded and the
+    probe moves to another worker, up to retries times. A benchmark failure
+    reported by a live worker is not retried; it surfaces as a RuntimeError.
+    A worker reporting a fault of its own (a commit missing from its clone, a
+    failed fetch) is passed over for that probe the same way. Running out of
+    workers raises WorkerUnavailable, so skip_broken never records it as a
+    broken commit.
+    """
+
+    def __init__(self, address: str, retries: int = 2, wait: float = 60,
+                 grace: float = PROBE_GRACE):
+        self.address = address
+        self.retries = retries
+        self.wait = wait
+        self.grace = grace
+        self.lost: List[str] = []
+        self._idle: List[Connection] = []
+        self._busy = 0
+        self._cond = threading.Condition()
+        self._listener: Optional[socket.socket] = None
+        self._closed = False
+
+    def start(self) -> 'WorkerPool':
+        family, address = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(address):
+            os.unlink(address)
+        self._listener = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self._listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._listener.bind(address)
+        self._listener.listen()
+        threading.Thread(target=self._accept, daemon=True).start()
+        return self
+
+    @property
+    def bound_address(self) -> str:
+        """The listening address, with the real port when port 0 was asked for."""
+        address = self._listener.getsockname()
+        if self._listener.family == socket.AF_UNIX:
+            return f'unix:{address}'
+        return f'{address[0]}:{address[1]}'
+
+    @property
+    def size(self) -> int:
+        """Workers currently connected, idle or busy."""
+        with self._cond:
+            return len(self._idle) + self._busy
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                sock, _ = self._listener.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._greet, args=(sock,), daemon=True).start()
+
+    def _greet(self, sock: socket.socket) -> None:
+        connection = Connection(sock)
+        try:
+            connection.name = str(connection.receive(timeout=10)['worker'])
+        except (OSError, ValueError, KeyError):
+            connection.close()
+            return
+        with self._cond:
+            if self._closed:
+                connection.close()
+                return
+            self._idle.append(connection)
+            self._cond.notify_all()
+
+    def wait_for_workers(self, count: int, timeout: Optional[float] = None) -> int:
+        """Block until count workers are connected; returns how many are."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: len(self._idle) + self._busy >= count, timeout):
+                raise WorkerUnavailable(f"Only {len(self._idle) + self._busy} of {count} "
+                                   f"workers connected to {self.address} within {timeout}s")
+            return len(self._idle) + self._busy
+
+    def probe(self, request: Dict, timeout: float) -> Dict:
+        """Run one probe on some worker and return its measurement."""
+        failures = []
+        faulty: List[Connection] = []
+        while True:
+            connection = self._acquire(faulty)
+            try:
+                connection.send(dict(request, op='probe'))
+                reply = connection.receive(timeout + self.grace)
+            except (OSError, ValueError) as e:
+                self._release(connection, alive=False)
+                failures.append(f"{connection.name}: {e or type(e).__name__}")
+            else:
+                self._release(connection, alive=True)
+                if 'fault' not in reply:
+                    if 'error' in reply:
+                        raise RuntimeError(reply['error'])
+                    if 'timeout' in reply:
+                        raise BenchmarkTimeout(reply['timeout'])
+                    return dict(reply['measurement'], worker=connection.name)
+                faulty.append(connection)
+                failures.append(f"{connection.name}: {reply['fault']}")
+            if len(failures) > self.retries:
+                raise WorkerUnavailable(f"Probe of {request['commit'][:7]} failed on "
+                                        f"{len(failures)} workers: {'; '.join(failures)}")
+
+    def _acquire(self, exclude: Sequence[Connection] = ()) -> Connection:
+        """Wait for an idle worker other than the excluded ones and mark it busy."""
+        with self._cond:
+            def ready():
+                return self._closed or any(c not in exclude for c in self._idle)
+
+            if not self._cond.wait_for(ready, self.wait) or self._closed:
+                raise WorkerUnavailable(f"No benchmark worker available on {self.address}")
+            connection = next(c for c in self._idle if c not in exclude)
+            self._idle.remove(connection)
+            self._busy += 1
+            return connection
+
+    def _release(self, connection: Connection, alive: bool) -> None:
+        with self._cond:
+            self._busy -= 1
+            if alive and not self._closed:
+                self._idle.append(connection)
+            else:
+                if not alive:
+                    self.lost.append(connection.name)
+                connection.close()
+            self._cond.notify_all()
+
+    def close(self) -> None:
+        """Tell idle workers to exit and stop listening."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for connection in idle:
+            try:
+                connection.send({'op': 'exit'})
+            except OSError:
+                pass
+            connection.close()
+        if self._listener is not None:
+            family, address = parse_address(self.address)
+            self._listener.close()
+            if family == socket.AF_UNIX and os.path.exists(address):
+                os.unlink(address)
+
+    def __enter__(self) -> 'WorkerPool':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def serve(address: str, bisector, name: Optional[str] = None, connect_timeout: float = 60,
+          fetch: Optional[str] = None) -> int:
+    """Answer probes from a coordinator until it says exit or goes away.
+
+    bisector owns this worker's clone, cache, build and environments. With
+    fetch, commits missing from the clone are fetched from that remote first.
+    Returns the number of probes measured.
+    """
+    family, target = parse_address(address)
+    deadline = time.monotonic() + connect_timeout
+    while True:
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.connect(target)
+            break
+        except OSError:
+            sock.close()
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Could not connect to coordinator at {address}")
+            time.sleep(0.2)
+
+    connection = Connection(sock, name or f'{platform.node()}:{os.getpid()}')
+    served = 0
+    try:
+        connection.send({'worker': connection.name})
+        while True:
+            try:
+                request = connection.receive()
+            except (OSError, ValueError):
+                break
+            if request.get('op') != 'probe':
+                break
+            try:
+                measurement = run_probe(bisector, request, fetch)
+            except BenchmarkTimeout as e:
+                connection.send({'id': request.get('id'), 'timeout': e.timeout})
+            except (RuntimeError, ValueError) as e:
+                # Setup, build and benchmark failures of the commit itself.
+                connection.send({'id': request.get('id'), 'error': str(e)})
+            except Exception as e:
+                connection.send({'id': request.get('id'),
+                                 'fault': str(e).strip() or type(e).__name__})
+            else:
+                connection.send({'id': request.get('id'), 'measurement': measurement})
+                served += 1
+    finally:
+        connection.close()
+    return served
+
+
+def run_probe(bisector, request: Dict, fetch: Optional[str] = None) -> Dict:
+    """Measure the commit of one probe request in the worker's own clone.
+
+    Raises WorkerFault when the commit cannot be had here at all.
+    """
+    repo = bisector.repo
+    sha = request['commit']
+    try:
+        repo.git.cat_file('-e', f'{sha}^{{commit}}')
+    except GitCommandError:
+        if not fetch:
+            raise WorkerFault(f"{sha[:7]} is not in this worker's clone; "
+                              f"start it with --fetch REMOTE")
+        try:
+            repo.git.fetch(fetch, sha)
+        except GitCommandError as e:
+            raise WorkerFault(f"Could not fetch {sha[:7]} from {fetch}: {e.stderr.strip()}")
+    if request.get('extractors'):
+        bisector.parser = OutputParser([parse_extractor(spec)
+                                        for spec in request['extractors']])
+
+    return bisector.measure(request['benchmark_cmd'], [repo.commit(sha)],
+                            samples=request['min_samples'],
+                            max_samples=request['max_samples'],
+                            confidence=request['confidence'],
+                            threshold=request['threshold'],
+                            timeout=request['timeout'],
+                            metric=request['metric'],
+                            warmup=request.get('warmup', 0),
+                            cpus=set(request['pin_cpus']) if request.get('pin_cpus') else None)[0]
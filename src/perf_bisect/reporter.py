@@ -2,15 +2,19 @@
 import json
 import csv
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 from tabulate import tabulate
 from .graph import GraphGenerator
+from .metrics import format_value
+from .trace import NULL_TRACER, Tracer, traced
 
 
 class Reporter:
-    def __init__(self):
+    def __init__(self, tracer: Optional[Tracer] = None):
         self.allowed_base = Path.cwd()
+        self.tracer = tracer or NULL_TRACER
     
+    @traced('print summary', 'report')
     def print_summary(self, result: Dict) -> None:
         """Print bisect summary to terminal."""
         if result.get('dry_run'):
@@ -22,9 +26,45 @@ class Reporter:
         print("\n=== Performance Bisect Results ===")
         print(f"Good commit: {result['good_commit'][:7]}")
         print(f"Bad commit:  {result['bad_commit'][:7]}")
-        print(f"Threshold:   {result['threshold']}s")
+        metric = result.get('metric', 'duration')
+        if metric != 'duration':
+            print(f"Metric:      {metric}")
+        print(f"Threshold:   {format_value(result['threshold'], metric)}")
         
-        if result['regression_commit']:
+        baseline = result.get('baseline')
+        if baseline:
+            print(f"Baseline:    good {format_value(baseline['good'], metric)}, "
+                  f"bad {format_value(baseline['bad'], metric)} "
+                  f"(threshold = good + {baseline['regression']:.0%})")
+        
+        reference = result.get('reference')
+        if reference:
+            print(f"Reference:   {reference['commit'][:7]} at "
+                  f"{format_value(reference['level'], metric)}, runs interleaved; "
+                  f"decisions on the drift-corrected ratio")
+        
+        search = result.get('search')
+        if search and search.get('strategy') == 'bayes':
+            print(f"Search:      bayes, {search['runs']} runs, "
+                  f"culprit posterior {search['posterior']:.1%}")
+        
+        for merge in result.get('descended') or []:
+            print(f"Descended:   into merge {merge[:7]}")
+        
+        paths = result.get('paths')
+        if paths:
+            reused = sum(1 for m in result['measurements'] if m.get('reused_from'))
+            print(f"Paths:       {' '.join(paths)}"
+                  + (f"; {reused} probes reused unchanged results" if reused else ''))
+        
+        culprit_range = result.get('culprit_range')
+        if culprit_range:
+            print(f"\n🟠 Regression is in one of {len(culprit_range)} commits: "
+                  f"{culprit_range[0][:7]}..{culprit_range[-1][:7]}")
+            print("Skipped commits in between could not be tested:")
+            for sha in culprit_range:
+                print(f"  {sha[:7]}")
+        elif result['regression_commit']:
             print(f"\n🔴 Regression found at: {result['regression_commit'][:7]}")
             print(f"Message: {result['regression_message']}")
         else:
@@ -34,16 +74,154 @@ class Reporter:
         
         table_data = []
         for m in result['measurements']:
-            status = '✅' if m['passed'] else '❌'
+            if m.get('skipped'):
+                table_data.append([m['commit'][:7], '-', '-', 0, '⏭ skipped',
+                                   m['message'][:50]])
+                continue
+            if m.get('censored'):
+                # Killed early: only a lower bound on the value is known.
+                median = f"≥{format_value(m['duration'], metric)}"
+                spread = '-'
+                status = '❌ killed'
+            else:
+                median = format_value(m['duration'], metric)
+                spread = f"±{format_value(m.get('stdev', 0.0), metric)}"
+                status = '✅' if m['passed'] else '❌'
             table_data.append([
                 m['commit'][:7],
-                f"{m['duration']:.3f}s",
+                median,
+                spread,
+                len(m.get('samples', [m['duration']])),
                 status,
                 m['message'][:50]
             ])
         
-        print(tabulate(table_data, headers=['Commit', 'Duration', 'Status', 'Message']))
+        print(tabulate(table_data, headers=['Commit', 'Median', 'Spread', 'Samples',
+                                            'Status', 'Message']))
+        
+        if result.get('profile'):
+            self.print_profile(result['profile'])
+    
+    def print_profile(self, profile: Dict) -> None:
+        """Print the functions whose self time grew most at the culprit."""
+        print(f"\nProfile {profile['parent'][:7]} -> {profile['commit'][:7]} "
+              f"({profile['tool']})")
+        if profile.get('error'):
+            error = profile['error'].splitlines()
+            print(f"Profiling failed: {error[0] if error else ''}")
+            return
+        
+        unit = profile['unit']
+        
+        def value(number: float) -> str:
+            return f"{number:.4f}s" if unit == 's' else f"{number:g}"
+        
+        print(f"Total self time: {value(profile['total_before'])} -> "
+              f"{value(profile['total_after'])}\n")
+        table_data = []
+        for row in profile['top']:
+            table_data.append([
+                row['function'][-60:],
+                value(row['self_before']),
+                value(row['self_after']),
+                ('+' if row['self_delta'] >= 0 else '') + value(row['self_delta']),
+                ('+' if row['cumulative_delta'] >= 0 else '') + value(row['cumulative_delta'])
+            ])
+        print(tabulate(table_data, headers=['Function', 'Self before', 'Self after',
+                                            'Self delta', 'Cumulative delta']))
+    
+    @traced('print sweep', 'report')
+    def print_sweep(self, result: Dict) -> None:
+        """Print the steps found by a sweep."""
+        metric = result.get('metric', 'duration')
+        grid = [m for m in result['measurements'] if m.get('phase') == 'grid']
+        
+        print("\n=== Performance Sweep Results ===")
+        print(f"Range:   {result['good_commit'][:7]}..{result['bad_commit'][:7]}")
+        if metric != 'duration':
+            print(f"Metric:  {metric}")
+        print(f"Sampled: {len(grid)} commits (every {result['stride']}), "
+              f"{len(result['measurements']) - len(grid)} more while refining")
+        
+        if not result['changes']:
+            print("\n✅ No performance steps found")
+            return
+        
+        print(f"\nFound {len(result['changes'])} step(s):\n")
+        table_data = []
+        for change in result['changes']:
+            table_data.append([
+                change['commit'][:7],
+                '🔴 regression' if change['kind'] == 'regression' else '🟢 improvement',
+                format_value(change['before'], metric),
+                format_value(change['after'], metric),
+                f"{change['effect']:+.1%}",
+                change['message'][:50]
+            ])
+        
+        print(tabulate(table_data, headers=['Commit', 'Kind', 'Before', 'After', 'Effect',
+                                            'Message']))
+    
+    @traced('print suite', 'report')
+    def print_suite(self, result: Dict) -> None:
+        """Print the culprit of each benchmark in a suite."""
+        print("\n=== Performance Suite Results ===")
+        print(f"Range:   {result['good_commit'][:7]}..{result['bad_commit'][:7]}")
+        print(f"Probed:  {result['probed_commits']} commits for "
+              f"{len(result['measurements'])} benchmark runs")
+        
+        table_data = []
+        for benchmark in result['benchmarks']:
+            metric = benchmark['metric']
+            culprit_range = benchmark.get('culprit_range')
+            if culprit_range:
+                culprit = f"🟠 {culprit_range[0][:7]}..{culprit_range[-1][:7]}"
+                message = f"one of {len(culprit_range)} commits (skips)"
+            elif benchmark['regression_commit']:
+                culprit = f"🔴 {benchmark['regression_commit'][:7]}"
+                message = benchmark['regression_message']
+            else:
+                culprit = '✅ none'
+                message = ''
+            table_data.append([
+                benchmark['name'],
+                format_value(benchmark['threshold'], metric),
+                benchmark['probes'],
+                culprit,
+                message[:50]
+            ])
+        
+        print()
+        print(tabulate(table_data, headers=['Benchmark', 'Threshold', 'Probes', 'Culprit',
+                                            'Message']))
+    
+    @traced('print watch', 'report')
+    def print_watch(self, records: List[Dict], metric: str = 'duration') -> None:
+        """Print the commits measured by one poll of a watched branch."""
+        for record in records:
+            line = f"{record['commit'][:7]}  {format_value(record['value'], metric):>10}"
+            if record['baseline'] is not None:
+                change = record['value'] / record['baseline'] - 1 if record['baseline'] else 0.0
+                line += f"  vs {format_value(record['baseline'], metric)} ({change:+.1%})"
+            if record['landed'] > 1:
+                line += f"  [{record['landed']} commits]"
+            print(line)
+            
+            if record.get('skipped'):
+                print(f"  ⏭ Skipped: {(record['skip_reason'].splitlines() or [''])[0]}")
+            elif record['kind'] == 'improvement':
+                print("  🟢 Improvement; baseline reset to the new level")
+            elif record['kind'] == 'regression' and record['culprit_range']:
+                culprit_range = record['culprit_range']
+                print(f"  🟠 Regression is in one of {len(culprit_range)} commits: "
+                      f"{culprit_range[0][:7]}..{culprit_range[-1][:7]}")
+            elif record['kind'] == 'regression' and record['culprit']:
+                print(f"  🔴 Regression introduced by {record['culprit'][:7]}: "
+                      f"{record['culprit_message']}")
+            elif record['kind'] == 'regression':
+                print(f"  ⚪ Not confirmed by bisect ({record['probes']} probes)")
     
+    @traced('save report', 'report')
     def save_report(self, result: Dict, output_path: str) -> None:
         """Save report to file with path validation."""
         output_path = self._validate_path(output_path)
@@ -76,12 +254,14 @@ class Reporter:
         """Save results as CSV."""
         with open(path, 'w', newline='') as f:
             writer = csv.writer(f)
-            writer.writerow(['Commit', 'Duration', 'Passed', 'Message'])
+            writer.writerow(['Commit', 'Median', 'Stdev', 'Samples', 'Passed', 'Message'])
             
             for m in result['measurements']:
                 writer.writerow([
                     m['commit'],
                     m['duration'],
+                    m.get('stdev', 0.0),
+                    len(m.get('samples', [m['duration']])),
                     m['passed'],
                     m['message']
                 ])
@@ -94,13 +274,31 @@ class Reporter:
         if not self._validate_result_schema(data):
             raise ValueError("Invalid results file schema")
         
+        sweep = data.get('mode') == 'sweep'
+        suite = data.get('mode') == 'suite'
+        
         if format in ['table', 'both']:
-            self.print_summary(data)
+            if sweep:
+                self.print_sweep(data)
+            elif suite:
+                self.print_suite(data)
+            else:
+                self.print_summary(data)
         
         if format in ['graph', 'both'] and not data.get('dry_run'):
             print("\n=== Performance Graph ===")
+            measurements = data['measurements']
+            if sweep:
+                measurements = [m for m in measurements if m.get('phase') == 'grid']
             generator = GraphGenerator()
-            graph = generator.generate(data['measurements'])
+            if suite:
+                for benchmark in data['benchmarks']:
+                    print(f"\n{benchmark['name']}:")
+                    print(generator.generate([m for m in measurements
+                                              if m.get('benchmark') == benchmark['name']],
+                                             benchmark.get('metric', 'duration')))
+                return
+            graph = generator.generate(measurements, data.get('metric', 'duration'))
             print(graph)
     
     def _validate_result_schema(self, data: Dict) -> bool:
@@ -0,0 +1,132 @@
+"""Statistics helpers for deciding good/bad from repeated benchmark samples."""
+import math
+import statistics
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+def summarize(samples: List[float]) -> Dict:
+    """Return median, spread (sample stdev) and count for a list of samples."""
+    return {
+        'median': statistics.median(samples),
+        'stdev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        'count': len(samples)
+    }
+
+
+def _betacf(a: float, b: float, x: float) -> float:
+    """Continued fraction for the regularized incomplete beta function."""
+    tiny = 1e-300
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    h = d
+
+    for m in range(1, 200):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        h *= d * c
+
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > tiny else tiny)
+        c = 1.0 + aa / c
+        c = c if abs(c) > tiny else tiny
+        delta = d * c
+        h *= delta
+
+        if abs(delta - 1.0) < 3e-14:
+            break
+
+    return h
+
+
+def _betainc(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta function I_x(a, b)."""
+    if x <= 0.0:
+        return 0.0
+    if x >= 1.0:
+        return 1.0
+
+    log_front = (math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+                 + a * math.log(x) + b * math.log(1.0 - x))
+
+    if x < (a + 1.0) / (a + b + 2.0):
+        return math.exp(log_front) * _betacf(a, b, x) / a
+    return 1.0 - math.exp(log_front) * _betacf(b, a, 1.0 - x) / b
+
+
+def t_cdf(t: float, df: int) -> float:
+    """Cumulative distribution function of Student's t."""
+    tail = 0.5 * _betainc(df / 2.0, 0.5, df / (df + t * t))
+    return 1.0 - tail if t >= 0 else tail
+
+
+def t_ppf(q: float, df: int) -> float:
+    """Inverse of t_cdf, found by bisection."""
+    lo, hi = -1e6, 1e6
+    for _ in range(200):
+        mid = (lo + hi) / 2.0
+        if t_cdf(mid, df) < q:
+            lo = mid
+        else:
+            hi = mid
+    return (lo + hi) / 2.0
+
+
+def confidence_interval(samples: List[float], confidence: float) -> Tuple[float, float]:
+    """Two-sided t confidence interval for the mean of samples."""
+    n = len(samples)
+    mean = statistics.fmean(samples)
+    if n < 2:
+        return mean, mean
+
+    margin = t_ppf(0.5 + confidence / 2.0, n - 1) * statistics.stdev(samples) / math.sqrt(n)
+    return mean - margin, mean + margin
+
+
+@dataclass
+class SamplingPolicy:
+    """How many times to run each probe and how sure to be before deciding."""
+    min_samples: int = 1
+    max_samples: int = 1
+    confidence: float = 0.95
+
+    def __post_init__(self):
+        if self.min_samples < 1:
+            raise ValueError("min_samples must be at least 1")
+        if self.max_samples < self.min_samples:
+            raise ValueError("max_samples must be >= min_samples")
+        if not 0.0 < self.confidence < 1.0:
+            raise ValueError("confidence must be between 0 and 1")
+
+    def verdict(self, samples: List[float], threshold: float) -> Optional[bool]:
+        """Return True/False once the interval clears the threshold, else None."""
+        if len(samples) < 2:
+            return None
+
+        low, high = confidence_interval(samples, self.confidence)
+        if high <= threshold:
+            return True
+        if low > threshold:
+            return False
+        return None
+
+    def should_stop(self, samples: List[float], threshold: float) -> bool:
+        """Return True once enough samples have been collected."""
+        if len(samples) >= self.max_samples:
+            return True
+        if len(samples) < self.min_samples:
+            return False
+        return self.verdict(samples, threshold) is not None
+
+    def decide(self, samples: List[float], threshold: float) -> bool:
+        """Final pass/fail, falling back to the median when still undecided."""
+        verdict = self.verdict(samples, threshold)
+        if verdict is None:
+            return statistics.median(samples) <= threshold
+        return verdict
@@ -0,0 +1,175 @@
+"""Columnar storage of measurements with dict-compatible row views."""
+import binascii
+import math
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+from .commits import SHA_BYTES
+
+# Keys kept in typed columns; every other key of a row lives in its extras tuple.
+COLUMNS = frozenset({'commit', 'message', 'duration', 'stdev', 'samples', 'metrics'})
+_NO_SHA = bytes(SHA_BYTES)
+
+
+def _float(value: Optional[float]) -> float:
+    return math.nan if value is None else float(value)
+
+
+def _value(number: float) -> Optional[float]:
+    return None if math.isnan(number) else number
+
+
+class MeasurementView(Mapping):
+    """Read-only dict view of one stored row; dict(view) gives a plain copy."""
+    __slots__ = ('_store', 'index')
+
+    def __init__(self, store: 'MeasurementStore', index: int):
+        self._store = store
+        self.index = index
+
+    def __getitem__(self, key: str):
+        return self._store._get(self.index, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store._schema(self.index)[0])
+
+    def __len__(self) -> int:
+        return len(self._store._schema(self.index)[0])
+
+    def __contains__(self, key) -> bool:
+        return key in self._store._schema(self.index)[1]
+
+    def __repr__(self) -> str:
+        return f'<MeasurementView {dict(self)!r}>'
+
+
+class MeasurementStore(Sequence):
+    """Measurements packed per column instead of one dict per commit.
+
+    Commits are 20-byte binary SHAs, messages are indices into a table of
+    distinct strings, and durations, deviations, samples and named metrics are
+    float arrays (NaN standing for None). Rows sharing a key layout share one
+    schema. Indexing returns MeasurementView objects, so code written for the
+    old list of dicts keeps working.
+    """
+
+    def __init__(self, measurements: Iterable[Dict] = ()):
+        self._shas = bytearray()
+        self._odd_commits: Dict[int, str] = {}
+        self._message_ids = array('I')
+        self._messages: List[Optional[str]] = []
+        self._message_index: Dict[Optional[str], int] = {}
+        self._durations = array('d')
+        self._stdevs = array('d')
+        self._sample_values = array('d')
+        self._sample_starts = array('Q', [0])
+        self._metrics: Dict[str, array] = {}
+        self._schema_ids = array('I')
+        # Per layout: keys in order, the same as a set, and positions in the extras tuple.
+        self._schemas: List[Tuple[Tuple[str, ...], FrozenSet[str], Dict[str, int]]] = []
+        self._schema_index: Dict[Tuple[str, ...], int] = {}
+        self._extras: List[tuple] = []
+        self.extend(measurements)
+
+    def append(self, measurement: Dict) -> None:
+        row = len(self)
+        keys = tuple(measurement)
+        schema = self._schema_index.get(keys)
+        if schema is None:
+            extra_keys = [key for key in keys if key not in COLUMNS]
+            schema = len(self._schemas)
+            self._schemas.append((keys, frozenset(keys),
+                                  {key: i for i, key in enumerate(extra_keys)}))
+            self._schema_index[keys] = schema
+        self._schema_ids.append(schema)
+
+        commit = measurement.get('commit')
+        try:
+            sha = binascii.unhexlify(commit)
+        except (TypeError, binascii.Error):
+            sha = b''
+        if len(sha) != SHA_BYTES:
+            sha = _NO_SHA
+            self._odd_commits[row] = commit
+        self._shas += sha
+
+        message = measurement.get('message')
+        message_id = self._message_index.get(message)
+        if message_id is None:
+            message_id = self._message_index[message] = len(self._messages)
+            self._messages.append(message)
+        self._message_ids.append(message_id)
+
+        self._durations.append(_float(measurement.get('duration')))
+        self._stdevs.append(_float(measurement.get('stdev')))
+        self._sample_values.extend(float(v) for v in measurement.get('samples') or ())
+        self._sample_starts.append(len(self._sample_values))
+
+        metrics = measurement.get('metrics') or {}
+        for name in metrics:
+            if name not in self._metrics:
+                self._metrics[name] = array('d', [math.nan]) * row
+        for name, column in self._metrics.items():
+            column.append(_float(metrics.get(name)))
+
+        self._extras.append(tuple(measurement[key] for key in keys if key not in COLUMNS))
+
+    def extend(self, measurements: Iterable[Dict]) -> None:
+        for measurement in measurements:
+            self.append(measurement)
+
+    def __len__(self) -> int:
+        return len(self._schema_ids)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [MeasurementView(self, i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("measurement index out of range")
+        return MeasurementView(self, index)
+
+    def __iter__(self) -> Iterator[MeasurementView]:
+        return (MeasurementView(self, i) for i in range(len(self)))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (MeasurementStore, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def to_list(self) -> List[Dict]:
+        """Plain dicts, as results hand them out."""
+        return [dict(view) for view in self]
+
+    def commit(self, index: int) -> str:
+        if index in self._odd_commits:
+            return self._odd_commits[index]
+        start = index * SHA_BYTES
+        return self._shas[start:start + SHA_BYTES].hex()
+
+    def samples(self, index: int) -> array:
+        return self._sample_values[self._sample_starts[index]:self._sample_starts[index + 1]]
+
+    def _schema(self, index: int) -> Tuple[Tuple[str, ...], FrozenSet[str], Dict[str, int]]:
+        return self._schemas[self._schema_ids[index]]
+
+    def _get(self, index: int, key: str):
+        _, keys, extras = self._schema(index)
+        if key in extras:
+            return self._extras[index][extras[key]]
+        if key not in keys:
+            raise KeyError(key)
+        if key == 'commit':
+            return self.commit(index)
+        if key == 'message':
+            return self._messages[self._message_ids[index]]
+        if key == 'duration':
+            return _value(self._durations[index])
+        if key == 'stdev':
+            return _value(self._stdevs[index])
+        if key == 'samples':
+            return self.samples(index).tolist()
+        return {name: column[index] for name, column in self._metrics.items()
+                if not math.isnan(column[index])}
@@ -0,0 +1,80 @@
+"""Manifests of named benchmarks bisected together over one commit range."""
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+FIELDS = {'name', 'command', 'threshold', 'regression', 'metric', 'timeout', 'extract'}
+
+
+@dataclass
+class SuiteBenchmark:
+    """One benchmark of a suite with its own command and pass/fail threshold."""
+    name: str
+    command: str
+    threshold: Optional[float] = None
+    regression: Optional[float] = None
+    metric: str = 'duration'
+    timeout: Optional[int] = None
+    extract: List[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.name:
+            raise ValueError("Suite benchmark needs a name")
+        if not self.command or not self.command.strip():
+            raise ValueError(f"Benchmark {self.name!r} needs a command")
+        if (self.threshold is None) == (self.regression is None):
+            raise ValueError(f"Benchmark {self.name!r}: specify exactly one of "
+                             f"threshold or regression")
+
+
+def _fraction(value) -> float:
+    """Regression given as 0.15 or '15%'."""
+    if isinstance(value, str) and value.strip().endswith('%'):
+        return float(value.strip()[:-1]) / 100
+    return float(value)
+
+
+def parse_manifest(data: Dict) -> List[SuiteBenchmark]:
+    """Build the suite from a manifest document: {"benchmarks": [{...}, ...]}."""
+    entries = data.get('benchmarks') if isinstance(data, dict) else None
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("Manifest must contain a non-empty 'benchmarks' list")
+
+    benchmarks = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            raise ValueError(f"Invalid benchmark entry: {entry!r}")
+        unknown = set(entry) - FIELDS
+        if unknown:
+            raise ValueError(f"Unknown benchmark field(s): {', '.join(sorted(unknown))}")
+        try:
+            threshold = float(entry['threshold']) if 'threshold' in entry else None
+            regression = _fraction(entry['regression']) if 'regression' in entry else None
+            timeout = int(entry['timeout']) if 'timeout' in entry else None
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invalid number in benchmark {entry.get('name')!r}: {e}")
+        benchmarks.append(SuiteBenchmark(
+            name=str(entry.get('name', '')),
+            command=str(entry.get('command', '')),
+            threshold=threshold,
+            regression=regression,
+            metric=entry.get('metric', 'duration'),
+            timeout=timeout,
+            extract=list(entry.get('extract', []))
+        ))
+
+    names = [b.name for b in benchmarks]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate benchmark name(s): {', '.join(duplicates)}")
+    return benchmarks
+
+
+def load_manifest(path: str) -> List[SuiteBenchmark]:
+    """Read a JSON suite manifest."""
+    with open(path) as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Manifest {path} is not valid JSON: {e}")
+    return parse_manifest(data)
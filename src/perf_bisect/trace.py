@@ -0,0 +1,104 @@
+"""Phase-level spans of a session, written in Chrome trace event format."""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List
+
+# Categories that are work on behalf of the benchmark rather than the benchmark itself.
+OVERHEAD_CATEGORIES = ('git', 'checkout', 'setup', 'build', 'parse', 'cache', 'profile',
+                       'report')
+
+_NO_SPAN = nullcontext()
+
+
+class NullTracer:
+    """Tracer that records nothing; span() hands back one shared no-op context."""
+    enabled = False
+
+    def span(self, name: str, category: str, **args):
+        return _NO_SPAN
+
+
+NULL_TRACER = NullTracer()
+
+
+class Tracer:
+    """Collects complete ('X') events viewable in Perfetto or chrome://tracing."""
+    enabled = True
+
+    def __init__(self):
+        self.events: List[Dict] = []
+        self._origin = time.perf_counter_ns()
+        self._threads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, category: str, **args) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self._add(name, category, start, end, args)
+
+    def _add(self, name: str, category: str, start: int, end: int, args: Dict) -> None:
+        with self._lock:
+            tid = self._threads.setdefault(threading.get_ident(), len(self._threads) + 1)
+            event = {
+                'name': name,
+                'cat': category,
+                'ph': 'X',
+                'ts': (start - self._origin) / 1000,
+                'dur': (end - start) / 1000,
+                'pid': os.getpid(),
+                'tid': tid,
+            }
+            if args:
+                event['args'] = {key: str(value) for key, value in args.items()}
+            self.events.append(event)
+
+    def elapsed(self) -> float:
+        """Seconds since the tracer was created."""
+        return (time.perf_counter_ns() - self._origin) / 1e9
+
+    def totals(self) -> Dict[str, float]:
+        """Seconds spent per category, summed over spans of every thread."""
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for event in self.events:
+                totals[event['cat']] = totals.get(event['cat'], 0.0) + event['dur'] / 1e6
+        return totals
+
+    def summary(self) -> str:
+        """Benchmark time against the overhead spent around it."""
+        totals = self.totals()
+        wall = self.elapsed()
+        benchmark = totals.get('benchmark', 0.0)
+        share = benchmark / wall if wall else 0.0
+        lines = [f"Trace: {wall:.2f}s wall, {benchmark:.2f}s benchmarking ({share:.0%}), "
+                 f"{max(wall - benchmark, 0.0):.2f}s overhead"]
+        for category in OVERHEAD_CATEGORIES:
+            if category in totals:
+                lines.append(f"  {category:<9} {totals[category]:8.3f}s")
+        return '\n'.join(lines)
+
+    def write(self, path: str) -> None:
+        """Save the events as a Chrome trace JSON document."""
+        with self._lock:
+            document = {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+        Path(path).write_text(json.dumps(document))
+
+
+def traced(name: str, category: str) -> Callable:
+    """Wrap a method in a span of its object's tracer."""
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with self.tracer.span(name, category):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
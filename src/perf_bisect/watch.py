@@ -0,0 +1,177 @@
+"""Benchmark a branch as commits land and bisect only the steps that show up."""
+import statistics
+import time
+from typing import Dict, List, Optional
+
+from .checkpoint import Checkpoint
+from .commits import CommitRange
+
+
+def rolling_baseline(records: List[Dict], window: int) -> Optional[float]:
+    """Median of the last window values since the latest step, or None without any."""
+    level: List[float] = []
+    for record in records:
+        if record.get('skipped'):
+            continue
+        if record.get('step'):
+            # A confirmed step starts a new level; older values no longer apply.
+            level = []
+        level.append(record['value'])
+    return statistics.median(level[-window:]) if level else None
+
+
+def batch_points(count: int, batch: int) -> List[int]:
+    """Indices to measure among count new commits: every batch-th one and the newest."""
+    if count < 1:
+        return []
+    return sorted(set(range(batch - 1, count, batch)) | {count - 1})
+
+
+class Watcher:
+    """Extends a persistent per-branch series one poll at a time.
+
+    Each poll measures newly landed first-parent commits (every batch-th one
+    and the branch head) and compares them with a rolling baseline. A value
+    more than regression above it is bisected between the previous measured
+    commit and this one; a drop as large is recorded as an improvement. Either
+    way the baseline restarts from the new level. A commit that cannot be
+    measured is recorded as skipped, and the next one is compared and bisected
+    against the last commit that was.
+    """
+
+    def __init__(self, bisector, benchmark_cmd: str, history: str, branch: str = 'HEAD',
+                 regression: float = 0.1, window: int = 5, batch: int = 1, samples: int = 3,
+                 timeout: int = 300, metric: str = 'duration', since: Optional[str] = None,
+                 remote: Optional[str] = None):
+        if regression <= 0:
+            raise ValueError("regression must be positive")
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        if batch < 1:
+            raise ValueError("batch must be at least 1")
+
+        self.bisector = bisector
+        self.benchmark_cmd = benchmark_cmd
+        self.branch = branch
+        self.regression = regression
+        self.window = window
+        self.batch = batch
+        self.samples = samples
+        self.timeout = timeout
+        self.metric = metric
+        self.since = since
+        self.remote = remote
+        self.history = Checkpoint(history)
+        self.records = self.history.start({
+            'mode': 'watch',
+            'benchmark_cmd': benchmark_cmd,
+            'branch': branch,
+            'metric': metric
+        })
+
+    def poll(self) -> List[Dict]:
+        """Measure whatever landed since the last poll and return the new records."""
+        repo = self.bisector.repo
+        if self.remote:
+            repo.git.fetch(self.remote)
+        head = self._rev(self.branch)
+
+        added = []
+        if not self.records:
+            # The first poll only seeds the series; nothing is compared yet.
+            seed = repo.commit(self._rev(self.since) if self.since else head)
+            added += self._advance([seed], [0])
+
+        last = self.records[-1]['commit']
+        if last != head:
+            commits = CommitRange.resolve(repo, last, head, '--first-parent', subjects=True)
+            added += self._advance(commits, batch_points(len(commits), self.batch))
+        return added
+
+    def _advance(self, commits, points: List[int]) -> List[Dict]:
+        """Measure and judge each point, saving its record before the next one starts."""
+        added = []
+        start = 0
+        for index in points:
+            commit = commits[index]
+            try:
+                measurement, = self.bisector.measure(self.benchmark_cmd, [commit],
+                                                     samples=self.samples,
+                                                     timeout=self.timeout, metric=self.metric)
+            except (RuntimeError, ValueError) as e:
+                record = self._skipped(commit, str(e).strip(), index - start + 1)
+            else:
+                record = self._judge(measurement, index - start + 1)
+            self.history.append(record)
+            self.records.append(record)
+            added.append(record)
+            start = index + 1
+        return added
+
+    def _skipped(self, commit, reason: str, landed: int) -> Dict:
+        """Record a point that could not be measured, so later polls move past it."""
+        return dict(self._record(commit.hexsha, commit.summary, None, [], None, landed),
+                    skipped=True, skip_reason=reason)
+
+    def _judge(self, measurement: Dict, landed: int) -> Dict:
+        """Compare one new point with the baseline and bisect it if it stepped up."""
+        value = measurement['duration']
+        baseline = rolling_baseline(self.records, self.window)
+        previous = None
+        for earlier in reversed(self.records):
+            if not earlier.get('skipped'):
+                previous = earlier['commit']
+                break
+            # Commits behind an unmeasured point also landed since the last value.
+            landed += earlier['landed']
+        record = self._record(measurement['commit'], measurement['message'], value,
+                              measurement['samples'], baseline, landed)
+        if baseline is None or previous is None:
+            return record
+
+        if value < baseline * (1 - self.regression):
+            record.update(step=True, kind='improvement')
+        elif value > baseline * (1 + self.regression):
+            record.update(kind='regression')
+            if landed == 1:
+                record.update(step=True, culprit=measurement['commit'],
+                              culprit_message=measurement['message'])
+            else:
+                self._bisect(record, previous, (baseline + value) / 2)
+        return record
+
+    @staticmethod
+    def _record(commit: str, message: str, value: Optional[float], samples: List[float],
+                baseline: Optional[float], landed: int) -> Dict:
+        return {
+            'commit': commit,
+            'message': message,
+            'value': value,
+            'samples': samples,
+            'baseline': baseline,
+            'landed': landed,
+            'time': time.time(),
+            'step': False,
+            'kind': None,
+            'culprit': None,
+            'culprit_message': None,
+            'culprit_range': None,
+            'probes': 0
+        }
+
+    def _bisect(self, record: Dict, good: str, threshold: float) -> None:
+        """Narrow a regression to one of the commits that landed since good."""
+        result = self.bisector.bisect(self.benchmark_cmd, good, record['commit'],
+                                      threshold=threshold, timeout=self.timeout,
+                                      max_samples=self.samples, metric=self.metric,
+                                      first_parent=True, skip_broken=True)
+        record['probes'] = len(result['measurements'])
+        if result['regression_commit'] is None:
+            # Re-measured below the threshold: a blip, not a new level.
+            return
+        record.update(step=True, culprit=result['regression_commit'],
+                      culprit_message=result['regression_message'],
+                      culprit_range=result.get('culprit_range'))
+
+    def _rev(self, ref: str) -> str:
+        return self.bisector.repo.git.rev_parse('--verify', f'{ref}^{{commit}}')
@@ -0,0 +1,176 @@
+"""Long-lived interpreter that imports a Python callable once and times it on request.
+
+The parent starts ``python -m perf_bisect.worker pkg.module:func`` in a checked
+out tree. Requests and replies are JSON lines on stdin and the worker's
+original stdout; anything the benchmark itself prints goes to stderr.
+"""
+import gc
+import importlib
+import json
+import os
+import select
+import subprocess
+import sys
+import time
+import traceback
+from typing import Callable, Dict, List, Optional, Set
+
+from .metrics import BenchmarkTimeout
+
+# A sample times enough calls to last at least this long, so timer resolution
+# and loop overhead stay negligible.
+DEFAULT_MIN_TIME = 0.02
+
+# Directory holding the perf_bisect package, for workers started in other trees.
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_callable(target: str) -> Callable:
+    """Import 'pkg.module:func' (or 'pkg.module:Class.method') and return it."""
+    module_name, _, name = target.partition(':')
+    if not module_name or not name:
+        raise ValueError(f"Callable must look like pkg.module:func, got {target!r}")
+    obj = importlib.import_module(module_name)
+    for part in name.split('.'):
+        obj = getattr(obj, part)
+    if not callable(obj):
+        raise ValueError(f"{target} is not callable")
+    return obj
+
+
+def time_loops(func: Callable, loops: int) -> float:
+    """Seconds taken by loops back-to-back calls, with the collector paused like timeit."""
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - start
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def calibrate(func: Callable, min_time: float = DEFAULT_MIN_TIME) -> int:
+    """Smallest loop count in the 1, 2, 5, 10, 20, ... series lasting min_time."""
+    base = 1
+    while True:
+        for factor in (1, 2, 5):
+            loops = base * factor
+            if time_loops(func, loops) >= min_time:
+                return loops
+        base *= 10
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    target = argv[0]
+    min_time = float(argv[1]) if len(argv) > 1 else DEFAULT_MIN_TIME
+
+    # Keep the real stdout for replies and send the benchmark's prints to stderr.
+    replies = os.fdopen(os.dup(1), 'w')
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    def reply(**message) -> None:
+        replies.write(json.dumps(message) + '\n')
+        replies.flush()
+
+    try:
+        func = load_callable(target)
+        loops = calibrate(func, min_time)
+    except Exception:
+        reply(error=traceback.format_exc())
+        return 1
+    reply(ready=True, loops=loops)
+
+    for line in sys.stdin:
+        request = json.loads(line)
+        if request.get('op') == 'exit':
+            break
+        try:
+            samples = [time_loops(func, loops) / loops for _ in range(request.get('count', 1))]
+        except Exception:
+            reply(error=traceback.format_exc())
+        else:
+            reply(samples=samples)
+    return 0
+
+
+class CallableWorker:
+    """Parent side of one worker process bound to one checked-out tree.
+
+    python is the interpreter to start, such as the one of the environment
+    prepared for the tree; it defaults to the interpreter running perf-bisect.
+    """
+
+    def __init__(self, target: str, cwd: str, timeout: float,
+                 min_time: float = DEFAULT_MIN_TIME, cpus: Optional[Set[int]] = None,
+                 python: Optional[str] = None):
+        self.target = target
+        self.cwd = cwd
+
+        pin = None
+        if cpus and hasattr(os, 'sched_setaffinity'):
+            def pin():
+                os.sched_setaffinity(0, cpus)
+
+        env = dict(os.environ)
+        env['PYTHONPATH'] = os.pathsep.join(
+            [PACKAGE_ROOT] + ([env['PYTHONPATH']] if env.get('PYTHONPATH') else []))
+        # -m puts cwd first on sys.path, so the tree's modules shadow installed ones.
+        self.process = subprocess.Popen(
+            [python or sys.executable, '-m', 'perf_bisect.worker', target, str(min_time)],
+            cwd=cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, text=True, env=env, preexec_fn=pin)
+
+        hello = self._read(timeout)
+        if 'error' in hello:
+            self.close()
+            raise RuntimeError(f"Could not load {target}: {_last_line(hello['error'])}")
+        self.loops: int = hello['loops']
+
+    def sample(self, count: int = 1, timeout: Optional[float] = None) -> List[float]:
+        """Seconds per call for count samples, each timing self.loops calls."""
+        self.process.stdin.write(json.dumps({'op': 'sample', 'count': count}) + '\n')
+        self.process.stdin.flush()
+        reply = self._read(timeout)
+        if 'error' in reply:
+            raise RuntimeError(f"Benchmark {self.target} failed: {_last_line(reply['error'])}")
+        return reply['samples']
+
+    def _read(self, timeout: Optional[float]) -> Dict:
+        ready, _, _ = select.select([self.process.stdout], [], [], timeout)
+        if not ready:
+            self.close()
+            raise BenchmarkTimeout(timeout)
+        line = self.process.stdout.readline()
+        if not line:
+            code = self.process.wait()
+            raise RuntimeError(f"Benchmark worker for {self.target} exited with code {code}")
+        return json.loads(line)
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            try:
+                self.process.stdin.write(json.dumps({'op': 'exit'}) + '\n')
+                self.process.stdin.flush()
+                self.process.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                self.process.kill()
+                self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+def _last_line(text: str) -> str:
+    lines = text.strip().splitlines()
+    return lines[-1] if lines else text
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""Pool of git worktrees used to benchmark several commits at once."""
+import shutil
+import subprocess
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from git import Git, Repo
+
+from .isolation import run_isolated
+
+
+class WorktreePool:
+    def __init__(self, repo: Repo, size: int, base_dir: Optional[str] = None):
+        if size < 1:
+            raise ValueError("Worktree pool size must be at least 1")
+        self.repo = repo
+        self.size = size
+        self.base_dir = base_dir
+        self.paths: List[Path] = []
+        self._root: Optional[Path] = None
+        self._free: List[Path] = []
+        self._heads: Dict[Path, str] = {}
+        self._cond = threading.Condition()
+
+    def __enter__(self) -> "WorktreePool":
+        self.create()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def create(self) -> None:
+        """Add one detached worktree per pool slot."""
+        self._root = Path(tempfile.mkdtemp(prefix='perf-bisect-', dir=self.base_dir))
+        head = self.repo.head.commit.hexsha
+
+        for i in range(self.size):
+            path = self._root / f'wt{i}'
+            self.repo.git.worktree('add', '--detach', str(path), head)
+            self.paths.append(path)
+            self._free.append(path)
+            self._heads[path] = head
+
+    def close(self) -> None:
+        """Remove all worktrees created by this pool."""
+        for path in self.paths:
+            try:
+                self.repo.git.worktree('remove', '--force', str(path))
+            except Exception:
+                pass
+        self.paths = []
+        self._free = []
+        self._heads = {}
+
+        if self._root is not None:
+            shutil.rmtree(self._root, ignore_errors=True)
+            self._root = None
+
+        try:
+            self.repo.git.worktree('prune')
+        except Exception:
+            pass
+
+    @contextmanager
+    def lease(self, sha: Optional[str] = None, avoid: Set[str] = frozenset()) -> Iterator[Path]:
+        """Borrow a free worktree, preferring one already at sha.
+
+        Otherwise the least recently released tree whose checkout is not in
+        avoid is taken, so trees holding commits about to be probed survive.
+        """
+        with self._cond:
+            while not self._free:
+                self._cond.wait()
+
+            matching = [path for path in self._free if sha and self._heads.get(path) == sha]
+            spare = [path for path in self._free if self._heads.get(path) not in avoid]
+            path = (matching or spare or self._free)[0]
+            self._free.remove(path)
+
+        try:
+            yield path
+        finally:
+            with self._cond:
+                self._free.append(path)
+                self._cond.notify()
+
+    def holds(self, sha: str) -> bool:
+        """Return True if some worktree already has sha checked out."""
+        return sha in self._heads.values()
+
+    def checkout(self, path: Path, sha: str, nice: int = 0,
+                 cpus: Optional[Set[int]] = None) -> None:
+        """Check out a commit inside one of the pool's worktrees."""
+        if self._heads.get(path) == sha:
+            return
+
+        self._heads.pop(path, None)
+        if nice or cpus:
+            result = run_isolated(['git', 'checkout', '--force', '--detach', sha],
+                                  cwd=str(path), nice=nice, cpus=cpus)
+            if result.returncode != 0:
+                raise subprocess.CalledProcessError(result.returncode, result.args,
+                                                    result.stdout, result.stderr)
+        else:
+            Git(str(path)).checkout(sha, force=True)
+        self._heads[path] = sha
@@ -0,0 +1,29 @@
+"""Shared fixtures."""
+import pytest
+from git import Repo
+
+
+@pytest.fixture
+def make_repo(tmp_path):
+    """Factory for git repositories built from one {path: content} dict per commit.
+
+    Commits are named 'Commit 0', 'Commit 1', ... in order. name is the
+    directory under tmp_path; other keywords go to Repo.init.
+    """
+    def make(commits=(), name='repo', **init):
+        path = tmp_path / name
+        repo = Repo.init(path, **init)
+        with repo.config_writer() as config:
+            config.set_value('user', 'name', 'Test')
+            config.set_value('user', 'email', 'test@example.com')
+
+        for i, files in enumerate(commits):
+            for file, content in files.items():
+                (path / file).parent.mkdir(parents=True, exist_ok=True)
+                (path / file).write_text(content)
+            repo.index.add(list(files))
+            repo.index.commit(f'Commit {i}')
+
+        return repo
+
+    return make
@@ -0,0 +1,68 @@
+"""Tests for the culprit posterior used by Bayesian bisection."""
+import pytest
+from perf_bisect.bayes import CulpritPosterior, binary_entropy
+
+
+def test_first_probe_is_the_middle():
+    """Test an uninformed posterior asks about the median commit."""
+    posterior = CulpritPosterior(9)
+    
+    index, gain = posterior.best_probe()
+    
+    assert index == 4
+    assert gain == pytest.approx(1 - binary_entropy(0.1), abs=0.01)
+
+
+def test_updates_move_mass_to_the_culprit():
+    """Test consistent runs concentrate the posterior on one commit."""
+    posterior = CulpritPosterior(8, flake_rate=0.05)
+    culprit = 5
+    
+    for _ in range(30):
+        index, _ = posterior.best_probe()
+        posterior.update(index, index >= culprit)
+    
+    assert posterior.most_likely()[0] == culprit
+    assert posterior.most_likely()[1] > 0.99
+    assert posterior.entropy() < 0.1
+
+
+def test_no_culprit_hypothesis():
+    """Test a passing last commit points at no culprit in the range."""
+    posterior = CulpritPosterior(3, flake_rate=0.05)
+    
+    for _ in range(5):
+        posterior.update(2, False)
+    
+    assert posterior.most_likely()[0] is None
+
+
+def test_flaky_answer_is_reprobed():
+    """Test one contradicting run leads to asking again near it, not moving on."""
+    posterior = CulpritPosterior(7, flake_rate=0.2)
+    posterior.update(3, True)
+    posterior.update(3, False)
+    
+    index, _ = posterior.best_probe(measured={3})
+    
+    assert index == 3
+
+
+def test_rejects_bad_flake_rate():
+    """Test flake rates at or above one half carry no information."""
+    with pytest.raises(ValueError, match='flake_rate'):
+        CulpritPosterior(4, flake_rate=0.5)
+
+
+def test_skipped_commits_merge_with_next_candidate():
+    """Test a skipped commit and its testable successor are one candidate."""
+    posterior = CulpritPosterior(5, flake_rate=0.05)
+    for _ in range(3):
+        posterior.update(1, False)
+        posterior.update(3, True)
+    
+    first, last, probability = posterior.likely_range({2})
+    
+    assert (first, last) == (2, 3)
+    assert probability > 0.99
+    assert posterior.best_probe(skipped={0, 1, 2, 3, 4}) == (None, 0.0)
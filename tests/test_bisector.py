@@ -1,8 +1,39 @@
 """Tests for PerformanceBisector core functionality."""
+import subprocess
+import sys
+from contextlib import nullcontext
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from pathlib import Path
+from unittest.mock import Mock, patch
 from perf_bisect.bisector import PerformanceBisector
+from perf_bisect.build import BuildStep
+from perf_bisect.environment import EnvironmentPool
+from perf_bisect.cache import MeasurementCache
+from perf_bisect.metrics import BenchmarkKilled, BenchmarkTimeout
+from perf_bisect.parsing import OutputParser, ParseRun, parse_extractor
+
+
+def make_commit(hexsha, tree, summary):
+    """Create mock commit."""
+    commit = Mock()
+    commit.hexsha = hexsha
+    commit.tree.hexsha = tree
+    commit.summary = summary
+    return commit
+
+
+def wire_history(repo, commits):
+    """Answer the git log queries CommitRange makes for a list of mock commits."""
+    by_sha = {c.hexsha: c for c in commits}
+    
+    def log(*args):
+        if '--format=%H%T' in args:
+            return '\n'.join(c.hexsha + c.tree.hexsha for c in commits)
+        if '--format=%H%T%s' in args:
+            return '\n'.join(c.hexsha + c.tree.hexsha + c.summary for c in commits)
+        shas = [a for a in args if a in by_sha]
+        return '\n'.join(f'{sha}\x00{by_sha[sha].summary}' for sha in shas)
+    
+    repo.git.log = Mock(side_effect=log)
 
 
 @pytest.fixture
@@ -11,20 +42,18 @@ def mock_repo():
     repo = Mock()
     repo.git = Mock()
     
-    good_commit = Mock()
-    good_commit.hexsha = 'abc123'
-    good_commit.summary = 'Good commit'
+    good_commit = make_commit('abc123' + '0' * 34, 'a' * 40, 'Good commit')
+    bad_commit = make_commit('def456' + '0' * 34, 'b' * 40, 'Bad commit')
+    mid_commit = make_commit('789abc' + '0' * 34, 'c' * 40, 'Middle commit')
     
-    bad_commit = Mock()
-    bad_commit.hexsha = 'def456'
-    bad_commit.summary = 'Bad commit'
+    def rev_parse(*args):
+        ref = args[-1].split('^')[0]
+        if len(ref) == 40:
+            return ref
+        return good_commit.hexsha if '~' in ref else bad_commit.hexsha
     
-    mid_commit = Mock()
-    mid_commit.hexsha = 'mid789'
-    mid_commit.summary = 'Middle commit'
-    
-    repo.commit = Mock(side_effect=lambda x: good_commit if 'good' in x else bad_commit)
-    repo.iter_commits = Mock(return_value=[good_commit, mid_commit, bad_commit])
+    repo.git.rev_parse = Mock(side_effect=rev_parse)
+    wire_history(repo, [good_commit, mid_commit, bad_commit])
     
     return repo
 
@@ -84,12 +113,19 @@ def test_bisect_dry_run(mock_repo_class, mock_repo):
     assert 'measurements' in result
 
 
-@patch('subprocess.run')
-def test_run_benchmark_success(mock_run):
+def fake_run(stdout='', returncode=0, stderr=''):
+    """Stand-in for run_measured that streams stdout to its on_stdout callback."""
+    def run(args, on_stdout=None, **kwargs):
+        for line in stdout.splitlines():
+            on_stdout(line)
+        return subprocess.CompletedProcess(args, returncode, '', stderr), {}
+    return Mock(side_effect=run)
+
+
+def test_run_benchmark_success():
     """Test successful benchmark execution."""
-    mock_run.return_value = Mock(returncode=0, stdout='Duration: 1.234s', stderr='')
-    
-    with patch('perf_bisect.bisector.Repo'):
+    with patch('perf_bisect.bisector.Repo'), \
+            patch('perf_bisect.bisector.run_measured', fake_run('Duration: 1.234s')) as mock_run:
         bisector = PerformanceBisector('.')
         duration = bisector.run_benchmark('python bench.py', timeout=300)
         
@@ -97,10 +133,9 @@ def test_run_benchmark_success(mock_run):
         mock_run.assert_called_once()
 
 
-@patch('subprocess.run')
+@patch('perf_bisect.bisector.run_measured')
 def test_run_benchmark_timeout(mock_run):
     """Test benchmark timeout handling."""
-    import subprocess
     mock_run.side_effect = subprocess.TimeoutExpired('cmd', 300)
     
     with patch('perf_bisect.bisector.Repo'):
@@ -110,29 +145,680 @@ def test_run_benchmark_timeout(mock_run):
             bisector.run_benchmark('python bench.py', timeout=300)
 
 
-@patch('subprocess.run')
-def test_run_benchmark_json_output(mock_run):
+def test_run_benchmark_json_output():
     """Test parsing JSON benchmark output."""
-    mock_run.return_value = Mock(
-        returncode=0,
-        stdout='{"duration": 2.5, "memory": 100}',
-        stderr=''
-    )
+    output = '{"duration": 2.5, "memory": 100}'
     
-    with patch('perf_bisect.bisector.Repo'):
+    with patch('perf_bisect.bisector.Repo'), \
+            patch('perf_bisect.bisector.run_measured', fake_run(output)):
         bisector = PerformanceBisector('.')
         duration = bisector.run_benchmark('python bench.py', timeout=300)
         
         assert duration == 2.5
 
 
-@patch('subprocess.run')
-def test_run_benchmark_failure(mock_run):
+def test_run_benchmark_failure():
     """Test benchmark command failure."""
-    mock_run.return_value = Mock(returncode=1, stdout='', stderr='Error occurred')
-    
-    with patch('perf_bisect.bisector.Repo'):
+    with patch('perf_bisect.bisector.Repo'), \
+            patch('perf_bisect.bisector.run_measured',
+                  fake_run(returncode=1, stderr='Error occurred')):
         bisector = PerformanceBisector('.')
         
         with pytest.raises(RuntimeError, match='Benchmark failed'):
             bisector.run_benchmark('python bench.py', timeout=300)
+
+
+def test_run_benchmark_streams_output(tmp_path):
+    """Test output is parsed line by line as the benchmark prints it."""
+    script = tmp_path / 'bench.py'
+    script.write_text("for i in range(1000):\n    print('noise', i)\nprint('duration: 0.25')\n")
+    
+    with patch('perf_bisect.bisector.Repo'), \
+            patch.object(ParseRun, 'feed', autospec=True, side_effect=ParseRun.feed) as feed:
+        bisector = PerformanceBisector('.')
+        duration = bisector.run_benchmark(f'{sys.executable} {script}', timeout=30)
+    
+    assert duration == 0.25
+    assert feed.call_count == 1001
+
+
+def test_split_points_are_evenly_spaced():
+    """Test k-ary split point selection."""
+    assert PerformanceBisector._split_points(0, 9, 1) == [5]
+    assert PerformanceBisector._split_points(0, 11, 3) == [3, 6, 9]
+    assert PerformanceBisector._split_points(4, 5, 3) == [4, 5]
+
+
+@patch('perf_bisect.bisector.WorktreePool')
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_parallel_finds_regression(mock_repo_class, mock_pool_class):
+    """Test parallel k-ary bisect locates the first slow commit."""
+    commits = [make_commit(f'{i:02d}' + 'a' * 38, 'f' * 40, f'Commit {i}')
+               for i in range(20)]
+    
+    repo = Mock()
+    repo.git.rev_parse = Mock(side_effect=lambda *args: commits[0].hexsha
+                              if 'good' in args[-1] else commits[-1].hexsha)
+    wire_history(repo, commits)
+    mock_repo_class.return_value = repo
+    
+    bisector = PerformanceBisector('.', verbose=False)
+    
+    def measure(commit, cmd, threshold, timeout, pool=None):
+        duration = 2.0 if int(commit.hexsha[:2]) >= 13 else 0.5
+        return {'commit': commit.hexsha, 'message': commit.summary,
+                'duration': duration, 'passed': duration <= threshold}
+    
+    bisector._measure = Mock(side_effect=measure)
+    
+    result = bisector.bisect(
+        benchmark_cmd='python bench.py',
+        good_commit='good',
+        bad_commit='bad',
+        threshold=1.0,
+        jobs=4
+    )
+    
+    assert result['regression_commit'] == commits[13].hexsha
+    assert len(result['measurements']) < 20
+    mock_pool_class.assert_called_once_with(repo, size=4)
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_adaptive_sampling(mock_repo_class, mock_repo):
+    """Test probes collect several samples and record their spread."""
+    mock_repo_class.return_value = mock_repo
+    bisector = PerformanceBisector('.', verbose=False)
+    bisector.run_benchmark = Mock(side_effect=[0.9, 1.3, 0.95, 1.05] * 5)
+    
+    result = bisector.bisect(
+        benchmark_cmd='python bench.py',
+        good_commit='HEAD~10',
+        bad_commit='HEAD',
+        threshold=1.0,
+        min_samples=2,
+        max_samples=4
+    )
+    
+    first = result['measurements'][0]
+    assert len(first['samples']) == 4
+    assert first['duration'] == pytest.approx(1.0)
+    assert 'stdev' in first
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_reuses_cached_samples(mock_repo_class, mock_repo, tmp_path):
+    """Test a rerun over measured commits skips checkout and benchmarks."""
+    mock_repo_class.return_value = mock_repo
+    cache = MeasurementCache(str(tmp_path / 'cache.sqlite'), fingerprint='test')
+    
+    first = PerformanceBisector('.', cache=cache)
+    first.run_benchmark = Mock(return_value=0.5)
+    first.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0)
+    
+    mock_repo.git.checkout.reset_mock()
+    second = PerformanceBisector('.', cache=cache)
+    second.run_benchmark = Mock(return_value=0.5)
+    result = second.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=0.8)
+    
+    second.run_benchmark.assert_not_called()
+    assert mock_repo.git.checkout.call_count == 1
+    assert all(m['passed'] for m in result['measurements'])
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_resume_skips_completed_probes(mock_repo_class, mock_repo, tmp_path):
+    """Test resuming replays checkpointed probes without rerunning them."""
+    mock_repo_class.return_value = mock_repo
+    path = str(tmp_path / 'session.jsonl')
+    
+    first = PerformanceBisector('.')
+    first.run_benchmark = Mock(side_effect=[0.5, RuntimeError('Benchmark timed out')])
+    with pytest.raises(RuntimeError):
+        first.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0, checkpoint=path)
+    
+    second = PerformanceBisector('.')
+    second.run_benchmark = Mock(return_value=1.5)
+    result = second.resume(path)
+    
+    assert second.run_benchmark.call_count == 1
+    assert [m['passed'] for m in result['measurements']] == [True, False]
+    assert result['regression_commit'] is not None
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_resume_reuses_derived_threshold(mock_repo_class, mock_repo, tmp_path):
+    """Test resuming a regression-mode session does not measure the endpoints again."""
+    mock_repo_class.return_value = mock_repo
+    mock_repo.commit = Mock(side_effect=lambda sha: make_commit(sha, sha[::-1], 'Endpoint'))
+    path = str(tmp_path / 'session.jsonl')
+    
+    first = PerformanceBisector('.')
+    first.run_benchmark = Mock(side_effect=[1.0] * 3 + [2.0] * 3 +
+                               [RuntimeError('Benchmark timed out')])
+    with pytest.raises(RuntimeError):
+        first.bisect('python bench.py', 'HEAD~10', 'HEAD', regression=0.15,
+                     baseline_samples=3, checkpoint=path)
+    
+    second = PerformanceBisector('.')
+    second.run_benchmark = Mock(side_effect=[1.05, 1.5])
+    result = second.resume(path)
+    
+    assert second.run_benchmark.call_count == 2
+    assert result['threshold'] == pytest.approx(1.15)
+    assert result['baseline']['bad'] == 2.0
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_resume_restores_build_step(mock_repo_class, mock_repo, tmp_path):
+    """Test resuming rebuilds the build step recorded in the checkpoint."""
+    mock_repo_class.return_value = mock_repo
+    path = str(tmp_path / 'session.jsonl')
+    build = BuildStep('make', outputs=['out'], inputs=['src'],
+                      cache_dir=str(tmp_path / 'builds'))
+    
+    with patch.object(BuildStep, 'run', return_value={'build_time': 1.0,
+                                                      'build_cached': False}):
+        first = PerformanceBisector('.', build=build)
+        first.run_benchmark = Mock(side_effect=[0.5, RuntimeError('Benchmark failed')])
+        with pytest.raises(RuntimeError):
+            first.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0,
+                         checkpoint=path)
+        
+        second = PerformanceBisector('.')
+        second.run_benchmark = Mock(return_value=1.5)
+        result = second.resume(path)
+    
+    assert second.build.command == 'make'
+    assert second.build.outputs == ['out']
+    assert second.build.inputs == ['src']
+    assert second.build.cache_dir == tmp_path / 'builds'
+    assert result['regression_commit'] is not None
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_build_time_is_separate_from_duration(mock_repo_class, mock_repo, tmp_path):
+    """Test probes record build time apart from the benchmark and reuse built outputs."""
+    mock_repo_class.return_value = mock_repo
+    mock_repo.working_tree_dir = str(tmp_path)
+    script = "import pathlib; pathlib.Path('out').mkdir(exist_ok=True)"
+    build = BuildStep(f'{sys.executable} -c "{script}"', outputs=['out'],
+                      cache_dir=str(tmp_path / 'builds'))
+    bisector = PerformanceBisector('.', build=build)
+    bisector.run_benchmark = Mock(side_effect=[0.5, 1.5, 0.5, 1.5])
+    
+    first = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0)
+    again = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0)
+    
+    assert [m['duration'] for m in first['measurements']] == [0.5, 1.5]
+    assert all(m['build_time'] > 0 and not m['build_cached'] for m in first['measurements'])
+    assert all(m['build_time'] == 0 and m['build_cached'] for m in again['measurements'])
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_resume_restores_environments(mock_repo_class, mock_repo, tmp_path):
+    """Test resuming rebuilds the environment pool recorded in the checkpoint."""
+    mock_repo_class.return_value = mock_repo
+    path = str(tmp_path / 'session.jsonl')
+    environments = EnvironmentPool('make env', ['poetry.lock', 'pyproject.toml'],
+                                   env_path='env', max_envs=2)
+    
+    leased = {'setup_time': 1.0, 'setup_cached': False}
+    with patch.object(EnvironmentPool, 'lease', side_effect=lambda *args: nullcontext(leased)):
+        first = PerformanceBisector('.', environments=environments)
+        first.run_benchmark = Mock(side_effect=[0.5, RuntimeError('Benchmark failed')])
+        with pytest.raises(RuntimeError):
+            first.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0,
+                         checkpoint=path)
+        
+        second = PerformanceBisector('.')
+        second.run_benchmark = Mock(return_value=1.5)
+        result = second.resume(path)
+    
+    assert second.environments.setup_cmd == 'make env'
+    assert second.environments.lockfiles == ['poetry.lock', 'pyproject.toml']
+    assert second.environments.env_path == 'env'
+    assert second.environments.max_envs == 2
+    assert result['regression_commit'] is not None
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_setup_time_is_separate_from_duration(mock_repo_class, mock_repo, tmp_path):
+    """Test probes record setup time apart from the benchmark, one environment per lockfile."""
+    mock_repo_class.return_value = mock_repo
+    mock_repo.working_tree_dir = str(tmp_path / 'work')
+    (tmp_path / 'work').mkdir()
+    resolve = mock_repo.git.rev_parse.side_effect
+    
+    def rev_parse(*args):
+        if args[-1].endswith(':requirements.txt'):
+            # The bad commit changed the lockfile; the middle one did not.
+            return 'lock-new' if args[-1].startswith('def456') else 'lock-old'
+        return resolve(*args)
+    
+    mock_repo.git.rev_parse = Mock(side_effect=rev_parse)
+    environments = EnvironmentPool(f'{sys.executable} -c "pass"', ['requirements.txt'],
+                                   root=str(tmp_path / 'envs'))
+    bisector = PerformanceBisector('.', environments=environments)
+    bisector.run_benchmark = Mock(side_effect=[0.5, 1.5, 0.5, 1.5])
+    
+    first = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0)
+    again = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0)
+    
+    assert [m['duration'] for m in first['measurements']] == [0.5, 1.5]
+    assert all(m['setup_time'] > 0 and not m['setup_cached'] for m in first['measurements'])
+    assert all(m['setup_time'] == 0 and m['setup_cached'] for m in again['measurements'])
+    assert len(list((tmp_path / 'envs').iterdir())) == 2
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_on_memory_metric(mock_repo_class, mock_repo):
+    """Test bisecting on peak RSS instead of wall time."""
+    mock_repo_class.return_value = mock_repo
+    bisector = PerformanceBisector('.', collectors=[])
+    bisector.run_benchmark_metrics = Mock(side_effect=[
+        {'duration': 0.5, 'max_rss': 100.0 * 1024 ** 2},
+        {'duration': 0.5, 'max_rss': 900.0 * 1024 ** 2},
+    ])
+    
+    result = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD',
+                             threshold=512 * 1024 ** 2, metric='max_rss')
+    
+    assert result['metric'] == 'max_rss'
+    assert result['regression_message'] == 'Bad commit'
+    assert result['measurements'][1]['metrics']['duration'] == 0.5
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_regression_mode_derives_threshold(mock_repo_class, mock_repo):
+    """Test percentage mode measures endpoints and records the derived threshold."""
+    mock_repo_class.return_value = mock_repo
+    mock_repo.commit = Mock(side_effect=lambda sha: make_commit(sha, sha[::-1], 'Endpoint'))
+    bisector = PerformanceBisector('.')
+    bisector.run_benchmark = Mock(side_effect=[1.0] * 3 + [2.0] * 3 + [1.05, 1.5])
+    
+    result = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD',
+                             regression=0.15, baseline_samples=3)
+    
+    assert result['threshold'] == pytest.approx(1.15)
+    assert result['baseline']['good'] == 1.0
+    assert result['baseline']['bad'] == 2.0
+    assert result['regression_message'] == 'Bad commit'
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_requires_one_threshold_mode(mock_repo_class, mock_repo):
+    """Test threshold and regression are mutually exclusive."""
+    mock_repo_class.return_value = mock_repo
+    bisector = PerformanceBisector('.')
+    
+    with pytest.raises(ValueError, match='exactly one'):
+        bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0, regression=0.1)
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_records_killed_probe_as_censored(mock_repo_class, mock_repo):
+    """Test a run killed past kill_factor x threshold counts as bad with a lower bound."""
+    mock_repo_class.return_value = mock_repo
+    bisector = PerformanceBisector('.', collectors=[])
+    bisector.run_benchmark_metrics = Mock(side_effect=[
+        {'duration': 0.4, 'wall_time': 0.5},
+        BenchmarkKilled('wall', 2.01),
+    ])
+    
+    result = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0,
+                             metric='wall_time', kill_factor=2.0)
+    
+    killed = result['measurements'][1]
+    assert killed['censored'] is True
+    assert killed['lower_bound'] == 2.01
+    assert killed['duration'] == 2.01
+    assert killed['passed'] is False
+    assert result['regression_message'] == 'Bad commit'
+    assert bisector.run_benchmark_metrics.call_args.kwargs['kill_after'] == 2.0
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_kill_factor_needs_time_metric(mock_repo_class, mock_repo):
+    """Test early kill is rejected unless the metric is the kill clock's own reading."""
+    mock_repo_class.return_value = mock_repo
+    bisector = PerformanceBisector('.')
+    
+    for metric, clock in (('max_rss', 'wall'), ('duration', 'wall'), ('cpu_time', 'wall'),
+                          ('wall_time', 'cpu'), ('user_time', 'cpu')):
+        with pytest.raises(ValueError, match='needs metric'):
+            bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0,
+                            metric=metric, kill_factor=2.0, kill_clock=clock)
+
+
+def test_run_benchmark_metrics_adds_extracted_values():
+    """Test named extractor values join the collected metrics."""
+    import sys
+    from perf_bisect.parsing import OutputParser, parse_extractor
+    
+    with patch('perf_bisect.bisector.Repo'):
+        parser = OutputParser([parse_extractor('rps=re:([0-9]+) req/s')])
+        bisector = PerformanceBisector('.', collectors=[], parser=parser)
+        code = 'print("812 req/s"); print("duration: 0.25")'
+        metrics = bisector.run_benchmark_metrics(f'{sys.executable} -c \'{code}\'', timeout=30)
+    
+    assert metrics == {'rps': 812.0, 'duration': 0.25}
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_cached_samples_are_keyed_by_extractors(mock_repo_class, mock_repo, tmp_path):
+    """Test changing the --extract specs does not reuse samples parsed the old way."""
+    mock_repo_class.return_value = mock_repo
+    cache = MeasurementCache(str(tmp_path / 'cache.sqlite'), fingerprint='test')
+    
+    first = PerformanceBisector('.', cache=cache)
+    first.run_benchmark = Mock(side_effect=[0.5, 1.5])
+    first.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0)
+    
+    parser = OutputParser([parse_extractor('duration=re:took ([0-9.]+)')])
+    second = PerformanceBisector('.', cache=cache, parser=parser)
+    second.run_benchmark = Mock(side_effect=[0.5, 1.5])
+    second.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0)
+    
+    assert second.run_benchmark.call_count == 2
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_interleaved_runs_correct_for_drift(mock_repo_class, mock_repo):
+    """Test probes are judged against reference runs taken right before them."""
+    mock_repo_class.return_value = mock_repo
+    bisector = PerformanceBisector('.')
+    bisector._start_reference = Mock(return_value={
+        'commit': 'abc123' + '0' * 34, 'tree': 'a' * 40, 'cwd': 'ref',
+        'level': 1.0, 'samples': [1.0]})
+    # The machine slows to half speed: reference and probe both double.
+    bisector.run_benchmark = Mock(side_effect=[2.0, 2.2, 2.0, 4.0])
+    
+    result = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.5,
+                             interleave=True, warmup=0)
+    
+    first, second = result['measurements']
+    assert first['ratio'] == pytest.approx(1.1)
+    assert first['duration'] == pytest.approx(1.1)
+    assert first['passed'] is True
+    assert first['reference_samples'] == [2.0]
+    assert second['passed'] is False
+    assert result['regression_message'] == 'Bad commit'
+    assert result['reference']['level'] == 1.0
+    assert bisector.run_benchmark.call_args_list[0].kwargs['cwd'] == 'ref'
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_warmup_runs_are_discarded(mock_repo_class, mock_repo):
+    """Test warmup runs precede sampling and do not count as samples."""
+    mock_repo_class.return_value = mock_repo
+    bisector = PerformanceBisector('.')
+    bisector.run_benchmark = Mock(side_effect=[9.0, 0.5, 9.0, 0.6])
+    
+    result = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0, warmup=1)
+    
+    assert [m['samples'] for m in result['measurements']] == [[0.5], [0.6]]
+    assert result['measurements'][0]['warmup'] == 1
+    assert result['measurements'][0]['environment']['cpus']
+
+
+def test_sweep_finds_regression_and_later_fix(make_repo):
+    """Test a sweep reports both steps of a slowdown that is later fixed."""
+    repo = make_repo([{'duration.txt': '2.0' if 5 <= i < 9 else '1.0'} for i in range(13)])
+    commits = list(repo.iter_commits())
+    
+    bisector = PerformanceBisector(repo.working_tree_dir)
+    cmd = f'{sys.executable} -c "print(\'duration:\', open(\'duration.txt\').read())"'
+    result = bisector.sweep(cmd, commits[-1].hexsha, commits[0].hexsha, stride=2, jobs=2,
+                            samples=1)
+    
+    assert [(c['message'], c['kind']) for c in result['changes']] == [
+        ('Commit 5', 'regression'), ('Commit 9', 'improvement')]
+    assert result['changes'][0]['effect'] == pytest.approx(1.0)
+    assert {m['phase'] for m in result['measurements']} == {'grid', 'refine'}
+    assert len(repo.git.worktree('list').splitlines()) == 1
+
+
+def test_sweep_treats_timeouts_as_the_slow_level(make_repo):
+    """Test a sweep refines a step whose slow side times out."""
+    repo = make_repo([{'d.txt': '5' if i >= 3 else '0.05'} for i in range(6)])
+    commits = list(repo.iter_commits())
+    cmd = (f'{sys.executable} -c "import time; d = float(open(\'d.txt\').read()); '
+           f'time.sleep(d); print(\'duration:\', d)"')
+    
+    result = PerformanceBisector(repo.working_tree_dir).sweep(
+        cmd, commits[-1].hexsha, commits[0].hexsha, stride=2, timeout=1)
+    
+    assert [(c['message'], c['kind']) for c in result['changes']] == [
+        ('Commit 3', 'regression')]
+    assert any(m['censored'] for m in result['measurements'] if m['phase'] == 'refine')
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_bayes_strategy_survives_flaky_runs(mock_repo_class, mock_repo):
+    """Test the Bayesian search finds the culprit although some runs lie."""
+    mock_repo_class.return_value = mock_repo
+    history = [make_commit(f'{i:02d}' + 'a' * 38, f'{i:02d}' + 'b' * 38, f'Commit {i}')
+               for i in range(8)]
+    wire_history(mock_repo, history)
+    checked_out = {}
+    mock_repo.git.checkout = Mock(side_effect=lambda sha, **kw: checked_out.update(sha=sha))
+    runs = []
+    
+    def benchmark(cmd, timeout, cwd=None):
+        runs.append(checked_out['sha'])
+        slow = int(checked_out['sha'][:2]) >= 5
+        if len(runs) % 5 == 0:
+            slow = not slow
+        return 2.0 if slow else 0.5
+    
+    bisector = PerformanceBisector('.')
+    bisector.run_benchmark = Mock(side_effect=benchmark)
+    
+    result = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0,
+                             strategy='bayes', posterior=0.95, flake_rate=0.2)
+    
+    assert result['regression_message'] == 'Commit 5'
+    assert result['search']['converged']
+    assert result['search']['runs'] == len(runs)
+    assert len({m['commit'] for m in result['measurements']}) == len(result['measurements'])
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_bayes_rejects_parallel_jobs(mock_repo_class, mock_repo):
+    """Test the one-at-a-time strategy refuses parallel options."""
+    mock_repo_class.return_value = mock_repo
+    bisector = PerformanceBisector('.')
+    
+    with pytest.raises(ValueError, match='one probe at a time'):
+        bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0,
+                        strategy='bayes', jobs=4)
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_pinning_rejects_parallel_jobs(mock_repo_class, mock_repo):
+    """Test bisect and sweep refuse to share pinned CPUs between concurrent jobs."""
+    mock_repo_class.return_value = mock_repo
+    bisector = PerformanceBisector('.')
+    
+    with pytest.raises(ValueError, match='Pinned runs need jobs=1'):
+        bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0,
+                        pin_cpus={0}, jobs=2)
+    with pytest.raises(ValueError, match='Pinned runs need jobs=1'):
+        bisector.sweep('python bench.py', 'HEAD~10', 'HEAD', pin_cpus={0}, jobs=2)
+
+
+def test_bisect_first_parent_descends_into_merge(make_repo, tmp_path):
+    """Test the mainline culprit merge is followed into its side branch."""
+    repo = make_repo(initial_branch='main')
+    path = tmp_path / 'repo'
+    
+    def commit(name, level):
+        (path / 'duration.txt').write_text(level)
+        (path / f'{name}.txt').write_text(name)
+        repo.index.add(['duration.txt', f'{name}.txt'])
+        return repo.index.commit(name)
+    
+    good = commit('c0', '0.5')
+    commit('c1', '0.5')
+    repo.git.checkout('-b', 'feature')
+    commit('f1', '0.5')
+    commit('f2', '2.0')
+    commit('f3', '2.0')
+    repo.git.checkout('main')
+    commit('c2', '0.5')
+    repo.git.merge('feature', '--no-ff', '-X', 'theirs', '-m', 'Merge feature')
+    bad = commit('c3', '2.0')
+    
+    bisector = PerformanceBisector(str(path))
+    cmd = f'{sys.executable} -c "print(\'duration:\', open(\'duration.txt\').read())"'
+    result = bisector.bisect(cmd, good.hexsha, bad.hexsha, threshold=1.0, first_parent=True)
+    
+    assert result['regression_message'] == 'f2'
+    assert len(result['descended']) == 1
+    # Two probes on the four-commit mainline, two on the three-commit side branch.
+    assert len(result['measurements']) == 4
+    assert repo.head.commit == bad
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_skips_broken_commits(mock_repo_class, mock_repo, tmp_path):
+    """Test failing commits are skipped, cached, and leave a culprit range."""
+    mock_repo_class.return_value = mock_repo
+    history = [make_commit(f'{i:02d}' + 'a' * 38, f'{i:02d}' + 'b' * 38, f'Commit {i}')
+               for i in range(8)]
+    wire_history(mock_repo, history)
+    checked_out = {}
+    mock_repo.git.checkout = Mock(side_effect=lambda sha, **kw: checked_out.update(sha=sha))
+    
+    def benchmark(cmd, timeout, cwd=None):
+        index = int(checked_out['sha'][:2])
+        if index in (3, 4):
+            raise RuntimeError('Benchmark failed: ImportError')
+        return 2.0 if index >= 4 else 0.5
+    
+    cache = MeasurementCache(str(tmp_path / 'cache.sqlite'))
+    bisector = PerformanceBisector('.', cache=cache)
+    bisector.run_benchmark = Mock(side_effect=benchmark)
+    
+    result = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0,
+                             skip_broken=True)
+    
+    assert result['culprit_range'] == [history[3].hexsha, history[4].hexsha,
+                                       history[5].hexsha]
+    assert result['regression_commit'] == history[5].hexsha
+    assert set(result['skipped']) == {history[3].hexsha, history[4].hexsha}
+    
+    calls = bisector.run_benchmark.call_count
+    again = PerformanceBisector('.', cache=cache)
+    again.run_benchmark = Mock(side_effect=benchmark)
+    rerun = again.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0,
+                         skip_broken=True)
+    
+    assert again.run_benchmark.call_count == 0
+    assert all(m['skip_cached'] for m in rerun['measurements'] if m.get('skipped'))
+    assert calls > 0
+    
+    strict = PerformanceBisector('.')
+    strict.run_benchmark = Mock(side_effect=benchmark)
+    with pytest.raises(RuntimeError, match='ImportError'):
+        strict.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0)
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_timeout_is_censored_not_broken(mock_repo_class, mock_repo, tmp_path):
+    """Test a timed out probe counts as slow and is not cached as broken."""
+    mock_repo_class.return_value = mock_repo
+    cache = MeasurementCache(str(tmp_path / 'cache.sqlite'))
+    bisector = PerformanceBisector('.', cache=cache)
+    bisector.run_benchmark = Mock(side_effect=[0.5, BenchmarkTimeout(30)])
+    
+    result = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0,
+                             timeout=30, skip_broken=True)
+    
+    timed_out = result['measurements'][1]
+    assert timed_out['censored'] is True
+    assert timed_out['lower_bound'] == 30
+    assert timed_out['passed'] is False
+    assert not timed_out.get('skipped')
+    assert result['regression_message'] == 'Bad commit'
+    assert cache.get_broken('b' * 40, 'python bench.py') is None
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_skips_unparseable_output(mock_repo_class, mock_repo, tmp_path):
+    """Test output without a duration is a broken commit under skip_broken."""
+    mock_repo_class.return_value = mock_repo
+    cache = MeasurementCache(str(tmp_path / 'cache.sqlite'))
+    bisector = PerformanceBisector('.', cache=cache)
+    bisector.run_benchmark = Mock(side_effect=[
+        0.5, ValueError('Could not parse duration from output: oops')])
+    
+    result = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0,
+                             skip_broken=True)
+    
+    assert result['measurements'][1]['skipped'] is True
+    assert 'Could not parse' in cache.get_broken('b' * 40, 'python bench.py')
+
+
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_bayes_skips_broken_commits(mock_repo_class, mock_repo):
+    """Test the Bayesian search never reprobes a broken commit."""
+    mock_repo_class.return_value = mock_repo
+    history = [make_commit(f'{i:02d}' + 'a' * 38, f'{i:02d}' + 'b' * 38, f'Commit {i}')
+               for i in range(8)]
+    wire_history(mock_repo, history)
+    checked_out = {}
+    mock_repo.git.checkout = Mock(side_effect=lambda sha, **kw: checked_out.update(sha=sha))
+    
+    def benchmark(cmd, timeout, cwd=None):
+        index = int(checked_out['sha'][:2])
+        if index == 4:
+            raise RuntimeError('Benchmark failed')
+        return 2.0 if index >= 4 else 0.5
+    
+    bisector = PerformanceBisector('.')
+    bisector.run_benchmark = Mock(side_effect=benchmark)
+    
+    result = bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0,
+                             strategy='bayes', flake_rate=0.05, skip_broken=True)
+    
+    assert result['culprit_range'] == [history[4].hexsha, history[5].hexsha]
+    assert result['skipped'] == [history[4].hexsha]
+    assert result['search']['converged']
+
+
+@patch('perf_bisect.bisector.CallableWorker')
+@patch('perf_bisect.bisector.Repo')
+def test_bisect_python_callable_uses_one_worker_per_checkout(mock_repo_class, mock_worker_class,
+                                                             mock_repo):
+    """Test callable mode samples a warm worker and restarts it only on checkout."""
+    mock_repo_class.return_value = mock_repo
+    mock_repo.working_tree_dir = '/repo'
+    checked_out = {}
+    mock_repo.git.checkout = Mock(side_effect=lambda sha, **kw: checked_out.update(sha=sha))
+    workers = []
+    
+    def start(target, cwd, timeout, cpus=None, python=None):
+        worker = Mock(loops=100)
+        level = 2.0e-3 if checked_out['sha'].startswith(('789', 'def')) else 1.0e-3
+        worker.sample.return_value = [level]
+        workers.append(worker)
+        return worker
+    
+    mock_worker_class.side_effect = start
+    bisector = PerformanceBisector('.')
+    bisector.run_benchmark = Mock(side_effect=AssertionError('no subprocess per run'))
+    
+    result = bisector.bisect('', 'HEAD~10', 'HEAD', threshold=1.5e-3, max_samples=3,
+                             min_samples=3, python_callable='bench.mod:work')
+    
+    assert result['regression_commit'].startswith('789abc')
+    assert mock_worker_class.call_args.args[:2] == ('bench.mod:work', '/repo')
+    assert len(workers) == len(result['measurements'])
+    assert all(w.sample.call_count == 3 and w.close.called for w in workers)
+    assert result['measurements'][0]['samples'] == [2.0e-3] * 3
+    
+    with pytest.raises(ValueError, match='either a benchmark command'):
+        bisector.bisect('python bench.py', 'HEAD~10', 'HEAD', threshold=1.0,
+                        python_callable='bench.mod:work')
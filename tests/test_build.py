@@ -0,0 +1,70 @@
+"""Tests for the build step and its artifact cache."""
+import sys
+import pytest
+from unittest.mock import Mock
+from perf_bisect.build import BuildStep
+
+
+def make_commit(tree='tree1', sha='abc123'):
+    """Create a mock commit with a tree hash."""
+    commit = Mock()
+    commit.hexsha = sha
+    commit.tree.hexsha = tree
+    return commit
+
+
+@pytest.fixture
+def build_cmd():
+    """Build command writing an artifact and counting invocations."""
+    script = ("import pathlib; p = pathlib.Path('out'); p.mkdir(exist_ok=True); "
+              "(p / 'bin').write_text('built'); "
+              "c = pathlib.Path('count'); c.write_text(str(int(c.read_text() or 0) + 1) "
+              "if c.exists() else '1')")
+    return f'{sys.executable} -c "{script}"'
+
+
+def test_build_runs_and_is_timed(tmp_path, build_cmd):
+    """Test a first build executes and records its time."""
+    step = BuildStep(build_cmd, outputs=['out'], cache_dir=str(tmp_path / 'cache'))
+    info = step.run(Mock(), make_commit(), str(tmp_path))
+    
+    assert info['build_cached'] is False
+    assert info['build_time'] > 0
+    assert (tmp_path / 'out' / 'bin').read_text() == 'built'
+
+
+def test_build_restored_from_cache(tmp_path, build_cmd):
+    """Test a second workspace with the same tree restores cached outputs."""
+    cache_dir = str(tmp_path / 'cache')
+    first, second = tmp_path / 'a', tmp_path / 'b'
+    first.mkdir()
+    second.mkdir()
+    
+    BuildStep(build_cmd, outputs=['out'], cache_dir=cache_dir).run(
+        Mock(), make_commit(), str(first))
+    info = BuildStep(build_cmd, outputs=['out'], cache_dir=cache_dir).run(
+        Mock(), make_commit(), str(second))
+    
+    assert info['build_cached'] is True
+    assert (second / 'out' / 'bin').read_text() == 'built'
+    assert not (second / 'count').exists()
+
+
+def test_build_key_uses_input_paths():
+    """Test commits with identical input paths share a key."""
+    repo = Mock()
+    repo.git.rev_parse = Mock(side_effect=lambda spec: 'blob-' + spec.split(':')[1])
+    step = BuildStep('make', inputs=['src'])
+    
+    assert step.key(repo, make_commit('t1', 'a')) == step.key(repo, make_commit('t2', 'b'))
+    assert BuildStep('make').key(repo, make_commit('t1')) != \
+        BuildStep('make').key(repo, make_commit('t2'))
+
+
+def test_build_failure_raises(tmp_path):
+    """Test failing builds raise RuntimeError."""
+    step = BuildStep(f'{sys.executable} -c "raise SystemExit(1)"',
+                     cache_dir=str(tmp_path / 'cache'))
+    
+    with pytest.raises(RuntimeError, match='Build failed'):
+        step.run(Mock(), make_commit(), str(tmp_path))
@@ -0,0 +1,83 @@
+"""Tests for the persistent measurement cache."""
+import time
+import pytest
+from perf_bisect.cache import MeasurementCache, environment_fingerprint
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a cache in a temp directory."""
+    cache = MeasurementCache(str(tmp_path / 'cache.sqlite'), fingerprint='host-a')
+    yield cache
+    cache.close()
+
+
+def test_get_missing_returns_empty(cache):
+    """Test cache miss returns no samples."""
+    assert cache.get('tree1', 'python bench.py') == []
+
+
+def test_put_and_get_roundtrip(cache):
+    """Test samples are stored per tree and command."""
+    cache.put('tree1', 'python bench.py', [0.5, 0.6])
+    cache.put('tree1', 'python other.py', [2.0])
+    
+    assert cache.get('tree1', 'python bench.py') == [0.5, 0.6]
+    assert cache.get('tree1', 'python other.py') == [2.0]
+
+
+def test_put_replaces_samples(cache):
+    """Test storing again replaces the cached sample list."""
+    cache.put('tree1', 'cmd', [0.5])
+    cache.put('tree1', 'cmd', [0.5, 0.7])
+    
+    assert cache.get('tree1', 'cmd') == [0.5, 0.7]
+
+
+def test_fingerprint_isolates_hosts(tmp_path):
+    """Test entries from another environment are not reused."""
+    path = str(tmp_path / 'cache.sqlite')
+    MeasurementCache(path, fingerprint='host-a').put('tree1', 'cmd', [0.5])
+    
+    assert MeasurementCache(path, fingerprint='host-b').get('tree1', 'cmd') == []
+
+
+def test_prune_by_entries(cache):
+    """Test size eviction keeps the most recently used entries."""
+    for i in range(5):
+        cache.put(f'tree{i}', 'cmd', [float(i)])
+        time.sleep(0.01)
+    cache.get('tree0', 'cmd')
+    
+    removed = cache.prune(max_entries=2)
+    
+    assert removed == 3
+    assert cache.get('tree0', 'cmd') == [0.0]
+    assert cache.get('tree4', 'cmd') == [4.0]
+    assert cache.get('tree1', 'cmd') == []
+
+
+def test_prune_by_entries_trims_broken_trees(cache):
+    """Test size eviction applies to broken-tree records as well."""
+    for i in range(4):
+        cache.put_broken(f'tree{i}', 'cmd', f'build failed {i}')
+        time.sleep(0.01)
+    cache.put('tree0', 'cmd', [0.5])
+    
+    assert cache.prune(max_entries=1) == 3
+    assert cache.get_broken('tree3', 'cmd') == 'build failed 3'
+    assert cache.get_broken('tree0', 'cmd') is None
+    assert cache.get('tree0', 'cmd') == [0.5]
+
+
+def test_prune_by_age(cache):
+    """Test age eviction drops stale entries."""
+    cache.put('tree1', 'cmd', [1.0])
+    
+    assert cache.prune(max_age_days=1) == 0
+    assert cache.prune(max_age_days=0) == 1
+
+
+def test_environment_fingerprint_is_stable():
+    """Test fingerprint is deterministic."""
+    assert environment_fingerprint() == environment_fingerprint()
@@ -0,0 +1,53 @@
+"""Tests for change-point detection."""
+import random
+import pytest
+from perf_bisect.changepoint import default_penalty, noise_sigma, pelt, segment_means
+
+
+def test_pelt_finds_regression_and_fix():
+    """Test a step up and a later step down are both found."""
+    rng = random.Random(1)
+    values = ([1.0 + rng.gauss(0, 0.02) for _ in range(20)]
+              + [1.5 + rng.gauss(0, 0.02) for _ in range(15)]
+              + [1.2 + rng.gauss(0, 0.02) for _ in range(10)])
+    
+    assert pelt(values) == [20, 35]
+
+
+def test_pelt_ignores_noise():
+    """Test a flat noisy series has no changes."""
+    rng = random.Random(2)
+    values = [1.0 + rng.gauss(0, 0.05) for _ in range(50)]
+    
+    assert pelt(values) == []
+
+
+def test_pelt_noise_free_steps():
+    """Test exact values still split where the level moves."""
+    assert pelt([1, 1, 1, 2, 2, 2]) == [3]
+    assert pelt([1.0] * 10) == []
+    assert pelt([1.0]) == []
+
+
+def test_pelt_respects_min_size_and_penalty():
+    """Test short segments and expensive changes are suppressed."""
+    values = [1, 1, 1, 5, 1, 1, 1]
+    
+    assert pelt(values, penalty=0.1) == [3, 4]
+    changes = pelt(values, penalty=0.1, min_size=2)
+    bounds = [0] + changes + [len(values)]
+    assert all(end - start >= 2 for start, end in zip(bounds, bounds[1:]))
+    assert pelt(values, penalty=100) == []
+
+
+def test_noise_estimate_ignores_steps():
+    """Test the noise estimate is not inflated by a level shift."""
+    values = [1.0, 1.1] * 10 + [5.0, 5.1] * 10
+    
+    assert noise_sigma(values) == pytest.approx(0.1 / (0.6745 * 2 ** 0.5))
+    assert default_penalty(values) > 0
+
+
+def test_segment_means():
+    """Test means are taken per segment."""
+    assert segment_means([1, 1, 3, 3, 3], [2]) == [1.0, 3.0]
@@ -0,0 +1,78 @@
+"""Tests for JSONL checkpoints."""
+import json
+import pytest
+from perf_bisect.checkpoint import Checkpoint
+
+
+@pytest.fixture
+def session():
+    """Sample session header."""
+    return {'benchmark_cmd': 'python bench.py', 'good_commit': 'abc', 'bad_commit': 'def',
+            'threshold': 1.0}
+
+
+def test_start_writes_header(tmp_path, session):
+    """Test a new checkpoint starts with the session header."""
+    checkpoint = Checkpoint(str(tmp_path / 'session.jsonl'))
+    
+    assert checkpoint.start(session) == []
+    with open(checkpoint.path) as f:
+        assert json.loads(f.readline()) == {'type': 'session', 'session': session}
+
+
+def test_append_and_load(tmp_path, session):
+    """Test measurements are read back in order."""
+    checkpoint = Checkpoint(str(tmp_path / 'session.jsonl'))
+    checkpoint.start(session)
+    checkpoint.append({'commit': 'a1', 'duration': 0.5, 'passed': True})
+    checkpoint.append({'commit': 'a2', 'duration': 1.5, 'passed': False})
+    
+    loaded_session, measurements = checkpoint.load()
+    
+    assert loaded_session == session
+    assert [m['commit'] for m in measurements] == ['a1', 'a2']
+
+
+def test_start_existing_returns_completed(tmp_path, session):
+    """Test restarting the same session returns finished probes."""
+    path = str(tmp_path / 'session.jsonl')
+    Checkpoint(path).start(session)
+    Checkpoint(path).append({'commit': 'a1', 'duration': 0.5, 'passed': True})
+    
+    assert len(Checkpoint(path).start(session)) == 1
+
+
+def test_start_rejects_other_session(tmp_path, session):
+    """Test a checkpoint is not reused for a different bisect."""
+    path = str(tmp_path / 'session.jsonl')
+    Checkpoint(path).start(session)
+    
+    with pytest.raises(ValueError, match='different session'):
+        Checkpoint(path).start(dict(session, threshold=2.0))
+
+
+def test_saved_state_is_restored(tmp_path, session):
+    """Test derived values are read back on restart without changing the header."""
+    path = str(tmp_path / 'session.jsonl')
+    checkpoint = Checkpoint(path)
+    checkpoint.start(session)
+    checkpoint.save('baseline', {'threshold': 1.15})
+    checkpoint.append({'commit': 'a1', 'duration': 0.5, 'passed': True})
+    
+    restarted = Checkpoint(path)
+    
+    assert len(restarted.start(session)) == 1
+    assert restarted.state == {'baseline': {'threshold': 1.15}}
+
+
+def test_load_ignores_truncated_line(tmp_path, session):
+    """Test a partial line from a crash is dropped."""
+    checkpoint = Checkpoint(str(tmp_path / 'session.jsonl'))
+    checkpoint.start(session)
+    checkpoint.append({'commit': 'a1', 'duration': 0.5, 'passed': True})
+    with open(checkpoint.path, 'a') as f:
+        f.write('{"type": "measurement", "measu')
+    
+    _, measurements = checkpoint.load()
+    
+    assert len(measurements) == 1
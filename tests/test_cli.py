@@ -1,4 +1,5 @@
 """Tests for CLI interface."""
+import json
 import pytest
 from click.testing import CliRunner
 from unittest.mock import patch, Mock
@@ -111,3 +112,256 @@ def test_version_option(runner):
     
     assert result.exit_code == 0
     assert '0.1.0' in result.output or 'version' in result.output.lower()
+
+
+def test_cache_prune_command(runner, tmp_path):
+    """Test cache prune evicts entries."""
+    from perf_bisect.cache import MeasurementCache
+    
+    path = str(tmp_path / 'cache.sqlite')
+    store = MeasurementCache(path)
+    store.put('tree1', 'cmd', [1.0])
+    store.put('tree2', 'cmd', [2.0])
+    store.close()
+    
+    result = runner.invoke(cli, ['cache', 'prune', '--cache-path', path, '--max-entries', '1'])
+    
+    assert result.exit_code == 0
+    assert 'Removed 1' in result.output
+
+
+@patch('perf_bisect.cli.PerformanceBisector')
+def test_run_command_regression_percentage(mock_bisector_class, runner):
+    """Test --regression accepts a percentage instead of --threshold."""
+    mock_bisector = Mock()
+    mock_bisector.bisect.return_value = {
+        'good_commit': 'abc123',
+        'bad_commit': 'def456',
+        'threshold': 1.15,
+        'regression_commit': None,
+        'measurements': [],
+        'baseline': {'regression': 0.15, 'threshold': 1.15, 'good': 1.0, 'bad': 1.3}
+    }
+    mock_bisector_class.return_value = mock_bisector
+    
+    result = runner.invoke(cli, ['run', 'python bench.py', '--regression', '15%'])
+    
+    assert result.exit_code == 0
+    assert mock_bisector.bisect.call_args.kwargs['regression'] == pytest.approx(0.15)
+    assert 'Baseline' in result.output
+
+
+def test_run_command_requires_threshold_or_regression(runner):
+    """Test one threshold mode must be chosen."""
+    result = runner.invoke(cli, ['run', 'python bench.py'])
+    
+    assert result.exit_code != 0
+
+
+@patch('perf_bisect.cli.PerformanceBisector')
+def test_run_command_with_named_metric(mock_bisector_class, runner):
+    """Test an --extract name can be bisected on."""
+    mock_bisector = Mock()
+    mock_bisector.bisect.return_value = {
+        'good_commit': 'abc123',
+        'bad_commit': 'def456',
+        'threshold': 1000.0,
+        'metric': 'rps',
+        'regression_commit': None,
+        'measurements': []
+    }
+    mock_bisector_class.return_value = mock_bisector
+    
+    result = runner.invoke(cli, ['run', 'python bench.py', '--threshold', '1000',
+                                 '--metric', 'rps', '--extract', 'rps=json:/rps'])
+    
+    assert result.exit_code == 0
+    assert mock_bisector_class.call_args.kwargs['parser'].names[-1] == 'rps'
+
+
+def test_run_command_rejects_unknown_metric(runner):
+    """Test a metric nobody collects or extracts is a usage error."""
+    result = runner.invoke(cli, ['run', 'python bench.py', '--threshold', '1',
+                                 '--metric', 'rps'])
+    
+    assert result.exit_code != 0
+    assert 'add an --extract' in result.output
+
+
+@patch('perf_bisect.cli.PerformanceBisector')
+def test_sweep_command(mock_bisector_class, runner):
+    """Test the sweep command passes its options through."""
+    mock_bisector = Mock()
+    mock_bisector.sweep.return_value = {
+        'mode': 'sweep',
+        'good_commit': 'abc123',
+        'bad_commit': 'def456',
+        'stride': 4,
+        'changes': [],
+        'measurements': []
+    }
+    mock_bisector_class.return_value = mock_bisector
+    
+    result = runner.invoke(cli, ['sweep', 'python bench.py', '--stride', '4', '--jobs', '3',
+                                 '--min-effect', '5%'])
+    
+    assert result.exit_code == 0
+    kwargs = mock_bisector.sweep.call_args.kwargs
+    assert (kwargs['stride'], kwargs['jobs']) == (4, 3)
+    assert kwargs['min_effect'] == pytest.approx(0.05)
+    assert 'No performance steps found' in result.output
+
+
+@patch('perf_bisect.cli.PerformanceBisector')
+def test_suite_command(mock_bisector_class, runner, tmp_path):
+    """Test the suite command loads the manifest and prints a culprit per benchmark."""
+    manifest = tmp_path / 'suite.json'
+    manifest.write_text('{"benchmarks": [{"name": "parse", "command": "python parse.py", '
+                        '"threshold": 1.0}, {"name": "render", "command": "python r.py", '
+                        '"regression": "10%"}]}')
+    mock_bisector = Mock()
+    mock_bisector.bisect_suite.return_value = {
+        'mode': 'suite',
+        'good_commit': 'abc123',
+        'bad_commit': 'def456',
+        'probed_commits': 3,
+        'benchmarks': [
+            {'name': 'parse', 'metric': 'duration', 'threshold': 1.0, 'probes': 3,
+             'regression_commit': 'bcd234', 'regression_message': 'Slow parser',
+             'culprit_range': None},
+            {'name': 'render', 'metric': 'duration', 'threshold': 2.2, 'probes': 2,
+             'regression_commit': None, 'regression_message': None, 'culprit_range': None}
+        ],
+        'measurements': []
+    }
+    mock_bisector_class.return_value = mock_bisector
+    
+    result = runner.invoke(cli, ['suite', str(manifest), '--skip-broken'])
+    
+    assert result.exit_code == 0
+    benchmarks = mock_bisector.bisect_suite.call_args.args[0]
+    assert [b.name for b in benchmarks] == ['parse', 'render']
+    assert benchmarks[1].regression == pytest.approx(0.1)
+    assert mock_bisector.bisect_suite.call_args.kwargs['skip_broken']
+    assert 'bcd234' in result.output
+    assert 'Slow parser' in result.output
+
+
+def test_suite_command_rejects_bad_manifest(runner, tmp_path):
+    """Test manifest errors are reported as usage errors."""
+    manifest = tmp_path / 'suite.json'
+    manifest.write_text('{"benchmarks": [{"name": "parse", "command": "python parse.py"}]}')
+    
+    result = runner.invoke(cli, ['suite', str(manifest)])
+    
+    assert result.exit_code != 0
+    assert 'exactly one of threshold or regression' in result.output
+
+
+@patch('perf_bisect.cli.PerformanceBisector')
+def test_run_command_writes_trace(mock_bisector_class, runner, tmp_path):
+    """Test --trace saves a Chrome trace and prints the overhead summary."""
+    mock_bisector = Mock()
+    mock_bisector.bisect.return_value = {
+        'good_commit': 'abc123',
+        'bad_commit': 'def456',
+        'threshold': 1.0,
+        'regression_commit': None,
+        'measurements': []
+    }
+    mock_bisector_class.return_value = mock_bisector
+    trace = tmp_path / 'trace.json'
+    
+    result = runner.invoke(cli, ['run', 'python bench.py', '--threshold', '1.0',
+                                 '--trace', str(trace)])
+    
+    assert result.exit_code == 0
+    assert mock_bisector_class.call_args.kwargs['tracer'] is not None
+    events = json.loads(trace.read_text())['traceEvents']
+    assert [e['name'] for e in events] == ['print summary']
+    assert 'overhead' in result.output
+
+
+@patch('perf_bisect.cli.PerformanceBisector')
+def test_run_command_python_callable(mock_bisector_class, runner):
+    """Test --python-callable replaces the benchmark command."""
+    mock_bisector = Mock()
+    mock_bisector.bisect.return_value = {
+        'good_commit': 'abc123',
+        'bad_commit': 'def456',
+        'threshold': 0.001,
+        'regression_commit': None,
+        'measurements': []
+    }
+    mock_bisector_class.return_value = mock_bisector
+    
+    result = runner.invoke(cli, ['run', '--python-callable', 'bench.mod:work',
+                                 '--threshold', '1ms'])
+    
+    assert result.exit_code == 0
+    assert mock_bisector.bisect.call_args.kwargs['python_callable'] == 'bench.mod:work'
+    assert mock_bisector.bisect.call_args.kwargs['benchmark_cmd'] == ''
+    
+    both = runner.invoke(cli, ['run', 'python bench.py', '--python-callable', 'bench.mod:work',
+                               '--threshold', '1ms'])
+    assert both.exit_code != 0
+    assert 'exactly one of BENCHMARK_CMD or --python-callable' in both.output
+
+
+@patch('perf_bisect.cli.Watcher')
+@patch('perf_bisect.cli.PerformanceBisector')
+def test_watch_command_once(mock_bisector_class, mock_watcher_class, runner):
+    """Test watch --once polls a single time and prints the new points."""
+    mock_watcher = Mock()
+    mock_watcher.poll.return_value = [{
+        'commit': 'abc1234' + '0' * 33, 'message': 'Slow down', 'value': 2.0,
+        'baseline': 1.0, 'landed': 4, 'step': True, 'kind': 'regression',
+        'culprit': 'def5678' + '0' * 33, 'culprit_message': 'Add retries',
+        'culprit_range': None, 'probes': 2
+    }]
+    mock_watcher_class.return_value = mock_watcher
+    
+    result = runner.invoke(cli, ['watch', 'python bench.py', '--once', '--batch', '4',
+                                 '--regression', '20%'])
+    
+    assert result.exit_code == 0
+    mock_watcher.poll.assert_called_once()
+    assert mock_watcher_class.call_args.kwargs['regression'] == pytest.approx(0.2)
+    assert '+100.0%' in result.output
+    assert 'introduced by def5678: Add retries' in result.output
+
+
+@patch('perf_bisect.cli.PerformanceBisector')
+def test_run_command_with_workers(mock_bisector_class, runner, tmp_path):
+    """Test --workers starts a coordinator and hands it to the bisector."""
+    mock_bisector = Mock()
+    mock_bisector.bisect.return_value = {
+        'good_commit': 'abc123',
+        'bad_commit': 'def456',
+        'threshold': 1.0,
+        'regression_commit': None,
+        'measurements': []
+    }
+    mock_bisector_class.return_value = mock_bisector
+    address = f'unix:{tmp_path}/coordinator.sock'
+    
+    result = runner.invoke(cli, ['run', 'python bench.py', '--threshold', '1.0',
+                                 '--workers', address, '--min-workers', '0'])
+    
+    assert result.exit_code == 0
+    assert mock_bisector_class.call_args.kwargs['workers'].address == address
+    assert f'Waiting for 0 worker(s) on {address}' in result.output
+
+
+@patch('perf_bisect.cli.serve', return_value=4)
+@patch('perf_bisect.cli.PerformanceBisector')
+def test_worker_command(mock_bisector_class, mock_serve, runner, tmp_path):
+    """Test worker connects its own clone to the coordinator."""
+    result = runner.invoke(cli, ['worker', 'build-1:7070', '--repo', str(tmp_path),
+                                 '--name', 'w1', '--no-cache'])
+    
+    assert result.exit_code == 0
+    assert mock_bisector_class.call_args.args == (str(tmp_path),)
+    assert mock_serve.call_args.args[0] == 'build-1:7070'
+    assert mock_serve.call_args.kwargs['name'] == 'w1'
+    assert 'measured 4 probe(s)' in result.output
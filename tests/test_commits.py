@@ -0,0 +1,56 @@
+"""Tests for compact commit ranges."""
+import pytest
+from perf_bisect.commits import CommitRange
+
+
+@pytest.fixture
+def git_repo(make_repo):
+    """Create a repository with five commits."""
+    return make_repo([{'value.txt': str(i)} for i in range(5)])
+
+
+def test_resolve_lists_range_oldest_first(git_repo):
+    """Test the range excludes good and ends at bad."""
+    history = list(reversed(list(git_repo.iter_commits())))
+    commits = CommitRange.resolve(git_repo, history[0].hexsha, history[-1].hexsha)
+    
+    assert len(commits) == 4
+    assert [c.hexsha for c in commits] == [c.hexsha for c in history[1:]]
+    assert commits[-1].tree.hexsha == history[-1].tree.hexsha
+
+
+def test_subjects_load_lazily(git_repo):
+    """Test subjects are fetched only when asked for."""
+    history = list(reversed(list(git_repo.iter_commits())))
+    commits = CommitRange.resolve(git_repo, history[0].hexsha, history[-1].hexsha)
+    
+    assert commits._subjects == {}
+    assert commits[1].summary == 'Commit 2'
+    assert list(commits._subjects) == [1]
+
+
+def test_resolve_with_subjects(git_repo):
+    """Test subjects can be read in the same call as the range."""
+    history = list(reversed(list(git_repo.iter_commits())))
+    commits = CommitRange.resolve(git_repo, history[0].hexsha, history[-1].hexsha,
+                                  subjects=True)
+    
+    assert commits[0].hexsha == history[1].hexsha
+    assert [commits.summary(i) for i in range(4)] == [f'Commit {i}' for i in range(1, 5)]
+
+
+def test_index_of(git_repo):
+    """Test locating a commit by SHA."""
+    history = list(reversed(list(git_repo.iter_commits())))
+    commits = CommitRange.resolve(git_repo, history[0].hexsha, history[-1].hexsha)
+    
+    assert commits.index_of(history[3].hexsha) == 2
+    with pytest.raises(ValueError):
+        commits.index_of(history[0].hexsha)
+
+
+def test_empty_range(git_repo):
+    """Test a range with no commits."""
+    head = git_repo.head.commit.hexsha
+    
+    assert len(CommitRange.resolve(git_repo, head, head)) == 0
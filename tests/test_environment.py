@@ -0,0 +1,99 @@
+"""Tests for the dependency environment pool."""
+import os
+import sys
+import pytest
+from unittest.mock import Mock
+from perf_bisect.environment import EnvironmentPool
+
+
+def make_repo(lock_blob):
+    """Create a mock repo resolving every lockfile to the given blob id."""
+    repo = Mock()
+    repo.git.rev_parse = Mock(return_value=lock_blob)
+    return repo
+
+
+def make_commit(sha='abc123'):
+    """Create a mock commit."""
+    commit = Mock()
+    commit.hexsha = sha
+    return commit
+
+
+@pytest.fixture
+def setup_cmd():
+    """Setup command creating a marker file inside the environment."""
+    return f'{sys.executable} -c "import pathlib, sys; pathlib.Path(sys.argv[1]).mkdir(); ' \
+           f'(pathlib.Path(sys.argv[1]) / \'installed\').touch()" {{env}}'
+
+
+def test_setup_runs_once_per_lockfile(tmp_path, setup_cmd):
+    """Test commits sharing a lockfile reuse the environment."""
+    pool = EnvironmentPool(setup_cmd, ['requirements.txt'], root=str(tmp_path / 'envs'))
+    workdir = tmp_path / 'work'
+    workdir.mkdir()
+    repo = make_repo('blob1')
+    
+    with pool.lease(repo, make_commit('a'), str(workdir)) as first:
+        assert (workdir / '.venv' / 'installed').exists()
+    with pool.lease(repo, make_commit('b'), str(workdir)) as second:
+        pass
+    
+    assert first['setup_cached'] is False
+    assert second['setup_cached'] is True
+    assert (workdir / '.venv').is_symlink()
+
+
+def test_lockfile_change_creates_new_environment(tmp_path, setup_cmd):
+    """Test a different lockfile gets its own environment."""
+    pool = EnvironmentPool(setup_cmd, ['requirements.txt'], root=str(tmp_path / 'envs'))
+    workdir = tmp_path / 'work'
+    workdir.mkdir()
+    
+    with pool.lease(make_repo('blob1'), make_commit(), str(workdir)):
+        first_target = os.readlink(workdir / '.venv')
+    with pool.lease(make_repo('blob2'), make_commit(), str(workdir)) as info:
+        second_target = os.readlink(workdir / '.venv')
+    
+    assert info['setup_cached'] is False
+    assert first_target != second_target
+
+
+def test_evict_keeps_most_recent(tmp_path, setup_cmd):
+    """Test LRU eviction beyond max_envs."""
+    pool = EnvironmentPool(setup_cmd, ['requirements.txt'], root=str(tmp_path / 'envs'),
+                           max_envs=1)
+    workdir = tmp_path / 'work'
+    workdir.mkdir()
+    
+    with pool.lease(make_repo('blob1'), make_commit(), str(workdir)):
+        pass
+    with pool.lease(make_repo('blob2'), make_commit(), str(workdir)):
+        pass
+    
+    assert len(list((tmp_path / 'envs').iterdir())) == 1
+
+
+def test_python_of_linked_environment(tmp_path, setup_cmd):
+    """Test the interpreter is found inside the environment linked into the tree."""
+    pool = EnvironmentPool(setup_cmd, ['requirements.txt'], root=str(tmp_path / 'envs'))
+    workdir = tmp_path / 'work'
+    workdir.mkdir()
+    
+    with pool.lease(make_repo('blob1'), make_commit(), str(workdir)):
+        assert pool.python(str(workdir)) is None
+        python = workdir / '.venv' / 'bin' / 'python'
+        python.parent.mkdir()
+        python.symlink_to(sys.executable)
+        
+        assert pool.python(str(workdir)) == str(python)
+
+
+def test_existing_directory_is_not_replaced(tmp_path, setup_cmd):
+    """Test a user's own environment directory is left alone."""
+    pool = EnvironmentPool(setup_cmd, ['requirements.txt'], root=str(tmp_path / 'envs'))
+    (tmp_path / '.venv').mkdir()
+    
+    with pytest.raises(RuntimeError, match='not managed'):
+        with pool.lease(make_repo('blob1'), make_commit(), str(tmp_path)):
+            pass
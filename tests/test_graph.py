@@ -82,3 +82,31 @@ def test_generate_mixed_none_durations():
     
     assert isinstance(graph, str)
     assert 'No valid measurements' not in graph
+
+
+def test_generate_marks_censored_runs():
+    """Test killed runs are drawn open-ended rather than as plain failures."""
+    measurements = [
+        {'commit': 'abc', 'duration': 0.5, 'passed': True, 'message': 'Fast'},
+        {'commit': 'def', 'duration': 1.0, 'passed': False, 'message': 'Slow'},
+        {'commit': 'ghi', 'duration': 0.8, 'passed': False, 'censored': True,
+         'message': 'Killed'}
+    ]
+    graph = GraphGenerator(height=5).generate(measurements)
+    
+    assert '↑' in graph.split('\n')[0]
+    assert '▒' in graph
+
+
+def test_generate_labels_axis_in_metric_units():
+    """Test the y axis uses the unit of the graphed metric."""
+    generator = GraphGenerator(height=4, width=10)
+    
+    rss = generator.generate([{'duration': 5 * 1024 ** 2, 'passed': True},
+                              {'duration': 9 * 1024 ** 2, 'passed': False}], 'max_rss')
+    labels = [line.split('|')[0] for line in rss.split('\n')[:4]]
+    assert labels[0].strip() == '9.00MiB' and labels[-1].strip() == '6.00MiB'
+    
+    switches = generator.generate([{'duration': 12.0, 'passed': True},
+                                   {'duration': 40.0, 'passed': False}], 'voluntary_switches')
+    assert 's |' not in switches and '40.0 |' in switches
@@ -0,0 +1,137 @@
+"""Tests for benchmark resource metrics."""
+import os
+import subprocess
+import sys
+import time
+import pytest
+from perf_bisect.metrics import (BenchmarkKilled, MetricCollector, format_value,
+                                 parse_quantity, process_cpu_time, run_measured)
+
+
+def test_parse_quantity_units():
+    """Test thresholds with and without units."""
+    assert parse_quantity('1.5') == 1.5
+    assert parse_quantity('250ms') == pytest.approx(0.25)
+    assert parse_quantity('512MiB') == 512 * 1024 ** 2
+    assert parse_quantity('2 GB') == 2e9
+
+
+def test_parse_quantity_invalid():
+    """Test unknown units are rejected."""
+    with pytest.raises(ValueError, match='Invalid quantity'):
+        parse_quantity('12 parsecs')
+
+
+def test_format_value_by_metric():
+    """Test values are rendered in the metric's unit."""
+    assert format_value(1.5) == '1.500s'
+    assert format_value(512 * 1024 ** 2, 'max_rss') == '512.0MiB'
+    assert format_value(42, 'voluntary_switches') == '42'
+
+
+def test_run_measured_reports_peak_rss():
+    """Test peak RSS of the child reflects its allocation."""
+    code = 'x = bytearray(64 * 1024 * 1024); print("duration: 0.1")'
+    result, metrics = run_measured([sys.executable, '-c', code])
+    
+    assert result.returncode == 0
+    assert 'duration: 0.1' in result.stdout
+    assert metrics['max_rss'] > 64 * 1024 * 1024
+    assert metrics['cpu_time'] == pytest.approx(metrics['user_time'] + metrics['sys_time'])
+    assert metrics['wall_time'] > 0
+
+
+def test_run_measured_timeout():
+    """Test a run past its timeout is killed."""
+    with pytest.raises(subprocess.TimeoutExpired):
+        run_measured([sys.executable, '-c', 'import time; time.sleep(5)'], timeout=0.2)
+
+
+def test_run_measured_kills_whole_process_group(tmp_path):
+    """Test kill_after stops the child and anything it spawned."""
+    marker = tmp_path / 'survived'
+    code = ('import subprocess, sys, time; '
+            f'subprocess.Popen([sys.executable, "-c", "import time; time.sleep(1); '
+            f'open({str(marker)!r}, \'w\').close()"]); time.sleep(5)')
+    
+    start = time.perf_counter()
+    with pytest.raises(BenchmarkKilled) as excinfo:
+        run_measured([sys.executable, '-c', code], kill_after=0.3)
+    
+    assert time.perf_counter() - start < 2
+    assert excinfo.value.clock == 'wall'
+    assert excinfo.value.lower_bound >= 0.3
+    time.sleep(1.2)
+    assert not marker.exists()
+
+
+def test_run_measured_kill_on_cpu_clock():
+    """Test the CPU clock ignores sleeping and catches busy loops."""
+    result, _ = run_measured([sys.executable, '-c', 'import time; time.sleep(0.5)'],
+                             kill_after=0.3, kill_clock='cpu')
+    assert result.returncode == 0
+    
+    with pytest.raises(BenchmarkKilled) as excinfo:
+        run_measured([sys.executable, '-c', 'while True: pass'], kill_after=0.3,
+                     kill_clock='cpu')
+    assert excinfo.value.clock == 'cpu'
+
+
+def test_process_cpu_time_of_self():
+    """Test CPU time is read from /proc for a live process."""
+    if not os.path.exists('/proc/self/stat'):
+        pytest.skip('needs /proc')
+    assert process_cpu_time(os.getpid()) > 0
+
+
+def test_run_measured_streams_stdout():
+    """Test stdout lines go to the callback instead of being buffered."""
+    lines = []
+    code = 'for i in range(3): print(f"line {i}")'
+    result, _ = run_measured([sys.executable, '-c', code], on_stdout=lines.append)
+    
+    assert lines == ['line 0\n', 'line 1\n', 'line 2\n']
+    assert result.stdout == ''
+
+
+def test_run_measured_pins_child():
+    """Test the child starts already restricted to the requested CPUs."""
+    if not hasattr(os, 'sched_getaffinity'):
+        pytest.skip('needs sched_setaffinity')
+    cpu = min(os.sched_getaffinity(0))
+    result, _ = run_measured([sys.executable, '-c', 'import os; print(os.sched_getaffinity(0))'],
+                             cpus={cpu})
+    
+    assert result.stdout.strip() == str({cpu})
+
+
+def test_run_measured_reads_io_counters_at_exit(tmp_path):
+    """Test I/O done just before a short child exits is counted exactly."""
+    if not os.path.exists('/proc/self/io'):
+        pytest.skip('needs /proc/<pid>/io')
+    code = ("import os\n"
+            f"fd = os.open({str(tmp_path / 'out')!r}, os.O_WRONLY | os.O_CREAT)\n"
+            "os.write(fd, b'x' * (1 << 20))\n"
+            "os.fsync(fd)\n"
+            "os.close(fd)\n"
+            "fields = dict(line.split(':') for line in open('/proc/self/io'))\n"
+            "print(int(fields['read_bytes']), int(fields['write_bytes']))\n")
+    # No poll fires during the run, so only the read at exit can see the bytes.
+    result, metrics = run_measured([sys.executable, '-c', code], sample_interval=60)
+    read_bytes, write_bytes = map(int, result.stdout.split())
+    if not write_bytes:
+        pytest.skip('filesystem does not account written bytes')
+    
+    assert metrics['read_bytes'] == read_bytes
+    assert metrics['write_bytes'] == write_bytes
+
+
+def test_run_measured_custom_collector():
+    """Test user collectors contribute metrics."""
+    class Constant(MetricCollector):
+        def finish(self, rusage, wall_time):
+            return {'custom': 7.0}
+    
+    _, metrics = run_measured([sys.executable, '-c', 'pass'], collectors=[Constant()])
+    
+    assert metrics == {'custom': 7.0}
@@ -0,0 +1,99 @@
+"""Tests for measurement noise controls."""
+import os
+import pytest
+import sys
+from perf_bisect.isolation import available_cpus, run_isolated
+from perf_bisect.noise import NoiseControl, parse_cpu_list
+
+
+def test_parse_cpu_list():
+    """Test single CPUs, ranges and mixtures."""
+    assert parse_cpu_list('2') == {2}
+    assert parse_cpu_list('0-3') == {0, 1, 2, 3}
+    assert parse_cpu_list('0,2,4-5') == {0, 2, 4, 5}
+    
+    with pytest.raises(ValueError, match='Invalid CPU list'):
+        parse_cpu_list('a-b')
+
+
+def test_noise_control_rejects_unavailable_cpus():
+    """Test pinning to CPUs this process cannot use fails early."""
+    with pytest.raises(ValueError, match='not available'):
+        NoiseControl(cpus={max(available_cpus()) + 1000})
+    with pytest.raises(ValueError, match='warmup'):
+        NoiseControl(warmup=-1)
+
+
+def test_background_cpus_avoid_pinned_cpus():
+    """Test prefetch work is kept off the benchmark CPUs."""
+    cpus = available_cpus()
+    pinned = {min(cpus)}
+    
+    assert NoiseControl(cpus=pinned).background_cpus() in (cpus - pinned, None)
+    assert NoiseControl(cpus=cpus).background_cpus() is None
+
+
+def test_run_isolated_applies_priority_and_cpus_before_exec():
+    """Test the command starts already niced and pinned."""
+    if not hasattr(os, 'sched_getaffinity'):
+        pytest.skip('needs sched_setaffinity')
+    cpu = min(available_cpus())
+    code = 'import os; print(os.getpriority(os.PRIO_PROCESS, 0), sorted(os.sched_getaffinity(0)))'
+    result = run_isolated([sys.executable, '-c', code], nice=5, cpus={cpu})
+    
+    expected = min(19, os.getpriority(os.PRIO_PROCESS, 0) + 5)
+    assert result.stdout.split(' ', 1) == [str(expected), f'{[cpu]}\n']
+
+
+def test_snapshot_records_run_conditions():
+    """Test snapshots carry the CPU set, load average and governor."""
+    cpu = min(available_cpus())
+    snapshot = NoiseControl(cpus={cpu}).snapshot()
+    
+    assert snapshot['cpus'] == [cpu]
+    assert set(snapshot) == {'cpus', 'loadavg', 'governor'}
+    if hasattr(os, 'getloadavg'):
+        assert len(snapshot['loadavg']) == 3
+
+
+def test_bisect_interleaved_with_real_reference_tree(make_repo):
+    """Test the reference worktree holds the good commit and is cleaned up."""
+    import sys
+    from perf_bisect.bisector import PerformanceBisector
+    
+    repo = make_repo([{'duration.txt': '2.0' if i >= 3 else '0.5'} for i in range(6)])
+    commits = list(repo.iter_commits())
+    
+    bisector = PerformanceBisector(repo.working_tree_dir)
+    cmd = f'{sys.executable} -c "print(\'duration:\', open(\'duration.txt\').read())"'
+    result = bisector.bisect(cmd, commits[-1].hexsha, commits[0].hexsha, threshold=1.0,
+                             interleave=True, baseline_samples=1)
+    
+    assert result['regression_message'] == 'Commit 3'
+    assert result['reference']['level'] == 0.5
+    assert all(m['reference_samples'] == [0.5] for m in result['measurements'])
+    assert len(repo.git.worktree('list').splitlines()) == 1
+
+
+def test_resumed_interleaved_bisect_keeps_its_reference(make_repo, tmp_path):
+    """Test resuming reuses the saved reference level instead of measuring it again."""
+    from unittest.mock import Mock
+    from perf_bisect.bisector import PerformanceBisector
+    
+    repo = make_repo([{'duration.txt': '2.0' if i >= 3 else '0.5'} for i in range(6)])
+    commits = list(repo.iter_commits())
+    path = str(tmp_path / 'session.jsonl')
+    
+    cmd = f'{sys.executable} -c "print(\'duration:\', open(\'duration.txt\').read())"'
+    first = PerformanceBisector(repo.working_tree_dir).bisect(
+        cmd, commits[-1].hexsha, commits[0].hexsha, threshold=1.0, interleave=True,
+        baseline_samples=1, checkpoint=path)
+    
+    bisector = PerformanceBisector(repo.working_tree_dir)
+    bisector._sample = Mock(wraps=bisector._sample)
+    result = bisector.resume(path)
+    
+    # Every probe is replayed from the checkpoint, so nothing runs at all.
+    bisector._sample.assert_not_called()
+    assert result['reference'] == first['reference']
+    assert result['regression_message'] == 'Commit 3'
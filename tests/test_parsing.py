@@ -0,0 +1,93 @@
+"""Tests for streaming benchmark output extraction."""
+import pytest
+from perf_bisect.parsing import (JsonPointerExtractor, OutputParser, RegexExtractor,
+                                 parse_extractor, resolve_pointer)
+
+
+def test_default_parser_reads_legacy_formats():
+    """Test the built-in duration patterns still understand the old formats."""
+    parser = OutputParser()
+    
+    assert parser.parse('Duration: 1.234s') == {'duration': 1.234}
+    assert parser.parse('{"duration": 2.5, "memory": 100}') == {'duration': 2.5}
+    assert parser.parse('{\n  "time": 3.0\n}') == {'duration': 3.0}
+    assert parser.parse('0.75\n') == {'duration': 0.75}
+
+
+def test_default_parser_prefers_duration_over_loose_numbers():
+    """Test a stray number earlier in the log does not win over the duration line."""
+    output = 'warming up 3 s\nloaded 1200 rows\nduration: 0.42\n'
+    
+    assert OutputParser().parse(output) == {'duration': 0.42}
+
+
+def test_bare_json_number_is_not_an_error():
+    """Test output that is a bare JSON number parses instead of raising TypeError."""
+    assert OutputParser().parse('1.5') == {'duration': 1.5}
+
+
+def test_named_metrics_from_one_run():
+    """Test several extractors pull several metrics from the same output."""
+    parser = OutputParser([
+        RegexExtractor('duration', r'elapsed ([0-9.]+)'),
+        JsonPointerExtractor('rps', '/results/0/rps'),
+    ])
+    output = 'elapsed 1.5\n{"results": [{"rps": 900}]}\n'
+    
+    assert parser.parse(output) == {'duration': 1.5, 'rps': 900.0}
+    assert parser.names == ['duration', 'rps']
+
+
+def test_stream_stops_retaining_once_settled():
+    """Test lines after the metric are neither scanned nor kept."""
+    parser = OutputParser([RegexExtractor('duration', r'elapsed ([0-9.]+)')])
+    run = parser.start()
+    
+    run.feed('elapsed 1.5\n')
+    assert run.settled
+    for _ in range(1000):
+        run.feed('elapsed 9.9 ' + 'x' * 1000 + '\n')
+    
+    assert run.finish() == {'duration': 1.5}
+    assert run.head == 'elapsed 1.5\n'
+
+
+def test_retained_output_is_bounded():
+    """Test chatty output without a metric keeps only the first bytes."""
+    run = OutputParser(retain=100).start()
+    for _ in range(1000):
+        run.feed('noise\n')
+    
+    assert len(run.head) <= 106
+    assert run.truncated
+    assert run.finish() == {}
+
+
+def test_result_file_extractor(tmp_path):
+    """Test values are read from a result file and stale files are removed first."""
+    (tmp_path / 'result.json').write_text('{"stats": {"p50": 0.2}}')
+    parser = OutputParser([parse_extractor('duration=file:result.json:/stats/p50')])
+    
+    run = parser.start(str(tmp_path))
+    assert not (tmp_path / 'result.json').exists()
+    
+    (tmp_path / 'result.json').write_text('{"stats": {"p50": 0.3}}')
+    assert run.finish() == {'duration': 0.3}
+
+
+def test_parse_extractor_specs():
+    """Test the command-line extractor syntax."""
+    assert parse_extractor('rps=re:([0-9]+) req/s').scan('812 req/s') == 812.0
+    assert parse_extractor('p99=json:/latency/p99').pointer == '/latency/p99'
+    
+    with pytest.raises(ValueError, match='NAME=KIND'):
+        parse_extractor('duration')
+    with pytest.raises(ValueError, match='Unknown extractor kind'):
+        parse_extractor('duration=xpath://time')
+
+
+def test_resolve_pointer_escapes():
+    """Test RFC 6901 escaping and array indices."""
+    document = {'a/b': [{'m~n': 4}]}
+    
+    assert resolve_pointer(document, '/a~1b/0/m~0n') == 4
@@ -0,0 +1,101 @@
+"""Tests for path-filtered bisection."""
+import sys
+import pytest
+from perf_bisect.bisector import PerformanceBisector
+from perf_bisect.commits import CommitRange
+from perf_bisect.paths import PathFilter
+
+CMD = f'{sys.executable} -c "print(\'duration:\', open(\'src/level.txt\').read())"'
+
+
+@pytest.fixture
+def repo(make_repo, tmp_path):
+    """Create an empty repository with src and docs directories."""
+    repo = make_repo()
+    (tmp_path / 'repo' / 'src').mkdir()
+    (tmp_path / 'repo' / 'docs').mkdir()
+    return repo
+
+
+def commit(repo, message, files):
+    """Write files and commit them with message."""
+    root = repo.working_tree_dir
+    for name, content in files.items():
+        with open(f'{root}/{name}', 'w') as f:
+            f.write(content)
+    repo.index.add(list(files))
+    return repo.index.commit(message)
+
+
+def test_pathspecs_and_excluded():
+    """Test include and exclude paths become git pathspecs."""
+    assert not PathFilter()
+    assert PathFilter(['src']).pathspecs() == ['src']
+    assert PathFilter(exclude=['docs']).pathspecs() == ['.', ':(exclude)docs']
+
+    paths = PathFilter(exclude=['docs/', '*.md'])
+    assert paths.excluded('docs/index.rst')
+    assert paths.excluded('README.md')
+    assert not paths.excluded('docsrc/main.c')
+
+
+def test_key_ignores_unrelated_changes(repo):
+    """Test commits differing only outside the paths share a key."""
+    base = commit(repo, 'base', {'src/level.txt': '0.5', 'docs/a.md': 'a'})
+    docs = commit(repo, 'docs', {'docs/a.md': 'b'})
+    src = commit(repo, 'src', {'src/level.txt': '2.0'})
+
+    for paths in (PathFilter(['src']), PathFilter(exclude=['docs'])):
+        assert paths.key(repo, base) == paths.key(repo, docs)
+        assert paths.key(repo, docs) != paths.key(repo, src)
+
+
+def test_resolve_limits_range_to_paths(repo):
+    """Test the commit range keeps only commits touching the paths."""
+    good = commit(repo, 'base', {'src/level.txt': '0.5', 'docs/a.md': 'a'})
+    commit(repo, 'docs 1', {'docs/a.md': 'b'})
+    commit(repo, 'src 1', {'src/level.txt': '0.6'})
+    bad = commit(repo, 'docs 2', {'docs/a.md': 'c'})
+
+    commits = CommitRange.resolve(repo, good.hexsha, bad.hexsha, subjects=True,
+                                  pathspecs=PathFilter(exclude=['docs']).pathspecs())
+
+    assert [commits[i].summary for i in range(len(commits))] == ['src 1']
+
+
+def test_bisect_skips_commits_outside_paths(repo):
+    """Test bisect never probes commits that leave the paths alone."""
+    good = commit(repo, 'base', {'src/level.txt': '0.5', 'docs/a.md': 'a'})
+    commit(repo, 'docs 1', {'docs/a.md': 'b'})
+    commit(repo, 'src 1', {'src/level.txt': '0.6'})
+    commit(repo, 'docs 2', {'docs/a.md': 'c'})
+    commit(repo, 'src 2', {'src/level.txt': '2.0'})
+    bad = commit(repo, 'docs 3', {'docs/a.md': 'd'})
+
+    bisector = PerformanceBisector(repo.working_tree_dir)
+    result = bisector.bisect(CMD, good.hexsha, bad.hexsha, threshold=1.0, paths=['src'])
+
+    assert result['regression_message'] == 'src 2'
+    assert result['paths'] == ['src']
+    assert {m['message'] for m in result['measurements']} <= {'src 1', 'src 2'}
+
+
+def test_bisect_reuses_result_for_identical_paths(repo):
+    """Test commits with identical path trees share one measurement."""
+    good = commit(repo, 'base', {'src/level.txt': '0.5'})
+    first = commit(repo, 'add helper', {'src/helper.txt': 'x'})
+    repo.index.remove(['src/helper.txt'], working_tree=True)
+    repo.index.commit('drop helper')
+    again = commit(repo, 're-add helper', {'src/helper.txt': 'x'})
+    bad = commit(repo, 'slow', {'src/level.txt': '2.0'})
+
+    bisector = PerformanceBisector(repo.working_tree_dir)
+    result = bisector.bisect(CMD, good.hexsha, bad.hexsha, threshold=1.0, paths=['src'])
+    assert result['regression_message'] == 'slow'
+    assert again.hexsha in {m['commit'] for m in result['measurements']}
+
+    reused = bisector._measure(first, CMD, 1.0, 60)
+
+    assert reused['reused_from'] == again.hexsha
+    assert reused['commit'] == first.hexsha
+    assert reused['passed']
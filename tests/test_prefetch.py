@@ -0,0 +1,41 @@
+"""Tests for speculative prefetching of bisect candidates."""
+import sys
+import pytest
+from perf_bisect.bisector import PerformanceBisector
+from perf_bisect.prefetch import Prefetcher
+from perf_bisect.worktree import WorktreePool
+
+
+@pytest.fixture
+def slow_repo(make_repo):
+    """Create a repo whose recorded duration jumps at commit 6 of 10."""
+    return make_repo([{'duration.txt': '2.0' if i >= 6 else '0.5'} for i in range(10)])
+
+
+def test_prefetch_checks_out_candidates(slow_repo, tmp_path):
+    """Test prefetched commits end up checked out in a spare worktree."""
+    commits = list(slow_repo.iter_commits())
+    
+    with WorktreePool(slow_repo, size=3, base_dir=str(tmp_path)) as pool:
+        prefetcher = Prefetcher(pool, slow_repo)
+        prefetcher.prefetch([commits[2], commits[5]], current=commits[0])
+        prefetcher.wait(commits[2])
+        prefetcher.wait(commits[5])
+        prefetcher.close()
+        
+        assert pool.holds(commits[2].hexsha)
+        assert pool.holds(commits[5].hexsha)
+
+
+def test_bisect_with_prefetch_finds_regression(slow_repo):
+    """Test serial bisect with prefetch matches the plain search."""
+    bisector = PerformanceBisector(slow_repo.working_tree_dir)
+    cmd = f'{sys.executable} -c "print(\'duration:\', open(\'duration.txt\').read())"'
+    commits = list(slow_repo.iter_commits())
+    
+    result = bisector.bisect(cmd, commits[-1].hexsha, commits[0].hexsha,
+                             threshold=1.0, prefetch=True)
+    
+    assert result['regression_message'] == 'Commit 6'
+    assert len(slow_repo.git.worktree('list').splitlines()) == 1
+    assert slow_repo.head.commit.hexsha == commits[0].hexsha
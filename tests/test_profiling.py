@@ -0,0 +1,102 @@
+"""Tests for culprit profiling and profile diffs."""
+import sys
+import pytest
+from perf_bisect.profiling import (cprofile_command, diff_profiles, load_profile,
+                                   parse_folded, profiler_command, run_profiler)
+
+BENCH = '''
+def work(n):
+    total = 0
+    for i in range(n):
+        total += i
+    return total
+
+work(int(open('size.txt').read()))
+print('duration:', open('duration.txt').read())
+'''
+
+
+def test_cprofile_command():
+    """Test Python commands are rewritten to run under cProfile."""
+    assert cprofile_command(['python3', 'bench.py', '-n', '3'], 'out') == \
+        ['python3', '-m', 'cProfile', '-o', 'out', 'bench.py', '-n', '3']
+    assert cprofile_command(['python', '-m', 'bench'], 'out')[-2:] == ['-m', 'bench']
+    
+    with pytest.raises(ValueError, match='profiler command'):
+        cprofile_command(['./bench'], 'out')
+    with pytest.raises(ValueError, match='interpreter option'):
+        cprofile_command(['python', '-O', 'bench.py'], 'out')
+
+
+def test_profiler_command_template():
+    """Test profiler templates fill in {cmd} and {out}."""
+    command = profiler_command('python bench.py --fast', '/tmp/p',
+                               'py-spy record -f raw -o {out} -- {cmd}')
+    
+    assert command == ['py-spy', 'record', '-f', 'raw', '-o', '/tmp/p', '--',
+                       'python', 'bench.py', '--fast']
+    with pytest.raises(ValueError, match='{cmd} and {out}'):
+        profiler_command('python bench.py', '/tmp/p', 'perf record -- {cmd}')
+
+
+def test_parse_folded():
+    """Test folded stacks give self and cumulative counts per function."""
+    profile = parse_folded('main;work;slow 10\nmain;work 5\nmain;work;work 1\nnoise\n')
+    
+    assert profile['slow'] == (10.0, 10.0)
+    assert profile['work'] == (6.0, 16.0)
+    assert profile['main'] == (0.0, 16.0)
+
+
+def test_diff_profiles_orders_by_self_time_growth():
+    """Test the diff lists the functions whose self time grew most first."""
+    before = {'a': (1.0, 2.0), 'b': (1.0, 1.0)}
+    after = {'a': (1.1, 2.1), 'b': (3.0, 3.0), 'c': (0.5, 0.5)}
+    
+    rows = diff_profiles(before, after, top=2)
+    
+    assert [row['function'] for row in rows] == ['b', 'c']
+    assert rows[0]['self_delta'] == pytest.approx(2.0)
+    assert rows[0]['cumulative_before'] == 1.0
+
+
+def test_run_profiler_with_cprofile(tmp_path):
+    """Test a cProfile run is loaded in seconds."""
+    (tmp_path / 'bench.py').write_text(BENCH)
+    (tmp_path / 'size.txt').write_text('1000')
+    (tmp_path / 'duration.txt').write_text('0.5')
+    
+    profile, unit = run_profiler(f'{sys.executable} bench.py', str(tmp_path), 60)
+    
+    assert unit == 's'
+    assert 'bench.py:work' in profile
+
+
+def test_load_profile_rejects_unknown_format(tmp_path):
+    """Test files that are neither pstats nor folded stacks are rejected."""
+    path = tmp_path / 'profile.out'
+    path.write_text('not a profile')
+    
+    with pytest.raises(ValueError, match='neither'):
+        load_profile(str(path))
+
+
+def test_bisect_profiles_culprit(make_repo):
+    """Test the culprit and its parent are profiled and diffed."""
+    from perf_bisect.bisector import PerformanceBisector
+    
+    repo = make_repo([{'bench.py': BENCH, 'duration.txt': '2.0' if i >= 2 else '0.5',
+                       'size.txt': '2000000' if i >= 2 else '1000'} for i in range(4)])
+    commits = list(repo.iter_commits())
+    
+    bisector = PerformanceBisector(repo.working_tree_dir)
+    result = bisector.bisect(f'{sys.executable} bench.py', commits[-1].hexsha,
+                             commits[0].hexsha, threshold=1.0, profile=True, profile_top=3)
+    
+    profile = result['profile']
+    assert result['regression_message'] == 'Commit 2'
+    assert profile['parent'] == commits[2].hexsha
+    assert profile['top'][0]['function'] == 'bench.py:work'
+    assert profile['total_after'] > profile['total_before']
+    assert len(profile['top']) == 3
+    assert repo.head.commit == commits[0]
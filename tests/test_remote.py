@@ -0,0 +1,171 @@
+"""Tests for distributed probes over local sockets."""
+import json
+import socket
+import sys
+import threading
+import pytest
+from perf_bisect.bisector import PerformanceBisector
+from perf_bisect.build import BuildStep
+from perf_bisect.cache import MeasurementCache
+from perf_bisect.remote import WorkerPool, WorkerUnavailable, parse_address, serve
+
+BENCH = f'{sys.executable} -c "print(\'duration:\', open(\'v.txt\').read())"'
+
+
+@pytest.fixture
+def origin(make_repo):
+    """Create the repository the workers clone."""
+    return make_repo([{'v.txt': '2.0' if i >= 7 else '0.5', 'n.txt': str(i)}
+                      for i in range(12)], name='origin')
+
+
+def start_worker(origin, path, address, name):
+    """A worker with its own clone, serving from a thread."""
+    clone = origin.clone(str(path))
+    thread = threading.Thread(target=serve, args=(address, PerformanceBisector(clone.working_dir)),
+                              kwargs={'name': name, 'connect_timeout': 10}, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_parse_address():
+    """Test host:port and unix:/path worker addresses."""
+    assert parse_address('unix:/tmp/pb.sock') == (socket.AF_UNIX, '/tmp/pb.sock')
+    assert parse_address('build-3:7070') == (socket.AF_INET, ('build-3', 7070))
+    assert parse_address(':7070') == (socket.AF_INET, ('127.0.0.1', 7070))
+    with pytest.raises(ValueError, match='host:port or unix:/path'):
+        parse_address('build-3')
+
+
+def test_distributed_bisect_matches_serial(origin, tmp_path):
+    """Test workers find the same culprit as a serial bisect."""
+    commits = list(origin.iter_commits())
+    good, bad = commits[-1].hexsha, commits[0].hexsha
+    serial = PerformanceBisector(origin.working_dir).bisect(BENCH, good, bad, threshold=1.0)
+    
+    address = f'unix:{tmp_path}/coordinator.sock'
+    with WorkerPool(address) as pool:
+        threads = [start_worker(origin, tmp_path / f'clone{i}', address, f'w{i}')
+                   for i in range(3)]
+        pool.wait_for_workers(3, timeout=10)
+        result = PerformanceBisector(origin.working_dir, workers=pool).bisect(
+            BENCH, good, bad, threshold=1.0)
+    for thread in threads:
+        thread.join(timeout=10)
+    
+    assert result['regression_message'] == serial['regression_message'] == 'Commit 7'
+    assert set(result) == set(serial)
+    assert {m['worker'] for m in result['measurements']} <= {'w0', 'w1', 'w2'}
+    # Three workers test three split points per round instead of one.
+    assert len(result['measurements']) >= len(serial['measurements'])
+    assert not any(thread.is_alive() for thread in threads)
+    json.dumps(result)
+
+
+def test_probe_moves_to_another_worker_when_one_is_lost(origin, tmp_path):
+    """Test a probe lost with its worker is rerun on another one."""
+    commits = list(origin.iter_commits())
+    
+    with WorkerPool('127.0.0.1:0', wait=10) as pool:
+        address = pool.bound_address
+        # This worker takes the first probe and disappears without answering.
+        flaky = socket.create_connection(parse_address(address)[1])
+        flaky.sendall(json.dumps({'worker': 'flaky'}).encode() + b'\n')
+        pool.wait_for_workers(1, timeout=10)
+        start_worker(origin, tmp_path / 'clone', address, 'steady')
+        pool.wait_for_workers(2, timeout=10)
+        threading.Thread(target=lambda: (flaky.makefile().readline(), flaky.close()),
+                         daemon=True).start()
+        
+        result = PerformanceBisector(origin.working_dir, workers=pool).bisect(
+            BENCH, commits[-1].hexsha, commits[0].hexsha, threshold=1.0, max_samples=2)
+    
+    assert pool.lost == ['flaky']
+    assert result['regression_message'] == 'Commit 7'
+    assert {m['worker'] for m in result['measurements']} == {'steady'}
+
+
+def test_worker_reports_benchmark_failures(origin, tmp_path):
+    """Test a failing benchmark on a worker fails the bisect but keeps the worker."""
+    commits = list(origin.iter_commits())
+    address = f'unix:{tmp_path}/coordinator.sock'
+    
+    with WorkerPool(address) as pool:
+        start_worker(origin, tmp_path / 'clone', address, 'w0')
+        pool.wait_for_workers(1, timeout=10)
+        bisector = PerformanceBisector(origin.working_dir, workers=pool)
+        
+        with pytest.raises(RuntimeError, match='Benchmark failed'):
+            bisector.bisect(f'{sys.executable} -c "raise SystemExit(3)"',
+                            commits[-1].hexsha, commits[0].hexsha, threshold=1.0)
+        assert pool.size == 1
+
+
+def test_workers_apply_warmup_and_pinning(origin, tmp_path):
+    """Test warmup and CPU pinning are applied on the workers."""
+    commits = list(origin.iter_commits())
+    address = f'unix:{tmp_path}/coordinator.sock'
+    
+    with WorkerPool(address) as pool:
+        start_worker(origin, tmp_path / 'clone', address, 'w0')
+        pool.wait_for_workers(1, timeout=10)
+        result = PerformanceBisector(origin.working_dir, workers=pool).bisect(
+            BENCH, commits[-1].hexsha, commits[0].hexsha, threshold=1.0,
+            warmup=1, pin_cpus={0})
+    
+    assert all(m['warmup'] == 1 for m in result['measurements'])
+    assert all(m['environment']['cpus'] == [0] for m in result['measurements'])
+
+
+def test_missing_workers_are_not_broken_commits(origin, tmp_path):
+    """Test an empty pool raises instead of skipping commits as broken."""
+    commits = list(origin.iter_commits())
+    
+    with WorkerPool(f'unix:{tmp_path}/coordinator.sock', wait=0.1) as pool:
+        bisector = PerformanceBisector(origin.working_dir, workers=pool)
+        with pytest.raises(WorkerUnavailable, match='No benchmark worker'):
+            bisector.bisect(BENCH, commits[-1].hexsha, commits[0].hexsha, threshold=1.0,
+                            skip_broken=True)
+
+
+def test_workers_reject_coordinator_builds(origin, tmp_path):
+    """Test build steps are refused on the coordinator when workers are used."""
+    commits = list(origin.iter_commits())
+    
+    with WorkerPool(f'unix:{tmp_path}/coordinator.sock') as pool:
+        bisector = PerformanceBisector(origin.working_dir, workers=pool,
+                                       build=BuildStep('make'))
+        with pytest.raises(ValueError, match='give the build and setup commands'):
+            bisector.bisect(BENCH, commits[-1].hexsha, commits[0].hexsha, threshold=1.0)
+
+
+def test_worker_faults_move_the_probe_and_are_not_cached(origin, make_repo, tmp_path):
+    """Test a worker missing the commits hands probes on without marking them broken."""
+    commits = list(origin.iter_commits())
+    empty = make_repo(name='empty')
+    cache = MeasurementCache(str(tmp_path / 'cache.sqlite'))
+    
+    with WorkerPool(f'unix:{tmp_path}/coordinator.sock', wait=10) as pool:
+        threading.Thread(target=serve, args=(pool.address,
+                                             PerformanceBisector(empty.working_dir)),
+                         kwargs={'name': 'empty', 'connect_timeout': 10}, daemon=True).start()
+        pool.wait_for_workers(1, timeout=10)
+        start_worker(origin, tmp_path / 'clone', pool.address, 'steady')
+        pool.wait_for_workers(2, timeout=10)
+        
+        result = PerformanceBisector(origin.working_dir, workers=pool, cache=cache).bisect(
+            BENCH, commits[-1].hexsha, commits[0].hexsha, threshold=1.0, skip_broken=True)
+    
+    assert result['regression_message'] == 'Commit 7'
+    assert not any(m.get('skipped') for m in result['measurements'])
+    assert {m['worker'] for m in result['measurements']} == {'steady'}
+    assert all(cache.get_broken(c.tree.hexsha, BENCH) is None for c in commits)
+    
+    with WorkerPool(f'unix:{tmp_path}/alone.sock', wait=0.5) as pool:
+        threading.Thread(target=serve, args=(pool.address,
+                                             PerformanceBisector(empty.working_dir)),
+                         kwargs={'name': 'empty', 'connect_timeout': 10}, daemon=True).start()
+        pool.wait_for_workers(1, timeout=10)
+        with pytest.raises(WorkerUnavailable):
+            PerformanceBisector(origin.working_dir, workers=pool).bisect(
+                BENCH, commits[-1].hexsha, commits[0].hexsha, threshold=1.0, skip_broken=True)
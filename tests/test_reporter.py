@@ -2,7 +2,6 @@
 import pytest
 import json
 import csv
-from pathlib import Path
 from perf_bisect.reporter import Reporter
 
 
@@ -84,7 +83,7 @@ def test_save_csv_report(reporter, sample_result, tmp_path):
         rows = list(reader)
     
     assert len(rows) == 4
-    assert rows[0] == ['Commit', 'Duration', 'Passed', 'Message']
+    assert rows[0] == ['Commit', 'Median', 'Stdev', 'Samples', 'Passed', 'Message']
 
 
 def test_save_report_invalid_format(reporter, sample_result, tmp_path):
@@ -116,3 +115,124 @@ def test_print_summary_dry_run(capsys):
     captured = capsys.readouterr()
     assert 'DRY RUN' in captured.out
     assert 'Would test 2 commits' in captured.out
+
+
+def test_print_summary_shows_sample_spread(capsys):
+    """Test summary shows median, spread and sample count."""
+    result = {
+        'good_commit': 'abc123',
+        'bad_commit': 'def456',
+        'threshold': 1.0,
+        'regression_commit': None,
+        'regression_message': None,
+        'measurements': [
+            {'commit': 'abc123', 'duration': 0.5, 'stdev': 0.02,
+             'samples': [0.48, 0.5, 0.52], 'passed': True, 'message': 'Good'}
+        ]
+    }
+    
+    reporter = Reporter()
+    reporter.print_summary(result)
+    
+    captured = capsys.readouterr()
+    assert 'Median' in captured.out
+    assert '±0.020s' in captured.out
+
+
+def test_print_summary_marks_killed_runs(capsys):
+    """Test censored measurements show their lower bound."""
+    result = {
+        'good_commit': 'abc123',
+        'bad_commit': 'def456',
+        'threshold': 1.0,
+        'regression_commit': 'def456',
+        'regression_message': 'Slow',
+        'measurements': [
+            {'commit': 'def456', 'duration': 2.01, 'stdev': 0.0, 'samples': [],
+             'censored': True, 'lower_bound': 2.01, 'passed': False, 'message': 'Slow'}
+        ]
+    }
+    
+    Reporter().print_summary(result)
+    
+    captured = capsys.readouterr()
+    assert '≥2.010s' in captured.out
+    assert 'killed' in captured.out
+
+
+def test_print_sweep_lists_steps(capsys):
+    """Test sweep results list each step with its effect size."""
+    result = {
+        'mode': 'sweep',
+        'good_commit': 'abc123',
+        'bad_commit': 'def456',
+        'metric': 'duration',
+        'stride': 2,
+        'changes': [
+            {'commit': 'aaa1111', 'message': 'Slow down', 'kind': 'regression',
+             'before': 1.0, 'after': 2.0, 'delta': 1.0, 'effect': 1.0},
+            {'commit': 'bbb2222', 'message': 'Speed up', 'kind': 'improvement',
+             'before': 2.0, 'after': 1.0, 'delta': -1.0, 'effect': -0.5}
+        ],
+        'measurements': [{'commit': 'abc123', 'duration': 1.0, 'passed': None,
+                          'message': 'Good', 'phase': 'grid'}]
+    }
+    
+    Reporter().print_sweep(result)
+    
+    captured = capsys.readouterr()
+    assert 'Found 2 step(s)' in captured.out
+    assert '+100.0%' in captured.out
+    assert '-50.0%' in captured.out
+    assert 'improvement' in captured.out
+
+
+def test_print_summary_shows_culprit_range(capsys):
+    """Test skipped commits are listed and an ambiguous culprit is shown as a range."""
+    result = {
+        'good_commit': 'abc123',
+        'bad_commit': 'def456',
+        'threshold': 1.0,
+        'regression_commit': 'def456',
+        'regression_message': 'Slow',
+        'culprit_range': ['bbb222', 'def456'],
+        'measurements': [
+            {'commit': 'bbb222', 'duration': None, 'stdev': None, 'samples': [],
+             'skipped': True, 'passed': None, 'message': 'Broken'},
+            {'commit': 'def456', 'duration': 2.0, 'stdev': 0.0, 'samples': [2.0],
+             'passed': False, 'message': 'Slow'}
+        ]
+    }
+    
+    Reporter().print_summary(result)
+    
+    captured = capsys.readouterr()
+    assert 'one of 2 commits: bbb222..def456' in captured.out
+    assert 'skipped' in captured.out
+    assert 'Regression found' not in captured.out
+
+
+def test_print_summary_shows_profile_diff(capsys):
+    """Test the culprit's profile diff is printed under the measurements."""
+    result = {
+        'good_commit': 'abc123',
+        'bad_commit': 'def456',
+        'threshold': 1.0,
+        'regression_commit': 'def456',
+        'regression_message': 'Slow',
+        'measurements': [],
+        'profile': {
+            'commit': 'def456', 'parent': 'ccc333', 'tool': 'cProfile', 'unit': 's',
+            'total_before': 0.5, 'total_after': 1.5,
+            'top': [{'function': 'src/parse.py:tokenize', 'self_before': 0.1,
+                     'self_after': 1.1, 'self_delta': 1.0, 'cumulative_before': 0.2,
+                     'cumulative_after': 1.2, 'cumulative_delta': 1.0}]
+        }
+    }
+    
+    Reporter().print_summary(result)
+    
+    captured = capsys.readouterr()
+    assert 'Profile ccc333 -> def456' in captured.out
+    assert 'src/parse.py:tokenize' in captured.out
+    assert '+1.0000s' in captured.out
@@ -0,0 +1,47 @@
+"""Tests for sampling statistics."""
+import pytest
+from perf_bisect.stats import SamplingPolicy, confidence_interval, summarize, t_ppf
+
+
+def test_t_ppf_matches_known_values():
+    """Test t quantiles against textbook values."""
+    assert t_ppf(0.975, 1) == pytest.approx(12.706, abs=1e-3)
+    assert t_ppf(0.975, 10) == pytest.approx(2.228, abs=1e-3)
+
+
+def test_summarize():
+    """Test median and spread of samples."""
+    summary = summarize([1.0, 2.0, 3.0])
+    
+    assert summary['median'] == 2.0
+    assert summary['stdev'] == pytest.approx(1.0)
+    assert summary['count'] == 3
+
+
+def test_confidence_interval_single_sample():
+    """Test interval collapses to the value for one sample."""
+    assert confidence_interval([1.5], 0.95) == (1.5, 1.5)
+
+
+def test_policy_stops_early_on_clear_result():
+    """Test clear-cut samples stop after two runs."""
+    policy = SamplingPolicy(min_samples=1, max_samples=10)
+    
+    assert not policy.should_stop([0.5], 1.0)
+    assert policy.should_stop([0.5, 0.51], 1.0)
+    assert policy.decide([0.5, 0.51], 1.0) is True
+    assert policy.decide([2.0, 2.01], 1.0) is False
+
+
+def test_policy_keeps_sampling_borderline():
+    """Test borderline samples run until max_samples."""
+    policy = SamplingPolicy(min_samples=1, max_samples=4)
+    
+    assert not policy.should_stop([0.9, 1.1, 0.95], 1.0)
+    assert policy.should_stop([0.9, 1.1, 0.95, 1.05], 1.0)
+
+
+def test_policy_validation():
+    """Test invalid sampling settings are rejected."""
+    with pytest.raises(ValueError):
+        SamplingPolicy(min_samples=3, max_samples=2)
@@ -0,0 +1,57 @@
+"""Tests for the columnar measurement store."""
+import json
+import math
+import pytest
+from perf_bisect.store import MeasurementStore
+
+
+@pytest.fixture
+def measurements():
+    """Create measured, failing and skipped rows."""
+    return [
+        {'commit': 'ab' * 20, 'message': 'Fast path', 'duration': 0.5, 'stdev': 0.01,
+         'samples': [0.49, 0.5, 0.51], 'passed': True, 'metrics': {'max_rss': 1024.0}},
+        {'commit': 'cd' * 20, 'message': 'Fast path', 'duration': 2.0, 'stdev': 0.0,
+         'samples': [2.0], 'passed': False, 'metrics': {'cpu_time': 1.9}},
+        {'commit': 'ef' * 20, 'message': 'Broken', 'duration': None, 'samples': [],
+         'passed': None, 'skipped': True, 'reason': 'build failed'},
+    ]
+
+
+def test_rows_read_back_as_the_dicts_stored(measurements):
+    """Test row views read back exactly the dicts stored."""
+    store = MeasurementStore(measurements)
+    
+    assert len(store) == 3
+    assert store == measurements
+    assert [dict(m) for m in store] == measurements
+    assert list(store[2]) == list(measurements[2])
+    assert store[-1]['reason'] == 'build failed'
+    assert store[0].get('skipped') is None and 'skipped' in store[2]
+    assert store[1]['metrics'] == {'cpu_time': 1.9}
+    with pytest.raises(KeyError):
+        store[2]['stdev']
+    with pytest.raises(IndexError):
+        store[3]
+
+
+def test_columns_are_packed(measurements):
+    """Test SHAs, messages, layouts, samples and metrics are packed per column."""
+    store = MeasurementStore(measurements * 100)
+    
+    assert len(store._shas) == 300 * 20
+    assert len(store._messages) == 2
+    assert len(store._schemas) == 2
+    assert list(store._sample_starts[:4]) == [0, 3, 4, 4]
+    assert store._durations[:2].tolist() == [0.5, 2.0] and math.isnan(store._durations[2])
+    assert store._metrics['max_rss'][0] == 1024.0 and math.isnan(store._metrics['max_rss'][1])
+
+
+def test_non_hex_commits_and_json(measurements):
+    """Test commits that are not SHAs are kept and results serialize to JSON."""
+    store = MeasurementStore([dict(measurements[0], commit='HEAD~1')])
+    store.extend(measurements[1:])
+    
+    assert store[0]['commit'] == 'HEAD~1'
+    assert json.loads(json.dumps({'measurements': store.to_list()})) == \
+        {'measurements': [dict(measurements[0], commit='HEAD~1')] + measurements[1:]}
@@ -0,0 +1,94 @@
+"""Tests for multi-benchmark suite bisection."""
+import json
+import sys
+import pytest
+from perf_bisect.bisector import PerformanceBisector
+from perf_bisect.build import BuildStep
+from perf_bisect.suite import SuiteBenchmark, load_manifest, parse_manifest
+
+
+def read_cmd(name):
+    """Benchmark command printing the duration stored in the file name."""
+    return f'{sys.executable} -c "print(\'duration:\', open(\'{name}\').read())"'
+
+
+def test_parse_manifest():
+    """Test manifest entries become SuiteBenchmark objects."""
+    benchmarks = parse_manifest({'benchmarks': [
+        {'name': 'parse', 'command': 'python parse.py', 'threshold': 1.5, 'timeout': 60},
+        {'name': 'rss', 'command': 'python rss.py', 'regression': '15%', 'metric': 'max_rss'},
+    ]})
+    
+    assert benchmarks[0] == SuiteBenchmark('parse', 'python parse.py', threshold=1.5,
+                                           timeout=60)
+    assert benchmarks[1].regression == pytest.approx(0.15)
+    assert benchmarks[1].metric == 'max_rss'
+
+
+@pytest.mark.parametrize('data, message', [
+    ({}, "non-empty 'benchmarks'"),
+    ({'benchmarks': [{'name': 'a', 'command': 'x', 'threshold': 1, 'thresold': 2}]},
+     'Unknown benchmark field'),
+    ({'benchmarks': [{'name': 'a', 'command': 'x', 'threshold': 1},
+                     {'name': 'a', 'command': 'y', 'threshold': 1}]}, 'Duplicate'),
+    ({'benchmarks': [{'name': 'a', 'command': 'x', 'threshold': 'fast'}]}, 'Invalid number'),
+    ({'benchmarks': [{'name': 'a', 'command': '', 'threshold': 1}]}, 'needs a command'),
+])
+def test_parse_manifest_rejects_invalid(data, message):
+    """Test malformed manifests are rejected with a clear message."""
+    with pytest.raises(ValueError, match=message):
+        parse_manifest(data)
+
+
+def test_load_manifest_rejects_invalid_json(tmp_path):
+    """Test a manifest file that is not JSON is rejected."""
+    path = tmp_path / 'suite.json'
+    path.write_text('{"benchmarks": [')
+    
+    with pytest.raises(ValueError, match='not valid JSON'):
+        load_manifest(str(path))
+
+
+def test_bisect_suite_shares_checkouts_and_builds(make_repo, tmp_path):
+    """Test each benchmark finds its own culprit while probes share checkouts and builds."""
+    repo = make_repo([{'a.txt': '2.0' if i >= 3 else '0.5', 'b.txt': '2.0' if i >= 6 else '0.5',
+                       'c.txt': '0.5', 'n.txt': str(i)} for i in range(9)])
+    commits = list(repo.iter_commits())
+    
+    log = tmp_path / 'builds.log'
+    build = BuildStep(f'{sys.executable} -c "open(\'{log}\', \'a\').write(\'x\')"')
+    bisector = PerformanceBisector(repo.working_tree_dir, build=build)
+    suite = [
+        SuiteBenchmark('a', read_cmd('a.txt'), threshold=1.0),
+        SuiteBenchmark('b', read_cmd('b.txt'), threshold=1.0),
+        SuiteBenchmark('c', read_cmd('c.txt'), regression=0.5),
+    ]
+    
+    result = bisector.bisect_suite(suite, commits[-1].hexsha, commits[0].hexsha,
+                                   baseline_samples=1)
+    
+    culprits = {b['name']: b['regression_message'] for b in result['benchmarks']}
+    assert culprits == {'a': 'Commit 3', 'b': 'Commit 6', 'c': None}
+    assert result['benchmarks'][2]['threshold'] == pytest.approx(0.75)
+    # One build per probed commit, however many benchmarks ran there.
+    assert len(log.read_text()) == result['probed_commits']
+    # Benchmarks wanting the same probe shared its checkout.
+    assert len({m['commit'] for m in result['measurements']}) < len(result['measurements'])
+    assert repo.head.commit == commits[0]
+    json.dumps(result)
+
+
+def test_bisect_suite_counts_timeouts_as_failures(make_repo):
+    """Test a benchmark that times out fails its probe instead of crashing the suite."""
+    repo = make_repo([{'d.txt': '5' if i >= 2 else '0.05'} for i in range(4)])
+    commits = list(repo.iter_commits())
+    sleep = (f'{sys.executable} -c "import time; d = float(open(\'d.txt\').read()); '
+             f'time.sleep(d); print(\'duration:\', d)"')
+    bisector = PerformanceBisector(repo.working_tree_dir)
+    
+    result = bisector.bisect_suite([SuiteBenchmark('slow', sleep, threshold=1.0, timeout=1)],
+                                   commits[-1].hexsha, commits[0].hexsha)
+    
+    assert result['benchmarks'][0]['regression_message'] == 'Commit 2'
+    timed_out = [m for m in result['measurements'] if m['censored']]
+    assert timed_out and all(m['passed'] is False for m in timed_out)
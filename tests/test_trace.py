@@ -0,0 +1,101 @@
+"""Tests for Chrome trace output."""
+import json
+import sys
+import threading
+from perf_bisect.trace import NULL_TRACER, Tracer, traced
+
+
+def test_span_records_complete_event():
+    """Test a span becomes one complete event with its arguments."""
+    tracer = Tracer()
+    
+    with tracer.span('build', 'build', commit='abc1234'):
+        pass
+    
+    event, = tracer.events
+    assert (event['name'], event['cat'], event['ph']) == ('build', 'build', 'X')
+    assert event['dur'] >= 0 and event['ts'] >= 0
+    assert event['args'] == {'commit': 'abc1234'}
+
+
+def test_span_records_failures_and_threads():
+    """Test spans are kept when they raise and get one tid per thread."""
+    tracer = Tracer()
+    
+    try:
+        with tracer.span('benchmark', 'benchmark'):
+            raise RuntimeError('Benchmark failed')
+    except RuntimeError:
+        pass
+    
+    def work():
+        with tracer.span('checkout', 'checkout'):
+            pass
+    
+    worker = threading.Thread(target=work)
+    worker.start()
+    worker.join()
+    
+    assert [e['name'] for e in tracer.events] == ['benchmark', 'checkout']
+    assert [e['tid'] for e in tracer.events] == [1, 2]
+
+
+def test_write_and_summary(tmp_path):
+    """Test the trace file and the per-category summary."""
+    tracer = Tracer()
+    with tracer.span('benchmark', 'benchmark'):
+        pass
+    with tracer.span('log', 'git'):
+        pass
+    
+    path = tmp_path / 'trace.json'
+    tracer.write(str(path))
+    document = json.loads(path.read_text())
+    
+    assert len(document['traceEvents']) == 2
+    assert set(tracer.totals()) == {'benchmark', 'git'}
+    assert 'benchmarking' in tracer.summary()
+    assert 'git' in tracer.summary()
+
+
+def test_null_tracer_is_free():
+    """Test the null tracer hands out one shared no-op span."""
+    assert NULL_TRACER.span('a', 'b') is NULL_TRACER.span('c', 'd')
+    with NULL_TRACER.span('a', 'b'):
+        pass
+
+
+def test_traced_decorator():
+    """Test decorated methods are traced through their tracer attribute."""
+    class Report:
+        def __init__(self, tracer):
+            self.tracer = tracer
+        
+        @traced('save report', 'report')
+        def save(self, value):
+            return value * 2
+    
+    tracer = Tracer()
+    
+    assert Report(tracer).save(21) == 42
+    assert [e['name'] for e in tracer.events] == ['save report']
+
+
+def test_bisect_traces_each_phase(make_repo):
+    """Test a bisect traces git, checkout, benchmark and phase spans."""
+    from perf_bisect.bisector import PerformanceBisector
+    
+    repo = make_repo([{'duration.txt': '2.0' if i >= 2 else '0.5'} for i in range(4)])
+    commits = list(repo.iter_commits())
+    
+    tracer = Tracer()
+    bisector = PerformanceBisector(repo.working_tree_dir, tracer=tracer)
+    cmd = f'{sys.executable} -c "print(\'duration:\', open(\'duration.txt\').read())"'
+    result = bisector.bisect(cmd, commits[-1].hexsha, commits[0].hexsha, regression=0.5,
+                             baseline_samples=1)
+    
+    assert result['regression_message'] == 'Commit 2'
+    categories = {e['cat'] for e in tracer.events}
+    assert {'git', 'checkout', 'probe', 'benchmark', 'parse', 'phase'} <= categories
+    phases = {e['name'] for e in tracer.events if e['cat'] == 'phase'}
+    assert phases == {'baseline', 'search'}
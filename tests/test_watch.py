@@ -0,0 +1,100 @@
+"""Tests for continuous watch mode."""
+import sys
+import pytest
+from perf_bisect.bisector import PerformanceBisector
+from perf_bisect.watch import Watcher, batch_points, rolling_baseline
+
+BENCH = f'{sys.executable} -c "print(\'duration:\', open(\'v.txt\').read())"'
+
+
+@pytest.fixture
+def repo(make_repo):
+    """Create an empty repository to land commits in."""
+    return make_repo()
+
+
+def land(repo, values, start):
+    """Commit one value per commit, numbering them from start."""
+    path = repo.working_tree_dir
+    for i, value in enumerate(values, start):
+        with open(f'{path}/v.txt', 'w') as f:
+            f.write(str(value))
+        with open(f'{path}/n.txt', 'w') as f:
+            f.write(str(i))
+        repo.index.add(['v.txt', 'n.txt'])
+        repo.index.commit(f'Commit {i}')
+
+
+def test_rolling_baseline_restarts_at_steps():
+    """Test the baseline is the median since the last step."""
+    records = [{'value': 1.0}, {'value': 1.2}, {'value': 0.8},
+               {'value': 3.0, 'step': True}, {'value': 2.0}]
+    
+    assert rolling_baseline([], 5) is None
+    assert rolling_baseline(records[:3], 5) == 1.0
+    assert rolling_baseline(records[:3], 1) == 0.8
+    assert rolling_baseline(records, 5) == 2.5
+
+
+def test_batch_points():
+    """Test which new commits each batch measures."""
+    assert batch_points(0, 3) == []
+    assert batch_points(7, 3) == [2, 5, 6]
+    assert batch_points(4, 1) == [0, 1, 2, 3]
+
+
+def test_watch_bisects_only_new_steps(repo, tmp_path):
+    """Test only steps among newly landed commits are bisected, across restarts."""
+    land(repo, [0.5] * 3, 0)
+    history = str(tmp_path / 'watch.jsonl')
+    bisector = PerformanceBisector(repo.working_tree_dir)
+    watcher = Watcher(bisector, BENCH, history, batch=3, samples=1)
+    
+    seed = watcher.poll()
+    assert [r['message'] for r in seed] == ['Commit 2']
+    assert watcher.poll() == []
+    
+    land(repo, [0.5, 2.0, 2.0, 2.0, 2.0, 2.0], 3)
+    records = watcher.poll()
+    
+    assert [(r['message'], r['landed']) for r in records] == [('Commit 5', 3), ('Commit 8', 3)]
+    step, steady = records
+    assert step['step'] and step['kind'] == 'regression'
+    assert step['culprit_message'] == 'Commit 4'
+    assert 0 < step['probes'] <= 3
+    assert steady['baseline'] == 2.0 and not steady['step']
+    
+    # A restarted watcher continues from the saved history.
+    land(repo, [0.5], 9)
+    resumed = Watcher(PerformanceBisector(repo.working_tree_dir), BENCH, history, batch=3,
+                      samples=1)
+    assert len(resumed.records) == 3
+    improvement, = resumed.poll()
+    assert improvement['kind'] == 'improvement' and improvement['step']
+    
+    with pytest.raises(ValueError, match='different session'):
+        Watcher(bisector, 'python other.py', history)
+
+
+def test_watch_records_broken_commit_and_moves_on(repo, tmp_path):
+    """Test a broken commit is recorded as skipped without stopping the watch."""
+    land(repo, [0.5], 0)
+    history = str(tmp_path / 'watch.jsonl')
+    watcher = Watcher(PerformanceBisector(repo.working_tree_dir), BENCH, history, samples=1)
+    watcher.poll()
+    
+    land(repo, [0.5, 'oops', 2.0], 1)
+    records = watcher.poll()
+    
+    assert [r['message'] for r in records] == ['Commit 1', 'Commit 2', 'Commit 3']
+    broken = records[1]
+    assert broken['skipped'] and broken['value'] is None
+    assert broken['skip_reason']
+    # Commit 3 is compared with Commit 1, so both of the commits since count.
+    step = records[2]
+    assert step['landed'] == 2 and step['baseline'] == 0.5
+    assert step['step'] and step['culprit_message'] == 'Commit 3'
+    
+    resumed = Watcher(PerformanceBisector(repo.working_tree_dir), BENCH, history, samples=1)
+    assert len(resumed.records) == 4
+    assert resumed.poll() == []
@@ -0,0 +1,86 @@
+"""Tests for the persistent Python callable worker."""
+import sys
+import pytest
+from perf_bisect.worker import CallableWorker, calibrate, load_callable
+
+BENCH = '''
+import time
+
+calls = []
+
+def work():
+    print('noise on stdout')
+    time.sleep(0.002)
+
+def broken():
+    raise KeyError('missing')
+
+class Suite:
+    @staticmethod
+    def fast():
+        calls.append(1)
+'''
+
+
+@pytest.fixture
+def bench_dir(tmp_path):
+    """Create a directory holding an importable benchmark module."""
+    (tmp_path / 'benchmod.py').write_text(BENCH)
+    return tmp_path
+
+
+def test_load_callable(bench_dir, monkeypatch):
+    """Test loading pkg.module:func targets, including nested attributes."""
+    monkeypatch.syspath_prepend(str(bench_dir))
+    
+    assert load_callable('benchmod:Suite.fast').__name__ == 'fast'
+    with pytest.raises(ValueError, match='pkg.module:func'):
+        load_callable('benchmod')
+    with pytest.raises(ValueError, match='not callable'):
+        load_callable('benchmod:calls')
+
+
+def test_calibrate_picks_smallest_loop_count_lasting_min_time(monkeypatch):
+    """Test calibration stops at the first loop count lasting min_time."""
+    monkeypatch.setattr('perf_bisect.worker.time_loops', lambda func, loops: loops * 0.001)
+    
+    assert calibrate(print, min_time=0.0045) == 5
+    assert calibrate(print, min_time=0.015) == 20
+    assert calibrate(print, min_time=0.001) == 1
+
+
+def test_worker_samples_seconds_per_call(bench_dir):
+    """Test the worker returns seconds per call and exits on close."""
+    worker = CallableWorker('benchmod:work', str(bench_dir), timeout=30, min_time=0.01)
+    try:
+        samples = worker.sample(count=3, timeout=30)
+        more = worker.sample(timeout=30)
+    finally:
+        worker.close()
+    
+    assert worker.loops >= 2
+    assert len(samples) == 3 and len(more) == 1
+    # Printing from the benchmark must not corrupt the reply stream.
+    assert all(0.0015 < s < 0.05 for s in samples + more)
+    assert worker.process.poll() is not None
+
+
+def test_worker_reports_import_and_call_errors(bench_dir):
+    """Test import and call errors in the worker surface as RuntimeError."""
+    with pytest.raises(RuntimeError, match='Could not load benchmod:nope'):
+        CallableWorker('benchmod:nope', str(bench_dir), timeout=30)
+    with pytest.raises(RuntimeError, match="KeyError: 'missing'"):
+        CallableWorker('benchmod:broken', str(bench_dir), timeout=30)
+
+
+def test_worker_starts_given_interpreter(bench_dir, tmp_path):
+    """Test the worker runs under the interpreter it is given, not the parent's."""
+    python = tmp_path / 'env' / 'bin' / 'python'
+    python.parent.mkdir(parents=True)
+    python.symlink_to(sys.executable)
+    (bench_dir / 'whoami.py').write_text(
+        "import sys\nopen('python.txt', 'w').write(sys.executable)\ndef work():\n    pass\n")
+    
+    CallableWorker('whoami:work', str(bench_dir), timeout=30, python=str(python)).close()
+    
+    assert (bench_dir / 'python.txt').read_text() == str(python)
@@ -0,0 +1,38 @@
+"""Tests for WorktreePool."""
+import pytest
+from perf_bisect.worktree import WorktreePool
+
+
+@pytest.fixture
+def git_repo(make_repo):
+    """Create a small git repository with three commits."""
+    return make_repo([{'value.txt': str(i)} for i in range(3)])
+
+
+def test_pool_creates_and_removes_worktrees(git_repo, tmp_path):
+    """Test worktrees exist only while the pool is open."""
+    with WorktreePool(git_repo, size=2, base_dir=str(tmp_path)) as pool:
+        assert len(pool.paths) == 2
+        assert all(path.exists() for path in pool.paths)
+        paths = list(pool.paths)
+    
+    assert not any(path.exists() for path in paths)
+    assert len(git_repo.git.worktree('list').splitlines()) == 1
+
+
+def test_pool_checkout_is_isolated(git_repo, tmp_path):
+    """Test checking out in a worktree leaves the main tree alone."""
+    first = list(git_repo.iter_commits())[-1].hexsha
+    
+    with WorktreePool(git_repo, size=1, base_dir=str(tmp_path)) as pool:
+        with pool.lease() as path:
+            pool.checkout(path, first)
+            assert (path / 'value.txt').read_text() == '0'
+    
+    assert (tmp_path / 'repo' / 'value.txt').read_text() == '2'
+
+
+def test_pool_rejects_empty_size(git_repo):
+    """Test pool size validation."""
+    with pytest.raises(ValueError, match='at least 1'):
+        WorktreePool(git_repo, size=0)